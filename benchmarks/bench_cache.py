@@ -0,0 +1,47 @@
+"""
+Runs the same workloads against every cache backend
+
+python benchmarks/bench_cache.py
+"""
+
+import os
+import random
+import tempfile
+from collections import Counter
+
+from harness import bench
+
+from typed_graphql import LRUCache, SQLiteCache
+
+KEYS = 10_000
+VALUE = {"data": {"countries": [{"code": "NZ", "name": "New Zealand"}] * 20}}
+
+
+def run_workloads(name, backend):
+    metrics = Counter()
+    backend.metrics = lambda event, key: metrics.update([event])
+
+    keys = [f"key:{i}" for i in range(KEYS)]
+    for key in keys:
+        backend.set(key, VALUE, ttl=60)
+
+    hit_keys = iter(random.choices(keys, k=1_000_000))
+    miss_keys = iter(f"missing:{i}" for i in range(1_000_000))
+    set_keys = iter(f"new:{i}" for i in range(1_000_000))
+
+    bench(f"{name} get (hit)", lambda: backend.get(next(hit_keys)), 20_000)
+    bench(f"{name} get (miss)", lambda: backend.get(next(miss_keys)), 20_000)
+    bench(f"{name} set", lambda: backend.set(next(set_keys), VALUE, 60), 5_000)
+    print(f"{name} metrics: {dict(metrics)}")
+
+
+def main():
+    run_workloads("LRUCache", LRUCache(maxsize=KEYS))
+    with tempfile.TemporaryDirectory() as directory:
+        run_workloads(
+            "SQLiteCache", SQLiteCache(os.path.join(directory, "c.db"), maxsize=KEYS)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Serializes and parses 1M timestamps with the DateTime scalar, against the
+strftime/strptime implementation it replaced
+
+python benchmarks/bench_datetime.py
+"""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from itertools import cycle
+
+from harness import bench
+
+from typed_graphql import datetime_scalar
+
+TIMESTAMPS = 1_000_000
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+VALUES = [START + timedelta(seconds=i, microseconds=i) for i in range(TIMESTAMPS)]
+
+
+def strftime_serialize(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def strptime_parse(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def each(fn, values):
+    values = cycle(values)
+    return lambda: fn(next(values))
+
+
+def main():
+    scalar = datetime_scalar()
+    bench("strftime serialize", each(strftime_serialize, VALUES), TIMESTAMPS)
+    bench("DateTime serialize", each(scalar.serialize, VALUES), TIMESTAMPS)
+    for policy in ("convert", "preserve"):
+        serialize = datetime_scalar(policy).serialize
+        bench(f"DateTime ({policy}) serialize", each(serialize, VALUES), TIMESTAMPS)
+
+    strings = [scalar.serialize(value) for value in VALUES]
+    bench("strptime parse", each(strptime_parse, strings), TIMESTAMPS)
+    bench("DateTime parse", each(scalar.parse_value, strings), TIMESTAMPS)
+
+
+if __name__ == "__main__":
+    main()
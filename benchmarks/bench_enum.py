@@ -0,0 +1,44 @@
+"""
+Completes a list of 100k members of a 500-member enum
+
+python benchmarks/bench_enum.py
+"""
+
+import enum
+import random
+from typing import List
+
+from graphql import graphql_sync
+from graphql.type import GraphQLSchema
+from harness import bench
+
+from typed_graphql import TypedGraphqlMiddlewareManager
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+Status = enum.Enum("Status", {f"STATUS_{i}": i for i in range(500)})
+MEMBERS = random.choices(list(Status), k=100_000)
+
+
+class Query:
+    @staticresolver
+    def statuses(data, info) -> List[Status]:  # type: ignore
+        return MEMBERS
+
+
+def main():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    middleware = TypedGraphqlMiddlewareManager()
+    bench(
+        "graphql_sync 100k statuses",
+        lambda: graphql_sync(schema, "{ statuses }", middleware=middleware),
+        10,
+    )
+    bench(
+        "execute_sync 100k statuses", lambda: execute_sync(schema, "{ statuses }"), 10
+    )
+
+
+if __name__ == "__main__":
+    main()
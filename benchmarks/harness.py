@@ -0,0 +1,21 @@
+"""
+Tiny timing helpers shared by the benchmark scripts
+
+Run a benchmark with the package installed: python benchmarks/bench_cache.py
+"""
+
+import time
+from typing import Callable
+
+
+def bench(name: str, fn: Callable[[], object], number: int, repeat: int = 3) -> float:
+    """Prints and returns the best time per call of fn over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    per_call = best / number
+    print(f"{name:<50} {per_call * 1e6:10.2f} us/call {number / best:12.0f} calls/s")
+    return per_call
@@ -0,0 +1,34 @@
+import asyncio
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+
+@pytest.fixture
+def calls() -> List[Any]:
+    """What the resolvers of the test's schema record"""
+    return []
+
+
+@pytest.fixture
+def run() -> Iterator[Callable[..., Any]]:
+    """
+    Runs coroutines to completion on an event loop of the test's own
+
+    Several coroutines are run concurrently, and a list of their results is
+    returned.
+    """
+    loop = asyncio.new_event_loop()
+
+    def run(*coroutines):
+        if len(coroutines) == 1:
+            return loop.run_until_complete(coroutines[0])
+
+        async def gather():
+            return await asyncio.gather(*coroutines)
+
+        return loop.run_until_complete(gather())
+
+    yield run
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
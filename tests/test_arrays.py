@@ -0,0 +1,85 @@
+import array
+from typing import Annotated
+from typing import Optional
+
+import pytest
+from graphql.type import GraphQLInt
+from graphql.type import GraphQLSchema
+
+from typed_graphql import MaxItems
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+
+def test_array_fields():
+    class Query:
+        @staticresolver
+        def readings(data, info) -> array.array:
+            return array.array("d", [0.5, 1.5, 2.5])
+
+        @staticresolver
+        def counts(data, info) -> Annotated[array.array, GraphQLInt]:
+            return array.array("q", [1, 2, 3])
+
+        @staticresolver
+        def missing(data, info) -> Optional[array.array]:
+            return None
+
+        @staticresolver
+        def capped(data, info) -> Annotated[array.array, MaxItems(2, True)]:
+            return array.array("f", [1, 2, 3])
+
+        @staticresolver
+        def invalid(data, info) -> array.array:
+            return array.array("d", [1.0, float("nan")])
+
+    query = graphql_type(Query)
+    assert str(query.fields["readings"].type) == "[Float!]!"
+    assert str(query.fields["counts"].type) == "[Int!]!"
+    assert str(query.fields["missing"].type) == "[Float!]"
+
+    schema = GraphQLSchema(query=query)
+    result = execute_sync(schema, "{ readings counts missing capped }")
+    assert result.errors is None
+    assert result.data == {
+        "readings": [0.5, 1.5, 2.5],
+        "counts": [1, 2, 3],
+        "missing": None,
+        "capped": [1.0, 2.0],
+    }
+
+    result = execute_sync(schema, "{ invalid }")
+    assert result.data is None
+    assert result.errors[0].path == ["invalid", 1]
+
+
+def test_numpy_fields():
+    numpy = pytest.importorskip("numpy")
+    from numpy.typing import NDArray
+
+    class Query:
+        @staticresolver
+        def readings(data, info) -> numpy.ndarray:
+            return numpy.linspace(0, 1, 5)
+
+        @staticresolver
+        def counts(data, info) -> NDArray[numpy.int32]:
+            return numpy.arange(4, dtype=numpy.int32)
+
+        @staticresolver
+        def flags(data, info) -> NDArray[numpy.bool_]:
+            return numpy.array([True, False])
+
+    query = graphql_type(Query)
+    assert str(query.fields["readings"].type) == "[Float!]!"
+    assert str(query.fields["counts"].type) == "[Int!]!"
+    assert str(query.fields["flags"].type) == "[Boolean!]!"
+
+    result = execute_sync(GraphQLSchema(query=query), "{ readings counts flags }")
+    assert result.errors is None
+    assert result.data == {
+        "readings": [0.0, 0.25, 0.5, 0.75, 1.0],
+        "counts": [0, 1, 2, 3],
+        "flags": [True, False],
+    }
@@ -0,0 +1,81 @@
+from typing import List
+from typing import Optional
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import GraphQLBase64
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+PNG = bytes(range(256))
+
+
+class Query:
+    @staticresolver
+    def thumbnail(data, info) -> bytes:
+        return PNG
+
+    @staticresolver
+    def buffer(data, info) -> Optional[bytearray]:
+        return bytearray(b"hello")
+
+    @staticresolver
+    def view(data, info) -> memoryview:
+        return memoryview(PNG)[10:20]
+
+    @staticresolver
+    def strided(data, info) -> memoryview:
+        return memoryview(b"abcdef")[::2]
+
+    @staticresolver
+    def blobs(data, info) -> List[bytes]:
+        return [b"a", b"bc"]
+
+    @staticresolver
+    def length(data, info, blob: bytes) -> int:
+        return len(blob)
+
+
+def test_bytes_types():
+    query = graphql_type(Query)
+    assert str(query.fields["thumbnail"].type) == "Base64!"
+    assert str(query.fields["buffer"].type) == "Base64"
+    assert str(query.fields["view"].type) == "Base64!"
+    assert str(query.fields["length"].args["blob"].type) == "Base64!"
+
+
+def test_bytes_serialize():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = execute_sync(schema, "{ thumbnail buffer view strided blobs }")
+    assert result.errors is None
+    assert result.data == {
+        "thumbnail": GraphQLBase64.serialize(PNG),
+        "buffer": "aGVsbG8=",
+        "view": GraphQLBase64.serialize(PNG[10:20]),
+        "strided": "YWNl",
+        "blobs": ["YQ==", "YmM="],
+    }
+    assert GraphQLBase64.parse_value(result.data["thumbnail"]) == PNG
+    with pytest.raises(Exception, match="Base64 cannot represent non-bytes value"):
+        GraphQLBase64.serialize("text")
+
+
+def test_bytes_parse():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = execute_sync(schema, '{ length(blob: "aGVsbG8=") }')
+    assert result.errors is None
+    assert result.data == {"length": 5}
+
+    result = execute_sync(
+        schema,
+        "query ($blob: Base64!) { length(blob: $blob) }",
+        variable_values={"blob": "YQ=="},
+    )
+    assert result.data == {"length": 1}
+
+    result = execute_sync(schema, '{ length(blob: "not base64!") }')
+    assert "Invalid Base64 value 'not base64!'" in result.errors[0].message
+    result = execute_sync(schema, "{ length(blob: 5) }")
+    assert "Base64 cannot represent non-string value: 5" in result.errors[0].message
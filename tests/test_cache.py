@@ -0,0 +1,221 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Annotated, Iterator, List
+
+from graphql import graphql_sync
+from graphql.pyutils import Undefined
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    Cached,
+    LRUCache,
+    TypedGraphqlMiddlewareManager,
+    execute_async,
+    graphql_type,
+    staticresolver,
+)
+
+
+@dataclass
+class Country:
+    code: str
+
+
+def test_cached_field_is_resolved_once():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        def countries(data, info) -> Annotated[List[Country], policy]:
+            calls.append(1)
+            return [Country("NZ"), Country("AU")]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    for _ in range(3):
+        result = graphql_sync(schema, "{countries { code }}")
+        assert result.errors is None
+        assert result.data == {"countries": [{"code": "NZ"}, {"code": "AU"}]}
+
+    assert len(calls) == 1
+    assert policy.stats.hits == 2
+    assert policy.stats.misses == 1
+
+
+def test_cached_field_schema_is_unchanged():
+    class Query:
+        @staticresolver
+        def countries(data, info) -> Annotated[List[Country], Cached(ttl=60)]:
+            return []
+
+    assert str(graphql_type(Query).fields["countries"].type) == "[Country!]!"
+
+
+def test_cached_field_is_keyed_by_arguments():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        def flag(data, info, flag_name: str) -> Annotated[bool, policy]:
+            calls.append(flag_name)
+            return flag_name == "on"
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    assert graphql_sync(schema, '{flag(flagName: "on")}').data == {"flag": True}
+    assert graphql_sync(schema, '{flag(flagName: "off")}').data == {"flag": False}
+    assert graphql_sync(schema, '{flag(flagName: "on")}').data == {"flag": True}
+    assert calls == ["on", "off"]
+
+
+def test_cached_field_with_custom_key():
+    calls = []
+    policy = Cached(ttl=60, key=lambda data, info: data.id, store=LRUCache())
+
+    @dataclass
+    class User:
+        id: str
+
+        def resolve_country(self, info) -> Annotated[str, policy]:
+            calls.append(self.id)
+            return "NZ"
+
+    class Query:
+        @staticresolver
+        def users(data, info) -> List[User]:
+            return [User("1"), User("2"), User("1")]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = graphql_sync(
+        schema, "{users { country }}", middleware=TypedGraphqlMiddlewareManager()
+    )
+    assert result.errors is None
+    assert result.data == {"users": [{"country": "NZ"}] * 3}
+    assert calls == ["1", "2"]
+
+
+def test_cached_field_expires():
+    calls = []
+    policy = Cached(ttl=0.05, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        def countries(data, info) -> Annotated[List[str], policy]:
+            calls.append(1)
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    graphql_sync(schema, "{countries}")
+    graphql_sync(schema, "{countries}")
+    time.sleep(0.1)
+    graphql_sync(schema, "{countries}")
+    assert len(calls) == 2
+
+
+def test_cached_generator_is_materialized():
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        def countries(data, info) -> Annotated[Iterator[str], policy]:
+            yield from ["NZ", "AU"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    assert graphql_sync(schema, "{countries}").data == {"countries": ["NZ", "AU"]}
+    assert graphql_sync(schema, "{countries}").data == {"countries": ["NZ", "AU"]}
+
+
+def test_cached_method_resolver_with_middleware():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        def resolve_countries(self, info) -> Annotated[List[str], policy]:
+            calls.append(1)
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    for _ in range(2):
+        result = graphql_sync(
+            schema, "{countries}", Query(), middleware=TypedGraphqlMiddlewareManager()
+        )
+        assert result.data == {"countries": ["NZ"]}
+    assert len(calls) == 1
+
+
+def test_concurrent_misses_are_coalesced():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        async def countries(data, info) -> Annotated[List[str], policy]:
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = asyncio.new_event_loop().run_until_complete(
+        execute_async(schema, "{a: countries, b: countries, c: countries}")
+    )
+    assert result.errors is None
+    assert result.data == {"a": ["NZ"], "b": ["NZ"], "c": ["NZ"]}
+    assert len(calls) == 1
+    assert policy.stats.misses == 1
+    assert policy.stats.coalesced == 2
+
+
+def test_cancelled_caller_does_not_strand_waiters():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    async def resolve():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return ["NZ"]
+
+    async def main():
+        first = asyncio.ensure_future(policy.get_or_resolve("countries", resolve))
+        second = asyncio.ensure_future(policy.get_or_resolve("countries", resolve))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.wait_for(second, 1)
+
+    assert asyncio.new_event_loop().run_until_complete(main()) == ["NZ"]
+    assert len(calls) == 1
+    assert policy.stats.coalesced == 1
+    assert policy.store.get("countries") == ["NZ"]
+
+
+def test_errors_are_not_cached():
+    calls = []
+    policy = Cached(ttl=60, store=LRUCache())
+
+    class Query:
+        @staticresolver
+        async def countries(data, info) -> Annotated[List[str], policy]:
+            calls.append(1)
+            if len(calls) == 1:
+                raise Exception("upstream down")
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    loop = asyncio.new_event_loop()
+    result = loop.run_until_complete(execute_async(schema, "{countries}"))
+    assert result.errors[0].message == "upstream down"
+    result = loop.run_until_complete(execute_async(schema, "{countries}"))
+    assert result.errors is None
+    assert result.data == {"countries": ["NZ"]}
+
+
+def test_lru_cache_is_bounded():
+    store = LRUCache(maxsize=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    assert len(store) == 2
+    assert store.get("a") == 1
+    assert store.get("c") == 3
+    assert store.get("b") is Undefined
@@ -0,0 +1,146 @@
+import os
+from typing import Annotated, List
+
+from graphql.pyutils import Undefined
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    CacheHint,
+    Cached,
+    LRUCache,
+    ResponseCache,
+    SQLiteCache,
+    execute_sync,
+    graphql_type,
+    staticresolver,
+)
+
+
+def test_lru_cache_accounts_bytes():
+    store = LRUCache(maxbytes=10, sizeof=len)
+    store.set("a", "aaaa")
+    store.set("b", "bbbb")
+    assert store.bytes == 8
+    store.set("c", "cccc")
+    assert store.bytes == 8
+    assert store.get("a") is Undefined
+    assert store.get("b") == "bbbb"
+
+    store.set("b", "bb")
+    assert store.bytes == 6
+    store.delete("c")
+    assert store.bytes == 2
+
+
+def test_lru_cache_skips_values_larger_than_maxbytes():
+    store = LRUCache(maxbytes=10, sizeof=len)
+    store.set("a", "aaaa")
+    store.set("big", "x" * 11)
+    assert store.get("big") is Undefined
+    assert store.get("a") == "aaaa"
+
+
+def test_lru_cache_measures_nested_values():
+    store = LRUCache(maxbytes=10_000)
+    store.set("a", [[str(i) * 1000] for i in range(5)])
+    assert store.bytes > 5000
+    store.set("b", [[str(i) * 1000] for i in range(8)])
+    assert store.get("a") is Undefined
+    assert store.bytes <= 10_000
+
+
+def test_lru_cache_metrics_hook():
+    events = []
+    store = LRUCache(maxsize=1, metrics=lambda event, key: events.append((event, key)))
+    store.get("a")
+    store.set("a", 1)
+    store.get("a")
+    store.set("b", 2)
+    assert events == [
+        ("miss", "a"),
+        ("set", "a"),
+        ("hit", "a"),
+        ("set", "b"),
+        ("evict", "a"),
+    ]
+
+
+def test_sqlite_cache(tmp_path):
+    store = SQLiteCache(os.path.join(tmp_path, "cache.db"))
+    assert store.get("a") is Undefined
+    store.set("a", {"value": [1, 2]})
+    assert store.get("a") == {"value": [1, 2]}
+    store.set("a", "replaced")
+    assert store.get("a") == "replaced"
+    store.delete("a")
+    assert store.get("a") is Undefined
+
+
+def test_sqlite_cache_expires(tmp_path):
+    store = SQLiteCache(os.path.join(tmp_path, "cache.db"))
+    store.set("a", 1, ttl=-1)
+    assert store.get("a") is Undefined
+    assert len(store) == 0
+
+
+def test_sqlite_cache_is_shared(tmp_path):
+    path = os.path.join(tmp_path, "cache.db")
+    worker1 = SQLiteCache(path)
+    worker2 = SQLiteCache(path)
+    worker1.set("a", "shared")
+    assert worker2.get("a") == "shared"
+    worker2.clear()
+    assert worker1.get("a") is Undefined
+
+
+def test_sqlite_cache_is_bounded(tmp_path):
+    events = []
+    store = SQLiteCache(
+        os.path.join(tmp_path, "cache.db"),
+        maxsize=2,
+        metrics=lambda event, key: events.append((event, key)),
+    )
+    for key in "abc":
+        store.set(key, key)
+    store.trim()
+    assert len(store) == 2
+    assert store.get("a") is Undefined
+    assert ("evict", "a") in events
+
+
+def test_backends_are_interchangeable(tmp_path):
+    calls = []
+    path = os.path.join(tmp_path, "cache.db")
+    policy = Cached(ttl=60, store=SQLiteCache(path))
+
+    class Query:
+        @staticresolver
+        def countries(
+            data, info
+        ) -> Annotated[List[str], policy, CacheHint(max_age=60)]:
+            calls.append(1)
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    response_cache = ResponseCache(store=SQLiteCache(path))
+    for _ in range(2):
+        result = execute_sync(schema, "{countries}")
+        assert result.data == {"countries": ["NZ"]}
+        result = execute_sync(
+            schema, "{other: countries}", response_cache=response_cache
+        )
+        assert result.data == {"other": ["NZ"]}
+    assert len(calls) == 1
+    assert response_cache.stats.hits == 1
+
+
+def test_backends_delete_by_tag(tmp_path):
+    for store in (LRUCache(), SQLiteCache(os.path.join(tmp_path, "cache.db"))):
+        store.set("a", 1, tags=["User", "User:1"])
+        store.set("b", 2, tags=["User", "User:2"])
+        store.set("c", 3)
+        assert store.delete_tags(["User:1"]) == 1
+        assert store.get("a") is Undefined
+        assert store.get("b") == 2
+        assert store.delete_tags(["User"]) == 1
+        assert store.get("c") == 3
@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from typing import Annotated, List, Optional
+
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    CacheHint,
+    ResponseCache,
+    cache_control_header,
+    execute_sync,
+    graphql_type,
+    staticresolver,
+)
+
+
+@CacheHint(max_age=600)
+@dataclass
+class Country:
+    code: str
+    population: Annotated[int, CacheHint(max_age=60)]
+
+
+@CacheHint(scope="private")
+@dataclass
+class Account:
+    email: str
+
+
+class Query:
+    @staticresolver
+    def countries(data, info) -> List[Country]:
+        return [Country("NZ", 5_000_000)]
+
+    @staticresolver
+    def headline(data, info) -> Annotated[str, CacheHint(max_age=300)]:
+        return "news"
+
+    @staticresolver
+    def account(data, info) -> Optional[Account]:
+        return Account("a@example.com")
+
+    @staticresolver
+    def uncached(data, info) -> str:
+        return "x"
+
+
+schema = GraphQLSchema(query=graphql_type(Query))
+
+
+def test_hints_are_recorded_on_fields():
+    query = graphql_type(Query)
+    assert query.fields["headline"].extensions["cache_hint"].max_age == 300
+    # Inherited from the returned type
+    assert query.fields["countries"].extensions["cache_hint"].max_age == 600
+    assert "cache_hint" not in query.fields["uncached"].extensions
+
+    country = schema.get_type("Country")
+    assert country.fields["population"].extensions["cache_hint"].max_age == 60
+
+
+def test_policy_is_added_to_extensions():
+    result = execute_sync(schema, "{headline}")
+    assert result.data == {"headline": "news"}
+    assert result.extensions == {"cacheControl": {"maxAge": 300, "scope": "PUBLIC"}}
+    assert cache_control_header(result) == "max-age=300, public"
+
+
+def test_policy_is_the_minimum_of_resolved_fields():
+    result = execute_sync(schema, "{headline countries { code }}")
+    assert result.extensions == {"cacheControl": {"maxAge": 300, "scope": "PUBLIC"}}
+
+    result = execute_sync(schema, "{headline countries { code population }}")
+    assert result.extensions == {"cacheControl": {"maxAge": 60, "scope": "PUBLIC"}}
+
+
+def test_unhinted_root_and_object_fields_are_not_cacheable():
+    result = execute_sync(schema, "{headline uncached}")
+    assert result.extensions == {"cacheControl": {"maxAge": 0, "scope": "PUBLIC"}}
+    assert cache_control_header(result) == "no-store"
+
+    cache = ResponseCache()
+    execute_sync(schema, "{headline uncached}", response_cache=cache)
+    assert len(cache.store) == 0
+
+    @dataclass
+    class Page:
+        title: str
+
+    class Query:
+        @staticresolver
+        def site(data, info) -> Annotated[Page, CacheHint(max_age=300)]:
+            return Page("home")
+
+    # Unhinted scalar fields follow their parent
+    result = execute_sync(GraphQLSchema(query=graphql_type(Query)), "{site { title }}")
+    assert result.extensions == {"cacheControl": {"maxAge": 300, "scope": "PUBLIC"}}
+
+
+def test_private_scope_wins():
+    result = execute_sync(schema, "{headline account { email }}")
+    assert result.extensions == {"cacheControl": {"maxAge": 300, "scope": "PRIVATE"}}
+    assert cache_control_header(result) == "max-age=300, private"
+
+
+def test_no_hints_no_policy():
+    result = execute_sync(schema, "{uncached}")
+    assert result.extensions is None
+    assert cache_control_header(result) is None
+
+
+def test_private_responses_need_a_partition():
+    cache = ResponseCache()
+    execute_sync(schema, "{headline account { email }}", response_cache=cache)
+    assert len(cache.store) == 0
+
+    cache = ResponseCache(partition_key=lambda context: context["user"])
+    execute_sync(
+        schema,
+        "{headline account { email }}",
+        context_value={"user": 1},
+        response_cache=cache,
+    )
+    assert len(cache.store) == 1
+    result = execute_sync(
+        schema,
+        "{headline account { email }}",
+        context_value={"user": 1},
+        response_cache=cache,
+    )
+    assert cache.stats.hits == 1
+    assert result.extensions == {"cacheControl": {"maxAge": 300, "scope": "PRIVATE"}}
+
+
+def test_zero_max_age_is_no_store():
+    class Query:
+        @staticresolver
+        def now(data, info) -> Annotated[str, CacheHint(max_age=0)]:
+            return "now"
+
+    result = execute_sync(GraphQLSchema(query=graphql_type(Query)), "{now}")
+    assert cache_control_header(result) == "no-store"
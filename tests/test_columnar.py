@@ -0,0 +1,97 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List
+from typing import Optional
+
+from graphql import specified_directives
+from graphql.type import GraphQLSchema
+
+from typed_graphql import GraphQLColumnarDirective
+from typed_graphql import columnar_rows
+from typed_graphql import execute_async
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+
+@dataclass
+class Country:
+    code: str
+    name: str
+    population: Optional[int] = None
+
+    @staticresolver
+    def upper(data, info) -> str:
+        return data.name.upper()
+
+    @staticresolver
+    async def slow(data, info) -> str:
+        await asyncio.sleep(0)
+        return data.code.lower()
+
+    @staticresolver
+    def required(data, info) -> int:
+        if data.code == "NO":
+            raise ValueError("no")
+        return 1
+
+
+COUNTRIES = [Country("NZ", "New Zealand", 5), Country("NO", "Norway")]
+
+
+class Query:
+    @staticresolver
+    def countries(data, info) -> List[Country]:
+        return COUNTRIES
+
+    @staticresolver
+    def maybe(data, info) -> List[Optional[Country]]:
+        return [COUNTRIES[0], None, COUNTRIES[1]]
+
+
+schema = GraphQLSchema(
+    query=graphql_type(Query),
+    directives=[*specified_directives, GraphQLColumnarDirective],
+)
+
+
+def test_columnar():
+    query = "{ countries @columnar { code name pop: population upper } }"
+    result = execute_sync(schema, query)
+    assert result.errors is None
+    assert result.data == {
+        "countries": {
+            "code": ["NZ", "NO"],
+            "name": ["New Zealand", "Norway"],
+            "pop": [5, None],
+            "upper": ["NEW ZEALAND", "NORWAY"],
+        }
+    }
+    rows = execute_sync(schema, "{ countries { code name pop: population upper } }")
+    assert columnar_rows(result.data["countries"]) == rows.data["countries"]
+
+
+def test_columnar_if():
+    query = "query ($c: Boolean!) { countries @columnar(if: $c) { code } }"
+    result = execute_sync(schema, query, variable_values={"c": False})
+    assert result.data == {"countries": [{"code": "NZ"}, {"code": "NO"}]}
+
+
+def test_columnar_null_rows():
+    result = execute_sync(schema, "{ maybe @columnar { code required } }")
+    assert result.data == {
+        "maybe": {"code": ["NZ", None, None], "required": [1, None, None]}
+    }
+    assert [error.path for error in result.errors] == [["maybe", 2, "required"]]
+
+    result = execute_sync(schema, "{ countries @columnar { code required } }")
+    assert result.data is None
+    assert [error.path for error in result.errors] == [["countries", 1, "required"]]
+
+
+def test_columnar_async():
+    result = asyncio.new_event_loop().run_until_complete(
+        execute_async(schema, "{ countries @columnar { slow code } }")
+    )
+    assert result.errors is None
+    assert result.data == {"countries": {"slow": ["nz", "no"], "code": ["NZ", "NO"]}}
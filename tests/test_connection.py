@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import pytest
+from graphql import graphql, graphql_sync
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    Connection,
+    TypedGraphqlMiddlewareManager,
+    graphql_type,
+    staticresolver,
+)
+
+
+@dataclass
+class Row:
+    id: int
+
+
+@pytest.fixture
+def read() -> List[int]:
+    return []
+
+
+@pytest.fixture
+def schema(read: List[int]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def rows(data, info) -> Connection[Row]:
+            for i in range(1_000_000):
+                read.append(i)
+                yield Row(i)
+
+        @staticresolver
+        def letters(data, info) -> Optional[Connection[str]]:
+            return ["a", "b", "c"]
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+def test_connection_types(schema):
+    rows = schema.query_type.fields["rows"]
+    assert str(rows.type) == "RowConnection!"
+    assert list(rows.args) == ["first", "after"]
+    assert str(schema.query_type.fields["letters"].type) == "StringConnection"
+    assert str(schema.get_type("RowConnection").fields["edges"].type) == ("[RowEdge!]!")
+    assert str(schema.get_type("RowEdge").fields["node"].type) == "Row!"
+
+
+def test_first_page_is_read_lazily(schema, read):
+    result = graphql_sync(
+        schema,
+        "{ rows(first: 20) { edges { node { id } } pageInfo { endCursor } } }",
+    )
+    assert result.errors is None
+    assert [edge["node"]["id"] for edge in result.data["rows"]["edges"]] == list(
+        range(20)
+    )
+    assert read == list(range(20))
+
+
+def test_pages_follow_the_cursor(schema):
+    query = """
+        query ($after: String) {
+            rows(first: 2, after: $after) {
+                edges { cursor node { id } }
+                pageInfo { hasNextPage hasPreviousPage startCursor endCursor }
+            }
+        }
+    """
+    first = graphql_sync(schema, query).data["rows"]
+    assert first["pageInfo"]["hasNextPage"] is True
+    assert first["pageInfo"]["hasPreviousPage"] is False
+    assert first["pageInfo"]["startCursor"] == first["edges"][0]["cursor"]
+
+    second = graphql_sync(
+        schema, query, variable_values={"after": first["pageInfo"]["endCursor"]}
+    ).data["rows"]
+    assert [edge["node"]["id"] for edge in second["edges"]] == [2, 3]
+    assert second["pageInfo"]["hasPreviousPage"] is True
+
+
+def test_last_page(schema):
+    result = graphql_sync(
+        schema, "{ letters(first: 3) { edges { node } pageInfo { hasNextPage } } }"
+    )
+    assert result.data == {
+        "letters": {
+            "edges": [{"node": "a"}, {"node": "b"}, {"node": "c"}],
+            "pageInfo": {"hasNextPage": False},
+        }
+    }
+
+
+def test_invalid_cursor(schema):
+    result = graphql_sync(schema, '{ letters(after: "nope") { edges { node } } }')
+    assert result.data == {"letters": None}
+    assert result.errors[0].message == "Invalid cursor 'nope'"
+
+
+def test_resolver_taking_first_and_after(calls, run):
+    class Query:
+        @staticresolver
+        async def numbers(
+            data, info, first: Optional[int] = None, after: Optional[int] = None
+        ) -> Connection[int]:
+            calls.append((first, after))
+            start = 0 if after is None else after + 1
+            return iter([10, 11, 12][start:])
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = run(graphql(schema, "{ numbers(first: 2) { edges { node cursor } } }"))
+    edges = result.data["numbers"]["edges"]
+    assert [edge["node"] for edge in edges] == [10, 11]
+    assert calls == [(2, None)]
+
+    query = "query ($after: String) { numbers(after: $after) { edges { node } } }"
+    result = run(graphql(schema, query, variable_values={"after": edges[0]["cursor"]}))
+    assert result.data == {"numbers": {"edges": [{"node": 11}, {"node": 12}]}}
+    assert calls[-1] == (None, 0)
+
+
+def test_method_resolver_with_middleware():
+    class Query:
+        def resolve_words(self, info) -> Connection[str]:
+            yield from ["x", "y"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = graphql_sync(
+        schema,
+        "{ words(first: 1) { edges { node } } }",
+        Query(),
+        middleware=TypedGraphqlMiddlewareManager(),
+    )
+    assert result.data == {"words": {"edges": [{"node": "x"}]}}
+
+
+def test_generator_lists_are_unchanged():
+    class Query:
+        @staticresolver
+        def words(data, info) -> Iterator[str]:
+            yield from ["x", "y"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    assert graphql_sync(schema, "{ words }").data == {"words": ["x", "y"]}
@@ -1,16 +1,23 @@
 from dataclasses import dataclass
 from datetime import datetime
+from datetime import timedelta
 from datetime import timezone
 from typing import Any
 from typing import List
 from typing import Optional
 
+import pytest
+from graphql import GraphQLError
 from graphql import graphql_sync
 from graphql.type import GraphQLSchema
 from graphql.utilities import print_schema
 
+from typed_graphql import GraphQLTypeConversionContext
 from typed_graphql import TypedGraphqlMiddlewareManager
 from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+from typed_graphql.scalars import parse_iso_datetime
+from typed_graphql.scalars import serialize_datetime
 
 
 def get(field: str, data, info) -> Optional[Any]:
@@ -134,3 +141,91 @@ def test_datetime_optional():
     )
     assert result.data == {"user": [{"login": None}]}
     assert result.errors is None
+
+
+def make_schema(**ctx_options):
+    class Query:
+        @staticresolver
+        def at(data, info, when: datetime) -> datetime:
+            return when
+
+        @staticresolver
+        def stored(data, info) -> datetime:
+            return data["stored"]
+
+    ctx = GraphQLTypeConversionContext(**ctx_options)
+    return GraphQLSchema(query=graphql_type(Query, ctx=ctx))
+
+
+def test_datetime_serialization_matches_strftime():
+    for value in (
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2021, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc),
+        datetime(2021, 6, 1, 12, 30, 0, 1234, tzinfo=timezone.utc),
+    ):
+        assert serialize_datetime(value) == value.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def test_datetime_literal_and_variable():
+    schema = make_schema()
+    result = graphql_sync(schema, '{ at(when: "2020-01-01T10:00:00+02:00") }')
+    assert result.errors is None
+    assert result.data == {"at": "2020-01-01T08:00:00.000000Z"}
+
+    result = graphql_sync(
+        schema,
+        "query ($when: DateTime!) { at(when: $when) }",
+        variable_values={"when": "2020-01-01 08:00:00.5Z"},
+    )
+    assert result.errors is None
+    assert result.data == {"at": "2020-01-01T08:00:00.500000Z"}
+
+    result = graphql_sync(schema, "{ at(when: 12) }")
+    assert result.errors[0].message.startswith(
+        "DateTime cannot represent non-string value: 12"
+    )
+    result = graphql_sync(schema, '{ at(when: "2020-01-01T10:00:00") }')
+    assert "Datetime must be timezone aware" in result.errors[0].message
+
+
+def test_parse_iso_datetime_is_tolerant():
+    expected = datetime(2020, 1, 1, 8, 0, 0, 123400, tzinfo=timezone.utc)
+    assert parse_iso_datetime("2020-01-01T08:00:00.1234Z") == expected
+    assert parse_iso_datetime("2020-01-01 08:00:00.1234z") == expected
+    assert parse_iso_datetime(" 2020-01-01T08:00:00.123400+00:00 ") == expected
+    assert parse_iso_datetime("2020-01-01T08:00:00.123400123Z") == expected
+    with pytest.raises(GraphQLError, match="Invalid DateTime 'yesterday'"):
+        parse_iso_datetime("yesterday")
+
+
+def test_datetime_timezone_policies():
+    oslo = timezone(timedelta(hours=2))
+    aware = datetime(2020, 1, 1, 10, 0, 0, tzinfo=oslo)
+    naive = datetime(2020, 1, 1, 10, 0, 0)
+
+    def stored(value, **ctx_options):
+        result = graphql_sync(
+            make_schema(**ctx_options), "{ stored }", {"stored": value}
+        )
+        if result.errors:
+            return result.errors[0].message
+        return result.data["stored"]
+
+    assert stored(aware) == "Datetime must UTC"
+    assert stored(aware, timezone_policy="convert") == "2020-01-01T08:00:00.000000Z"
+    assert stored(naive, timezone_policy="convert") == "Datetime must be timezone aware"
+    assert stored(naive, timezone_policy="assume_utc") == "2020-01-01T10:00:00.000000Z"
+    assert stored(aware, timezone_policy="assume_utc") == "2020-01-01T08:00:00.000000Z"
+    assert (
+        stored(aware, timezone_policy="preserve") == "2020-01-01T10:00:00.000000+02:00"
+    )
+
+    schema = make_schema(timezone_policy="preserve")
+    result = graphql_sync(schema, '{ at(when: "2020-01-01T10:00:00+02:00") }')
+    assert result.data == {"at": "2020-01-01T10:00:00.000000+02:00"}
+    schema = make_schema(timezone_policy="assume_utc")
+    result = graphql_sync(schema, '{ at(when: "2020-01-01T10:00:00") }')
+    assert result.data == {"at": "2020-01-01T10:00:00.000000Z"}
+
+    with pytest.raises(ValueError):
+        GraphQLTypeConversionContext(timezone_policy="local")
@@ -0,0 +1,150 @@
+from decimal import Decimal
+import asyncio
+import io
+import json
+from typing import Annotated
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import pytest
+from graphql import graphql_sync
+from graphql.type import GraphQLSchema
+from graphql.utilities import print_schema
+
+from typed_graphql import CacheHint
+from typed_graphql import GraphQLDecimal
+from typed_graphql import GraphQLDecimalNumber
+from typed_graphql import GraphQLTypeConversionContext
+from typed_graphql import ResponseCache
+from typed_graphql import execute_sync
+from typed_graphql import export_async
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+from typed_graphql.encode import json_default
+
+
+class Query:
+    @staticresolver
+    def price(data, info) -> Annotated[Decimal, GraphQLDecimal]:
+        return Decimal("19.99")
+
+    @staticresolver
+    def prices(data, info) -> List[Annotated[Decimal, GraphQLDecimal]]:
+        return [Decimal("0.10"), Decimal("12345678901234567890.123456789")]
+
+    @staticresolver
+    def discount(data, info) -> Optional[Annotated[Decimal, GraphQLDecimal]]:
+        return None
+
+    @staticresolver
+    def add(
+        data,
+        info,
+        a: Annotated[Decimal, GraphQLDecimal],
+        b: Annotated[Decimal, GraphQLDecimal],
+    ) -> Annotated[Decimal, GraphQLDecimal]:
+        return a + b
+
+    @staticresolver
+    def legacy(data, info) -> Decimal:
+        return Decimal("10.5")
+
+
+def test_decimal_annotated_field():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    assert str(graphql_type(Query).fields["price"].type) == "Decimal!"
+    assert str(graphql_type(Query).fields["discount"].type) == "Decimal"
+    assert str(graphql_type(Query).fields["legacy"].type) == "Float!"
+    assert "scalar Decimal" in print_schema(schema)
+
+    result = graphql_sync(schema, "{ price prices discount legacy }")
+    assert result.errors is None
+    assert result.data == {
+        "price": "19.99",
+        "prices": ["0.10", "12345678901234567890.123456789"],
+        "discount": None,
+        "legacy": 10.5,
+    }
+
+
+def test_decimal_literals_and_variables():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = graphql_sync(schema, '{ add(a: "0.1", b: 0.2) }')
+    assert result.errors is None
+    assert result.data == {"add": "0.3"}
+
+    result = graphql_sync(schema, "{ add(a: 0.1, b: 0.2) }")
+    assert result.data == {"add": "0.3"}
+
+    result = graphql_sync(
+        schema,
+        "query ($a: Decimal!) { add(a: $a, b: 1) }",
+        variable_values={"a": "99999999999999999999.01"},
+    )
+    assert result.data == {"add": "100000000000000000000.01"}
+
+    result = graphql_sync(schema, '{ add(a: "lots", b: 1) }')
+    assert "Decimal cannot represent value: 'lots'" in result.errors[0].message
+    result = graphql_sync(schema, '{ add(a: "NaN", b: 1) }')
+    assert result.errors
+
+
+def test_decimal_format_for_every_decimal():
+    class Query:
+        @staticresolver
+        def total(data, info, tax: Decimal) -> Decimal:
+            return Decimal("10.5") + tax
+
+    ctx = GraphQLTypeConversionContext(decimal_format="string")
+    schema = GraphQLSchema(query=graphql_type(Query, ctx=ctx))
+    result = graphql_sync(schema, '{ total(tax: "0.25") }')
+    assert result.data == {"total": "10.75"}
+
+    ctx = GraphQLTypeConversionContext(decimal_format="number")
+    schema = GraphQLSchema(query=graphql_type(Query, ctx=ctx))
+    result = graphql_sync(schema, "{ total(tax: 0.25) }")
+    assert result.data == {"total": Decimal("10.75")}
+
+    with pytest.raises(ValueError):
+        GraphQLTypeConversionContext(decimal_format="float")
+
+
+def test_decimal_serialize():
+    assert GraphQLDecimal.serialize(Decimal("1.10")) == "1.10"
+    assert GraphQLDecimal.serialize(3) == "3"
+    assert GraphQLDecimal.serialize(0.1) == "0.1"
+    assert GraphQLDecimal.serialize(Decimal("0E-8")) == "0.00000000"
+    assert GraphQLDecimal.serialize(Decimal("1E+20")) == "100000000000000000000"
+    assert json_default(Decimal("1E+20")) == "100000000000000000000"
+    assert GraphQLDecimalNumber.serialize(0.1) == Decimal("0.1")
+    with pytest.raises(Exception, match="Decimal cannot represent value"):
+        GraphQLDecimal.serialize(Decimal("Infinity"))
+    with pytest.raises(Exception, match="Decimal cannot represent value"):
+        GraphQLDecimal.serialize(True)
+
+
+def test_decimal_numbers_are_encoded_to_json():
+    class Query:
+        @staticresolver
+        def total(data, info) -> Annotated[Decimal, CacheHint(max_age=60)]:
+            return Decimal("10.75")
+
+        @staticresolver
+        def totals(data, info) -> Iterator[Decimal]:
+            yield from (Decimal("0.10"), Decimal("1.5"))
+
+    ctx = GraphQLTypeConversionContext(decimal_format="number")
+    schema = GraphQLSchema(query=graphql_type(Query, ctx=ctx))
+    cache = ResponseCache()
+    execute_sync(schema, "{ total }", response_cache=cache)
+    assert len(cache.store) == 1
+    result = execute_sync(schema, "{ total }", response_cache=cache)
+    assert result.data == {"total": "10.75"}
+
+    out = io.StringIO()
+    asyncio.new_event_loop().run_until_complete(export_async(schema, "{ totals }", out))
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        "0.10",
+        "1.5",
+    ]
@@ -0,0 +1,176 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+
+from graphql import ExecutionResult, specified_directives
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    GraphQLDeferDirective,
+    GraphQLStreamDirective,
+    execute_incremental,
+    graphql_type,
+    multipart_mixed,
+    staticresolver,
+)
+
+
+@dataclass
+class Product:
+    id: str
+
+    async def resolve_reviews(self, info) -> List[str]:
+        await asyncio.sleep(0.05)
+        return ["great"]
+
+    async def resolve_rating(self, info) -> Optional[int]:
+        raise Exception("ratings unavailable")
+
+
+@dataclass
+class Part:
+    id: str
+
+    def resolve_stock(self, info) -> int:
+        raise Exception("stock unavailable")
+
+
+class Query:
+    @staticresolver
+    def product(data, info) -> Product:
+        return Product("1")
+
+    @staticresolver
+    def part(data, info) -> Optional[Part]:
+        return Part("2")
+
+    @staticresolver
+    def required_part(data, info) -> Part:
+        return Part("3")
+
+    @staticresolver
+    def hello(data, info) -> str:
+        return "world"
+
+
+schema = GraphQLSchema(
+    query=graphql_type(Query),
+    directives=[*specified_directives, GraphQLDeferDirective, GraphQLStreamDirective],
+)
+
+
+async def collect(query: str):
+    results = await execute_incremental(schema, query)
+    if isinstance(results, ExecutionResult):
+        return results
+    return [result.formatted async for result in results]
+
+
+def test_deferred_fragment_is_delivered_later(run):
+    results = run(
+        collect(
+            """
+            {
+                product {
+                    id
+                    ... @defer(label: "reviews") { reviews }
+                }
+            }
+            """
+        )
+    )
+    assert results == [
+        {"data": {"product": {"id": "1"}}, "hasNext": True},
+        {
+            "incremental": [
+                {
+                    "data": {"reviews": ["great"]},
+                    "path": ["product"],
+                    "label": "reviews",
+                }
+            ],
+            "hasNext": False,
+        },
+    ]
+
+
+def test_deferred_named_fragment_at_the_root(run):
+    results = run(
+        collect(
+            """
+            query { hello ...Slow @defer }
+            fragment Slow on Query { product { reviews } }
+            """
+        )
+    )
+    assert results[0] == {"data": {"hello": "world"}, "hasNext": True}
+    assert results[1]["incremental"] == [
+        {"data": {"product": {"reviews": ["great"]}}, "path": []}
+    ]
+
+
+def test_initial_result_does_not_wait_for_deferred_fields(run):
+    async def first_result():
+        results = await execute_incremental(
+            schema, "{ product { id ... @defer { reviews } } }"
+        )
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        first = await results.__anext__()
+        elapsed = loop.time() - start
+        await results.aclose()
+        return first, elapsed
+
+    first, elapsed = run(first_result())
+    assert first.data == {"product": {"id": "1"}}
+    assert elapsed < 0.05
+
+
+def test_deferred_errors_are_delivered_with_the_fragment(run):
+    results = run(collect("{ product { id ... @defer { rating } } }"))
+    (payload,) = results[1]["incremental"]
+    assert payload["data"] == {"rating": None}
+    assert payload["errors"][0]["message"] == "ratings unavailable"
+    assert payload["errors"][0]["path"] == ["product", "rating"]
+
+
+def test_payloads_below_nulled_fields_are_dropped(run):
+    results = run(
+        collect(
+            "{ hello part { stock ... @defer { id } } ... @defer { product { id } } }"
+        )
+    )
+    assert results[0]["data"] == {"hello": "world", "part": None}
+    assert results[0]["errors"][0]["path"] == ["part", "stock"]
+    assert results[1:] == [
+        {
+            "incremental": [{"data": {"product": {"id": "1"}}, "path": []}],
+            "hasNext": False,
+        }
+    ]
+
+    result = run(collect("{ requiredPart { stock ... @defer { id } } }"))
+    assert result.data is None
+    assert result.errors[0].path == ["requiredPart", "stock"]
+
+
+def test_defer_if_false_is_not_deferred(run):
+    result = run(collect("{ product { ... @defer(if: false) { reviews } } }"))
+    assert result.data == {"product": {"reviews": ["great"]}}
+
+
+def test_multipart_mixed(run):
+    async def body():
+        results = await execute_incremental(
+            schema, "{ product { id ... @defer { reviews } } }"
+        )
+        return b"".join([chunk async for chunk in multipart_mixed(results)])
+
+    parts = run(body()).split(b"\r\n---")
+    assert parts[0] == b""
+    assert parts[-1] == b"--\r\n"
+    headers, payload = parts[1].split(b"\r\n\r\n")
+    assert headers == b"\r\nContent-Type: application/json; charset=utf-8"
+    assert json.loads(payload) == {"data": {"product": {"id": "1"}}, "hasNext": True}
+    assert json.loads(parts[2].split(b"\r\n\r\n")[1])["hasNext"] is False
@@ -0,0 +1,108 @@
+import copy
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    PatchResult,
+    apply_json_patch,
+    graphql_type,
+    json_patch,
+    staticresolver,
+    subscribe_async,
+)
+
+
+@dataclass
+class Stats:
+    visitors: int
+    pages: List[str]
+
+
+class Query:
+    @staticresolver
+    def hello(data, info) -> str:
+        return "world"
+
+
+@pytest.fixture
+def events() -> List[Stats]:
+    """What the subscription yields, filled in by the test"""
+    return []
+
+
+@pytest.fixture
+def schema(events: List[Stats]) -> GraphQLSchema:
+    class Subscription:
+        @staticresolver
+        async def stats(data, info) -> AsyncIterator[Stats]:
+            for event in events:
+                yield event
+
+    return GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+
+def test_json_patch():
+    old = {"a": 1, "b": {"c": [1, 2, 3], "d/e": "x"}, "f": True}
+    new = {"a": 1, "b": {"c": [1, 5], "d/e": "y"}, "f": 1, "g": None}
+    patch = json_patch(old, new)
+    assert patch == [
+        {"op": "replace", "path": "/b/c/1", "value": 5},
+        {"op": "remove", "path": "/b/c/2"},
+        {"op": "replace", "path": "/b/d~1e", "value": "y"},
+        {"op": "replace", "path": "/f", "value": 1},
+        {"op": "add", "path": "/g", "value": None},
+    ]
+    assert apply_json_patch(copy.deepcopy(old), patch) == new
+    assert json_patch(new, new) == []
+
+
+def test_json_patch_lists_round_trip():
+    for old, new in [([1, 2, 3, 4], [1]), ([], [{"a": 1}, 2]), ([1], "x")]:
+        assert apply_json_patch(copy.deepcopy(old), json_patch(old, new)) == new
+
+
+def test_diffed_subscription(schema, events, run):
+    events.extend(
+        [
+            Stats(1, ["/", "/about"]),
+            Stats(2, ["/", "/about"]),
+            Stats(2, ["/", "/about"]),
+            Stats(2, ["/"]),
+        ]
+    )
+
+    async def subscribe():
+        results = await subscribe_async(
+            schema, "subscription { stats { visitors pages } }", diff=True
+        )
+        return [result async for result in results]
+
+    first, *patches = run(subscribe())
+    assert first.data == {"stats": {"visitors": 1, "pages": ["/", "/about"]}}
+    # The unchanged third event is not sent
+    assert all(isinstance(patch, PatchResult) for patch in patches)
+    assert [patch.formatted for patch in patches] == [
+        {"patch": [{"op": "replace", "path": "/stats/visitors", "value": 2}]},
+        {"patch": [{"op": "remove", "path": "/stats/pages/1"}]},
+    ]
+
+    data = first.data
+    for patch in patches:
+        data = apply_json_patch(data, patch.patch)
+    assert data == {"stats": {"visitors": 2, "pages": ["/"]}}
+
+
+def test_subscription_is_not_diffed_by_default(schema, events, run):
+    events.extend([Stats(1, []), Stats(1, [])])
+
+    async def subscribe():
+        results = await subscribe_async(schema, "subscription { stats { visitors } }")
+        return [result.data async for result in results]
+
+    assert run(subscribe()) == [{"stats": {"visitors": 1}}] * 2
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+from decimal import Decimal
+from typing import Annotated
+from typing import List
+from typing import Optional
+
+from graphql.type import GraphQLSchema
+
+from typed_graphql import GraphQLDecimalNumber
+from typed_graphql import execute_async
+from typed_graphql import execute_json
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+
+@dataclass
+class Line:
+    sku: str
+    tags: List[str]
+    price: Annotated[Decimal, GraphQLDecimalNumber]
+
+
+@dataclass
+class Order:
+    id: int
+    placed: datetime
+    lines: List[Line]
+
+    @staticresolver
+    async def note(data, info) -> Optional[str]:
+        await asyncio.sleep(0)
+        if data.id == 2:
+            raise ValueError("no note")
+        return f"note {data.id}"
+
+
+ORDERS = [
+    Order(
+        i,
+        datetime(2020, 1, i, tzinfo=timezone.utc),
+        [Line(f"sku{i}", ["a", "é"], Decimal("1.10"))],
+    )
+    for i in range(1, 4)
+]
+
+
+class Query:
+    @staticresolver
+    def orders(data, info) -> List[Order]:
+        return ORDERS
+
+    @staticresolver
+    def latest(data, info) -> Order:
+        return ORDERS[-1]
+
+    @staticresolver
+    def count(data, info) -> int:
+        return len(ORDERS)
+
+
+schema = GraphQLSchema(query=graphql_type(Query))
+QUERY = """{
+  count
+  latest { id lines { sku } }
+  orders { id placed note lines { sku tags price } }
+}"""
+
+
+def test_execute_json_matches_the_formatted_result(run):
+    encoded = run(execute_json(schema, QUERY))
+    result = run(execute_async(schema, QUERY))
+    expected = result.formatted
+    for order in expected["data"]["orders"]:
+        for line in order["lines"]:
+            line["price"] = str(line["price"])
+    assert json.loads(encoded) == expected
+    assert "é".encode() in encoded
+    assert encoded.startswith(b'{"data":{"count":3,"latest":{"id":3,"lines":[{')
+
+
+def test_execute_json_errors(run):
+    encoded = run(execute_json(schema, "{ nope }"))
+    assert json.loads(encoded)["data"] is None
+    assert "Cannot query field 'nope'" in json.loads(encoded)["errors"][0]["message"]
+
+    encoded = run(execute_json(schema, "{ orders { note } }"))
+    response = json.loads(encoded)
+    assert response["data"]["orders"][1] == {"note": None}
+    assert response["errors"][0]["path"] == ["orders", 1, "note"]
+
+
+def test_execute_json_out(run):
+    expected = run(execute_json(schema, QUERY))
+
+    buffer = bytearray(b"prefix")
+    assert run(execute_json(schema, QUERY, out=buffer)) is None
+    assert buffer == b"prefix" + expected
+
+    out = io.BytesIO()
+    chunks: List[bytes] = []
+
+    class Writer:
+        async def write(self, chunk):
+            chunks.append(bytes(chunk))
+            out.write(chunk)
+
+    run(execute_json(schema, QUERY, out=Writer(), chunk_size=64))
+    assert out.getvalue() == expected
+    assert len(chunks) == -(-len(expected) // 64)
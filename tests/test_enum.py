@@ -0,0 +1,60 @@
+import enum
+from typing import List
+from typing import Optional
+
+from graphql.type import GraphQLEnumType
+from graphql.type import GraphQLSchema
+
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+Status = enum.Enum("Status", {f"S{i}": i for i in range(500)})
+
+
+class Colour(enum.Enum):
+    RED = "red"
+    CRIMSON = "red"
+    BLUE = "blue"
+
+
+class Query:
+    @staticresolver
+    def statuses(data, info) -> List[Status]:  # type: ignore
+        return [Status.S0, Status.S499, Status.S250]
+
+    @staticresolver
+    def colours(data, info) -> List[Optional[Colour]]:
+        return [Colour.CRIMSON, None, "purple"]  # type: ignore
+
+    @staticresolver
+    def echo(data, info, colour: Colour) -> Colour:
+        return colour
+
+
+def test_enum_lists_are_completed_in_one_loop():
+    field = graphql_type(Query).fields["statuses"]
+    assert isinstance(field.type.of_type.of_type.of_type, GraphQLEnumType)
+    assert field.extensions["scalar_list"] is True
+
+
+def test_enum_execution():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = execute_sync(schema, "{ statuses }")
+    assert result.errors is None
+    assert result.data == {"statuses": ["S0", "S499", "S250"]}
+
+    result = execute_sync(schema, "{ colours }")
+    assert result.data == {"colours": ["RED", None, None]}
+    assert result.errors[0].message == "Enum 'Colour' cannot represent value: 'purple'"
+
+    result = execute_sync(schema, "{ echo(colour: BLUE) }")
+    assert result.data == {"echo": "BLUE"}
+    result = execute_sync(
+        schema,
+        "query ($c: Colour!) { echo(colour: $c) }",
+        variable_values={"c": "CRIMSON"},
+    )
+    assert result.data == {"echo": "RED"}
+    result = execute_sync(schema, "{ echo(colour: GREEN) }")
+    assert "Value 'GREEN' does not exist in 'Colour' enum." in result.errors[0].message
@@ -0,0 +1,156 @@
+import io
+import json
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, List, Optional
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import export_async, graphql_type, staticresolver
+
+
+@dataclass
+class Address:
+    city: str
+    zip: str
+
+
+@dataclass
+class Person:
+    name: str
+    address: Address
+    tags: List[str]
+    age: Optional[int] = None
+
+
+@dataclass
+class Mover:
+    name: str
+    address: Optional[Address]
+
+
+@pytest.fixture
+def read() -> List[int]:
+    return []
+
+
+@pytest.fixture
+def schema(read: List[int]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def people(data, info) -> Iterator[Person]:
+            for i in range(3):
+                read.append(i)
+                yield Person(f"p{i}", Address("Oslo", f"0{i}"), ["a", "b"], i or None)
+
+        @staticresolver
+        def movers(data, info) -> List[Mover]:
+            return [Mover("m0", None), Mover("m1", Address("Bergen", "50"))]
+
+        @staticresolver
+        async def streamed(data, info) -> AsyncIterator[int]:
+            for i in range(3):
+                yield i
+
+        @staticresolver
+        def broken(data, info) -> List[int]:
+            return [1, "x", 3]  # type: ignore
+
+        @staticresolver
+        def count(data, info) -> int:
+            return 1
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+def test_export_ndjson(schema, run):
+    out = io.StringIO()
+    result = run(export_async(schema, "{ people { name age address { city } } }", out))
+    assert result.rows == 3
+    assert result.errors is None
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        {"name": "p0", "age": None, "address": {"city": "Oslo"}},
+        {"name": "p1", "age": 1, "address": {"city": "Oslo"}},
+        {"name": "p2", "age": 2, "address": {"city": "Oslo"}},
+    ]
+
+
+def test_export_csv(schema, run):
+    out = io.StringIO()
+    result = run(
+        export_async(
+            schema, "{ people { name address { city zip } tags } }", out, "csv"
+        )
+    )
+    assert result.rows == 3
+    assert out.getvalue().splitlines() == [
+        "name,address.city,address.zip,tags",
+        'p0,Oslo,00,"[""a"",""b""]"',
+        'p1,Oslo,01,"[""a"",""b""]"',
+        'p2,Oslo,02,"[""a"",""b""]"',
+    ]
+
+
+def test_export_csv_columns_follow_the_selection(schema, run):
+    out = io.StringIO()
+    run(export_async(schema, "{ movers { name address { city } } }", out, "csv"))
+    assert out.getvalue().splitlines() == [
+        "name,address.city",
+        "m0,",
+        "m1,Bergen",
+    ]
+
+    out = io.StringIO()
+    run(export_async(schema, "{ streamed }", out, "csv"))
+    assert out.getvalue().splitlines() == ["value", "0", "1", "2"]
+
+
+def test_export_reads_items_as_they_are_written(schema, read, run):
+    class Writer:
+        def __init__(self):
+            self.written: List[str] = []
+
+        def write(self, chunk: str) -> None:
+            # Each row is written before the next item is read
+            assert len(read) == len(self.written) + 1
+            self.written.append(chunk)
+
+    writer = Writer()
+    result = run(export_async(schema, "{ people { name } }", writer))
+    assert result.rows == 3
+    assert len(writer.written) == 3
+
+
+def test_export_async_writer_and_binary(schema, run):
+    class AsyncWriter:
+        def __init__(self):
+            self.written: List[str] = []
+
+        async def write(self, chunk: str) -> None:
+            self.written.append(chunk)
+
+    writer = AsyncWriter()
+    result = run(export_async(schema, "{ streamed }", writer))
+    assert result.rows == 3
+    assert writer.written == ["0\n", "1\n", "2\n"]
+
+    out = io.BytesIO()
+    run(export_async(schema, "{ streamed }", out))
+    assert out.getvalue() == b"0\n1\n2\n"
+
+
+def test_export_item_errors(schema, run):
+    out = io.StringIO()
+    result = run(export_async(schema, "{ broken }", out))
+    assert result.rows == 1
+    assert out.getvalue() == "1\n"
+    assert result.errors and result.errors[0].path == ["broken", 1]
+
+
+def test_export_needs_single_list_field(schema, run):
+    for query in ("{ count }", "{ people { name } streamed }", "{ nope }"):
+        out = io.StringIO()
+        result = run(export_async(schema, query, out))
+        assert result.rows == 0
+        assert result.errors
+        assert out.getvalue() == ""
@@ -0,0 +1,169 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    FanOut,
+    SlowSubscriber,
+    graphql_type,
+    staticresolver,
+    subscribe_async,
+)
+
+
+class Query:
+    @staticresolver
+    def hello(data, info) -> str:
+        return "world"
+
+
+@pytest.fixture
+def started() -> List[str]:
+    return []
+
+
+@pytest.fixture
+def closed() -> List[str]:
+    return []
+
+
+@pytest.fixture
+def schema(started: List[str], closed: List[str]) -> GraphQLSchema:
+    class Subscription:
+        @staticresolver
+        async def ticks(data, info, topic: str, count: int = 3) -> AsyncIterator[str]:
+            started.append(topic)
+            try:
+                for i in range(count):
+                    # Wait for the subscribers to be waiting on the first tick
+                    await asyncio.sleep(0.01)
+                    yield f"{topic}{i}"
+            finally:
+                closed.append(topic)
+
+    return GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+
+async def collect(results) -> List[str]:
+    return [result.data["ticks"] async for result in results]
+
+
+def test_identical_subscriptions_share_the_source(schema, started, closed, run):
+    fan_out = FanOut()
+
+    async def subscribe():
+        subscriptions = [
+            await subscribe_async(
+                schema, f'subscription {{ ticks(topic: "{topic}") }}', fan_out=fan_out
+            )
+            for topic in ["a", "a", "a", "b"]
+        ]
+        return await asyncio.gather(*map(collect, subscriptions))
+
+    assert run(subscribe()) == [["a0", "a1", "a2"]] * 3 + [["b0", "b1", "b2"]]
+    assert sorted(started) == ["a", "b"]
+    assert sorted(closed) == ["a", "b"]
+    assert fan_out.started == 2
+    assert fan_out.shared == 2
+
+
+def test_contexts_are_not_shared_without_partition(run):
+    class Subscription:
+        @staticresolver
+        async def me(data, info) -> AsyncIterator[str]:
+            for _ in range(2):
+                await asyncio.sleep(0.01)
+                yield info.context["user"]
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+    async def collect_me(results) -> List[str]:
+        return [result.data["me"] async for result in results]
+
+    async def subscribe(fan_out, contexts):
+        subscriptions = [
+            await subscribe_async(
+                schema, "subscription { me }", context_value=context, fan_out=fan_out
+            )
+            for context in contexts
+        ]
+        return await asyncio.gather(*map(collect_me, subscriptions))
+
+    alice, bob = {"user": "alice"}, {"user": "bob"}
+    fan_out = FanOut()
+    assert run(subscribe(fan_out, [alice, bob, alice])) == [
+        ["alice", "alice"],
+        ["bob", "bob"],
+        ["alice", "alice"],
+    ]
+    assert fan_out.started == 2
+    assert fan_out.shared == 1
+
+    fan_out = FanOut(partition_key=lambda context: "everyone")
+    run(subscribe(fan_out, [alice, bob]))
+    assert fan_out.started == 1
+
+
+def test_source_is_closed_with_the_last_subscriber(schema, closed, run):
+    fan_out = FanOut()
+
+    async def subscribe():
+        query = 'subscription { ticks(topic: "a", count: 100) }'
+        first = await subscribe_async(schema, query, fan_out=fan_out)
+        second = await subscribe_async(schema, query, fan_out=fan_out)
+        await first.__anext__()
+        await first.aclose()
+        assert closed == []
+        assert (await second.__anext__()).data == {"ticks": "a0"}
+        await second.aclose()
+
+    run(subscribe())
+    assert closed == ["a"]
+
+
+def test_slow_subscriber_drops_events(schema, run):
+    fan_out = FanOut(buffer_size=2)
+
+    async def subscribe():
+        query = 'subscription { ticks(topic: "a", count: 5) }'
+        fast = await subscribe_async(schema, query, fan_out=fan_out)
+        slow = await subscribe_async(schema, query, fan_out=fan_out)
+        fast_ticks = await collect(fast)
+        return fast_ticks, await collect(slow)
+
+    fast_ticks, slow_ticks = run(subscribe())
+    assert fast_ticks == ["a0", "a1", "a2", "a3", "a4"]
+    assert slow_ticks == ["a3", "a4"]
+    assert fan_out.dropped == 3
+
+
+def test_slow_subscriber_is_disconnected(schema, run):
+    fan_out = FanOut(buffer_size=2, overflow="disconnect")
+
+    async def subscribe():
+        query = 'subscription { ticks(topic: "a", count: 5) }'
+        fast = await subscribe_async(schema, query, fan_out=fan_out)
+        slow = await subscribe_async(schema, query, fan_out=fan_out)
+        await collect(fast)
+        try:
+            await collect(slow)
+        except SlowSubscriber:
+            return True
+
+    assert run(subscribe())
+    assert fan_out.disconnected == 1
+
+
+def test_errors_are_not_shared(schema, run):
+    result = run(
+        subscribe_async(schema, "subscription { ticks(topic: 1) }", fan_out=FanOut())
+    )
+    assert result.errors[0].message == "String cannot represent a non string value: 1"
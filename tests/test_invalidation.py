@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Annotated, List, TypedDict
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    CacheHint,
+    Cached,
+    LRUCache,
+    ResponseCache,
+    execute_sync,
+    graphql_type,
+    invalidate,
+    staticresolver,
+)
+
+
+@dataclass
+class User:
+    id: int
+    name: str
+
+
+@dataclass
+class Post:
+    id: int
+    author: User
+
+
+class Team(TypedDict):
+    id: str
+    name: str
+
+
+USERS = {1: "alice", 2: "bob"}
+
+
+@pytest.fixture
+def store() -> LRUCache:
+    return LRUCache()
+
+
+@pytest.fixture
+def schema(calls: List[str], store: LRUCache) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def user(data, info, id: int) -> Annotated[User, Cached(ttl=60, store=store)]:
+            calls.append(f"user:{id}")
+            return User(id, USERS[id])
+
+        @staticresolver
+        def teams(data, info) -> Annotated[List[Team], Cached(ttl=60, store=store)]:
+            calls.append("teams")
+            return [Team(id="a", name="A")]
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+def test_id_field_is_recorded():
+    assert graphql_type(User).extensions["id_field"] == "id"
+    assert graphql_type(Team).extensions["id_field"] == "id"
+
+
+def test_invalidate_entity_drops_only_affected_field_results(schema, calls, store):
+    execute_sync(schema, "{user(id: 1) { name }}")
+    execute_sync(schema, "{user(id: 2) { name }}")
+    invalidate(type="User", id=1)
+    assert len(store) == 1
+
+    execute_sync(schema, "{user(id: 1) { name }}")
+    execute_sync(schema, "{user(id: 2) { name }}")
+    assert calls == ["user:1", "user:2", "user:1"]
+
+
+def test_invalidate_type_drops_all_of_type(schema, store):
+    execute_sync(schema, "{user(id: 1) { name }}")
+    execute_sync(schema, "{user(id: 2) { name }}")
+    execute_sync(schema, "{teams { name }}")
+    invalidate(type="User")
+    assert len(store) == 1
+
+
+def test_invalidate_nested_entity(store):
+    class Query:
+        @staticresolver
+        def posts(data, info) -> Annotated[List[Post], Cached(ttl=60, store=store)]:
+            return [Post(1, User(5, "carol")), Post(2, User(6, "dave"))]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    execute_sync(schema, "{posts { id }}")
+    assert invalidate(type="User", id=7) == 0
+    assert invalidate(type="User", id=5) == 1
+    assert len(store) == 0
+
+
+def test_invalidate_typeddict_entity(schema, store):
+    execute_sync(schema, "{teams { name }}")
+    invalidate(type="Team", id="b")
+    assert len(store) == 1
+    invalidate(type="Team", id="a")
+    assert len(store) == 0
+
+
+def test_invalidate_responses(calls):
+    class Query:
+        @staticresolver
+        def users(data, info) -> Annotated[List[User], CacheHint(max_age=60)]:
+            calls.append("users")
+            return [User(i, name) for i, name in USERS.items()]
+
+        @staticresolver
+        def teams(data, info) -> Annotated[List[Team], CacheHint(max_age=60)]:
+            calls.append("teams")
+            return [Team(id="a", name="A")]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    cache = ResponseCache()
+
+    execute_sync(schema, "{users { name }}", response_cache=cache)
+    execute_sync(schema, "{teams { name }}", response_cache=cache)
+    invalidate(type="User", id=2)
+    assert len(cache.store) == 1
+
+    execute_sync(schema, "{users { name }}", response_cache=cache)
+    execute_sync(schema, "{teams { name }}", response_cache=cache)
+    assert calls == ["users", "teams", "users"]
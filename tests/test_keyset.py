@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Iterator, List, Optional, Tuple
+
+import pytest
+from graphql import graphql_sync
+from graphql.type import GraphQLSchema
+
+from typed_graphql import Connection, Keyset, graphql_type, staticresolver
+
+
+@dataclass
+class Post:
+    created: datetime
+    id: int
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+POSTS = [Post(START + timedelta(hours=i // 2), i) for i in range(10)]
+
+
+@pytest.fixture
+def afters() -> List[Optional[Tuple[datetime, int]]]:
+    return []
+
+
+@pytest.fixture
+def schema(afters: List[Optional[Tuple[datetime, int]]]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def posts(
+            data, info, first: int, after: Optional[Tuple[datetime, int]]
+        ) -> Annotated[Connection[Post], Keyset("created", "id")]:
+            afters.append(after)
+            # ie. WHERE (created, id) > after ORDER BY created, id LIMIT first + 1
+            rows: Iterator[Post] = iter(POSTS)
+            if after is not None:
+                rows = (post for post in rows if (post.created, post.id) > after)
+            return list(rows)[: first + 1]
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+QUERY = """
+    query ($after: String) {
+        posts(first: 3, after: $after) {
+            edges { cursor node { id } }
+            pageInfo { hasNextPage hasPreviousPage endCursor }
+        }
+    }
+"""
+
+
+def test_keyset_schema(schema):
+    posts = schema.query_type.fields["posts"]
+    assert str(posts.type) == "PostConnection!"
+    assert {name: str(arg.type) for name, arg in posts.args.items()} == {
+        "first": "Int!",
+        "after": "String",
+    }
+
+
+def test_keyset_pages(schema, afters):
+    ids = []
+    after = None
+    while True:
+        result = graphql_sync(schema, QUERY, variable_values={"after": after})
+        assert result.errors is None
+        connection = result.data["posts"]
+        ids.extend(edge["node"]["id"] for edge in connection["edges"])
+        assert connection["pageInfo"]["hasPreviousPage"] is (after is not None)
+        if not connection["pageInfo"]["hasNextPage"]:
+            break
+        after = connection["pageInfo"]["endCursor"]
+
+    assert ids == list(range(10))
+    assert afters == [
+        None,
+        (START + timedelta(hours=1), 2),
+        (START + timedelta(hours=2), 5),
+        (START + timedelta(hours=4), 8),
+    ]
+
+
+def test_invalid_keyset_cursor(schema):
+    result = graphql_sync(schema, QUERY, variable_values={"after": "bm9wZQ=="})
+    assert result.errors[0].message == "Invalid cursor 'bm9wZQ=='"
@@ -0,0 +1,122 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    add_invalidation_listener,
+    graphql_type,
+    invalidate,
+    live_query,
+    remove_invalidation_listener,
+    staticresolver,
+)
+from typed_graphql.cache import _invalidation_listeners
+
+
+@dataclass
+class Player:
+    id: int
+    score: int
+
+
+@pytest.fixture
+def scores() -> Dict[int, int]:
+    return {1: 10, 2: 20}
+
+
+@pytest.fixture
+def schema(scores: Dict[int, int], calls: List[int]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def player(data, info, id: int) -> Player:
+            calls.append(id)
+            return Player(id, scores[id])
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+async def live(schema, query, publish, expected: int, debounce=0.01) -> List:
+    results = await live_query(schema, query, debounce=debounce)
+    received = []
+
+    async def consume():
+        async for result in results:
+            received.append(result.data)
+            if len(received) == expected:
+                break
+        await results.aclose()
+
+    consumer = asyncio.ensure_future(consume())
+    await asyncio.sleep(0.01)
+    await publish()
+    await asyncio.wait_for(consumer, 1)
+    return received
+
+
+def test_invalidation_reruns_the_query(schema, scores, run):
+    async def publish():
+        scores[1] = 11
+        invalidate("Player", 1)
+
+    received = run(live(schema, "{player(id: 1) { score }}", publish, 2))
+    assert received == [{"player": {"score": 10}}, {"player": {"score": 11}}]
+
+
+def test_unrelated_invalidations_are_ignored(schema, scores, calls, run):
+    async def publish():
+        invalidate("Player", 2)
+        invalidate("Team")
+        await asyncio.sleep(0.05)
+        assert calls == [1]
+        invalidate("Player")
+
+    received = run(live(schema, "{player(id: 1) { score }}", publish, 2))
+    assert len(received) == 2
+    assert calls == [1, 1]
+
+
+def test_invalidation_bursts_are_coalesced(schema, scores, calls, run):
+    async def publish():
+        for score in range(20):
+            scores[1] = score
+            invalidate("Player", 1)
+            await asyncio.sleep(0.001)
+
+    # Far longer than the gaps between the invalidations of the burst
+    received = run(live(schema, "{player(id: 1) { score }}", publish, 2, 0.2))
+    assert received[-1] == {"player": {"score": 19}}
+    assert calls == [1, 1]
+
+
+def test_listener_is_removed_when_closed(schema, run):
+    listeners = len(_invalidation_listeners)
+
+    async def first():
+        results = await live_query(schema, "{player(id: 1) { score }}")
+        result = await results.__anext__()
+        assert len(_invalidation_listeners) == listeners + 1
+        await results.aclose()
+        return result
+
+    assert run(first()).data == {"player": {"score": 10}}
+    assert len(_invalidation_listeners) == listeners
+
+
+def test_invalidation_listener():
+    tags: List[str] = []
+    add_invalidation_listener(tags.append)
+    try:
+        invalidate("Player", 1)
+        invalidate("Player")
+    finally:
+        remove_invalidation_listener(tags.append)
+    invalidate("Player", 2)
+    assert tags == ["Player:1", "Player"]
+
+
+def test_only_queries_are_live(schema, run):
+    result = run(live_query(schema, "{nope}"))
+    assert result.errors[0].message == "Cannot query field 'nope' on type 'Query'."
@@ -0,0 +1,95 @@
+from typing import Annotated
+from typing import List
+from typing import NewType
+from typing import Optional
+
+import pytest
+from graphql import GraphQLError
+from graphql import graphql_sync
+from graphql.type import GraphQLSchema
+
+from typed_graphql import BigInt
+from typed_graphql import GraphQLLong
+from typed_graphql import Long
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+UserId = NewType("UserId", Long)
+Count = NewType("Count", int)
+
+
+class Query:
+    @staticresolver
+    def ids(data, info) -> List[UserId]:
+        return [UserId(Long(2**40 + i)) for i in range(3)]
+
+    @staticresolver
+    def largest(data, info) -> Annotated[int, GraphQLLong]:
+        return 2**63 - 1
+
+    @staticresolver
+    def overflow(data, info) -> Optional[Long]:
+        return Long(2**63)
+
+    @staticresolver
+    def huge(data, info) -> BigInt:
+        return BigInt(10**30)
+
+    @staticresolver
+    def count(data, info) -> Count:
+        return Count(1)
+
+    @staticresolver
+    def echo(data, info, id: UserId) -> UserId:
+        return id
+
+
+def test_long_types():
+    query = graphql_type(Query)
+    assert str(query.fields["ids"].type) == "[Long!]!"
+    assert str(query.fields["largest"].type) == "Long!"
+    assert str(query.fields["overflow"].type) == "Long"
+    assert str(query.fields["huge"].type) == "BigInt!"
+    # Other NewTypes still map to their supertype
+    assert str(query.fields["count"].type) == "Int!"
+
+
+def test_long_serialize():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = graphql_sync(schema, "{ ids largest huge }")
+    assert result.errors is None
+    assert result.data == {
+        "ids": [2**40, 2**40 + 1, 2**40 + 2],
+        "largest": 2**63 - 1,
+        "huge": 10**30,
+    }
+
+    result = graphql_sync(schema, "{ overflow }")
+    assert result.data == {"overflow": None}
+    assert result.errors[0].message == (
+        f"Long cannot represent non 64-bit integer value: {2**63}"
+    )
+
+
+def test_long_parse():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = graphql_sync(schema, "{ echo(id: 9007199254740993) }")
+    assert result.errors is None
+    assert result.data == {"echo": 9007199254740993}
+
+    result = graphql_sync(
+        schema,
+        "query ($id: Long!) { echo(id: $id) }",
+        variable_values={"id": "9007199254740993"},
+    )
+    assert result.data == {"echo": 9007199254740993}
+
+    for literal in ("1.5", '"abc"', "true", "9223372036854775808"):
+        result = graphql_sync(schema, f"{{ echo(id: {literal}) }}")
+        assert result.errors, literal
+
+    with pytest.raises(Exception, match="Long cannot represent non-integer value"):
+        GraphQLLong.serialize(True)
+    for text in ("--5", "²"):
+        with pytest.raises(GraphQLError, match="Long cannot represent non-integer"):
+            GraphQLLong.serialize(text)
@@ -0,0 +1,107 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Annotated, AsyncIterator, Iterator, List
+
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    MaxItems,
+    execute_async,
+    execute_sync,
+    graphql_type,
+    staticresolver,
+)
+
+
+def make_query(read: List[int]):
+    class Query:
+        @staticresolver
+        def numbers(data, info) -> Annotated[List[int], MaxItems(3)]:
+            return [1, 2, 3, 4]
+
+        @staticresolver
+        def generated(data, info) -> Annotated[Iterator[int], MaxItems(3)]:
+            for i in range(1_000_000):
+                read.append(i)
+                yield i
+
+        @staticresolver
+        def truncated(data, info) -> Annotated[Iterator[int], MaxItems(2, True)]:
+            yield from range(10)
+
+        @staticresolver
+        async def streamed(data, info) -> Annotated[AsyncIterator[int], MaxItems(2)]:
+            for i in range(10):
+                read.append(i)
+                yield i
+
+        @staticresolver
+        def uncapped(data, info) -> List[int]:
+            return list(range(5))
+
+    return Query
+
+
+def test_list_over_the_cap_is_an_error():
+    schema = GraphQLSchema(query=graphql_type(make_query([])))
+    result = execute_sync(schema, "{ numbers }")
+    assert result.data is None
+    assert result.errors[0].message == "List exceeds the maximum of 3 items."
+    assert result.errors[0].path == ["numbers"]
+
+
+def test_generator_is_not_read_past_the_cap():
+    read: List[int] = []
+    schema = GraphQLSchema(query=graphql_type(make_query(read)))
+    result = execute_sync(schema, "{ generated }")
+    assert result.errors[0].message == "List exceeds the maximum of 3 items."
+    assert read == [0, 1, 2, 3]
+
+
+def test_async_iterator_is_not_read_past_the_cap():
+    read: List[int] = []
+    schema = GraphQLSchema(query=graphql_type(make_query(read)))
+    result = asyncio.new_event_loop().run_until_complete(
+        execute_async(schema, "{ streamed }")
+    )
+    assert result.errors[0].message == "List exceeds the maximum of 2 items."
+    assert read == [0, 1, 2]
+
+
+def test_truncated_list():
+    schema = GraphQLSchema(query=graphql_type(make_query([])))
+    result = execute_sync(schema, "{ truncated }")
+    assert result.errors is None
+    assert result.data == {"truncated": [0, 1]}
+    assert result.extensions == {"truncated": [["truncated"]]}
+
+
+def test_schema_wide_default():
+    @dataclass
+    class Team:
+        members: List[str]
+
+    class Query:
+        @staticresolver
+        def teams(data, info) -> List[Team]:
+            return [Team(["a", "b", "c"]), Team(["d"])]
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query), extensions={"max_items": MaxItems(2, True)}
+    )
+    result = execute_sync(schema, "{ teams { members } }")
+    assert result.data == {"teams": [{"members": ["a", "b"]}, {"members": ["d"]}]}
+    assert result.extensions == {"truncated": [["teams", 0, "members"]]}
+
+    # Introspection is not capped
+    result = execute_sync(schema, "{ __schema { types { name } } }")
+    assert len(result.data["__schema"]["types"]) > 2
+
+
+def test_field_cap_overrides_the_default():
+    schema = GraphQLSchema(
+        query=graphql_type(make_query([])), extensions={"max_items": 100}
+    )
+    assert execute_sync(schema, "{ uncapped }").data == {"uncapped": [0, 1, 2, 3, 4]}
+    result = execute_sync(schema, "{ numbers }")
+    assert result.errors[0].message == "List exceeds the maximum of 3 items."
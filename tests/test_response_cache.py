@@ -0,0 +1,180 @@
+import time
+from typing import Annotated, List
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    CacheHint,
+    LRUCache,
+    ResponseCache,
+    execute_async,
+    execute_sync,
+    graphql_type,
+    staticresolver,
+)
+
+
+@pytest.fixture
+def schema(calls: List[str]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        def countries(
+            data, info, continent: str = ""
+        ) -> Annotated[List[str], CacheHint(max_age=60)]:
+            calls.append("countries")
+            return ["NZ", "AU"]
+
+        @staticresolver
+        def headline(data, info) -> Annotated[str, CacheHint(max_age=300)]:
+            calls.append("headline")
+            return "news"
+
+        @staticresolver
+        def me(data, info) -> Annotated[str, CacheHint(max_age=0)]:
+            calls.append("me")
+            return "user"
+
+    return GraphQLSchema(query=graphql_type(Query))
+
+
+def test_response_is_cached(schema, calls):
+    cache = ResponseCache()
+
+    result = execute_sync(schema, "{countries}", response_cache=cache)
+    assert result.data == {"countries": ["NZ", "AU"]}
+    result = execute_sync(schema, "{countries}", response_cache=cache)
+    assert result.data == {"countries": ["NZ", "AU"]}
+    assert result.errors is None
+    assert calls == ["countries"]
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_response_cache_key_is_normalised(schema, calls):
+    cache = ResponseCache()
+
+    execute_sync(schema, "{countries}", response_cache=cache)
+    execute_sync(schema, "query {\n  # comment\n  countries\n}\n", response_cache=cache)
+    assert calls == ["countries"]
+
+
+def test_response_cache_key_includes_variables(schema, calls):
+    cache = ResponseCache()
+    query = "query ($c: String!) {countries(continent: $c)}"
+
+    execute_sync(schema, query, variable_values={"c": "OC"}, response_cache=cache)
+    execute_sync(schema, query, variable_values={"c": "EU"}, response_cache=cache)
+    execute_sync(schema, query, variable_values={"c": "OC"}, response_cache=cache)
+    assert calls == ["countries", "countries"]
+
+
+def test_response_cache_is_partitioned(schema, calls):
+    cache = ResponseCache(partition_key=lambda context: context["tenant"])
+
+    execute_sync(
+        schema, "{countries}", context_value={"tenant": 1}, response_cache=cache
+    )
+    execute_sync(
+        schema, "{countries}", context_value={"tenant": 2}, response_cache=cache
+    )
+    execute_sync(
+        schema, "{countries}", context_value={"tenant": 1}, response_cache=cache
+    )
+    assert calls == ["countries", "countries"]
+
+
+def test_uncacheable_field_prevents_storing(schema, calls):
+    cache = ResponseCache()
+
+    execute_sync(schema, "{countries me}", response_cache=cache)
+    execute_sync(schema, "{countries me}", response_cache=cache)
+    assert calls == ["countries", "me", "countries", "me"]
+    assert len(cache.store) == 0
+
+
+def test_response_without_hints_is_not_stored():
+    class Query:
+        @staticresolver
+        def me(data, info) -> str:
+            return info.context["user"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    cache = ResponseCache()
+    for user in ("alice", "bob"):
+        result = execute_sync(
+            schema, "{me}", context_value={"user": user}, response_cache=cache
+        )
+        assert result.data == {"me": user}
+    assert len(cache.store) == 0
+
+
+def test_response_with_unhinted_fields_is_not_stored():
+    class Query:
+        @staticresolver
+        def countries(data, info) -> Annotated[List[str], CacheHint(max_age=60)]:
+            return ["NZ", "AU"]
+
+        @staticresolver
+        def me(data, info) -> str:
+            return info.context["user"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    cache = ResponseCache()
+    for user in ("alice", "bob"):
+        result = execute_sync(
+            schema,
+            "{countries me}",
+            context_value={"user": user},
+            response_cache=cache,
+        )
+        assert result.data == {"countries": ["NZ", "AU"], "me": user}
+    assert len(cache.store) == 0
+
+
+def test_cache_hint_shortens_ttl(schema):
+    store = LRUCache()
+    cache = ResponseCache(ttl=3600, store=store)
+
+    execute_sync(schema, "{headline}", response_cache=cache)
+    ((_, expires),) = store._data.values()
+    assert expires - time.monotonic() <= 300
+
+
+def test_errors_are_not_cached(calls):
+    class Query:
+        @staticresolver
+        def flaky(data, info) -> str:
+            calls.append(1)
+            raise Exception("boom")
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    cache = ResponseCache()
+    execute_sync(schema, "{flaky}", response_cache=cache)
+    result = execute_sync(schema, "{flaky}", response_cache=cache)
+    assert result.errors[0].message == "boom"
+    assert len(calls) == 2
+
+
+def test_response_cache_async(calls, run):
+    class Query:
+        @staticresolver
+        async def countries(data, info) -> Annotated[List[str], CacheHint(max_age=60)]:
+            calls.append("countries")
+            return ["NZ"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    cache = ResponseCache()
+    for _ in range(2):
+        result = run(execute_async(schema, "{countries}", response_cache=cache))
+        assert result.data == {"countries": ["NZ"]}
+    assert calls == ["countries"]
+
+
+def test_execute_sync_without_cache(schema):
+    result = execute_sync(schema, "{countries}")
+    assert result.data == {"countries": ["NZ", "AU"]}
+    assert result.errors is None
+
+    result = execute_sync(schema, "{nope}")
+    assert result.errors[0].message == "Cannot query field 'nope' on type 'Query'."
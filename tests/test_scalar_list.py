@@ -0,0 +1,95 @@
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from graphql import graphql_sync
+from graphql.type import GraphQLSchema
+
+from typed_graphql import Long
+from typed_graphql import TypedGraphqlMiddlewareManager
+from typed_graphql import execute_sync
+from typed_graphql import graphql_type
+from typed_graphql import staticresolver
+
+INTS = list(range(1000))
+STRINGS = [str(i) for i in range(1000)]
+
+
+class Query:
+    @staticresolver
+    def ints(data, info) -> List[int]:
+        return INTS
+
+    @staticresolver
+    def strings(data, info) -> List[str]:
+        return STRINGS
+
+    @staticresolver
+    def floats(data, info) -> List[float]:
+        return [1.5, 2, 3]
+
+    @staticresolver
+    def flags(data, info) -> Tuple[bool, bool]:
+        return (True, False)
+
+    @staticresolver
+    def longs(data, info) -> List[Long]:
+        return [Long(2**40)]
+
+    @staticresolver
+    def dates(data, info) -> List[date]:
+        return [date(2020, 1, 1)]
+
+    @staticresolver
+    def times(data, info) -> List[datetime]:
+        return [datetime(2020, 1, 1, tzinfo=timezone.utc), datetime(2020, 1, 1)]
+
+    @staticresolver
+    def nullable(data, info) -> List[Optional[int]]:
+        return [1, None, "x", 2**40]  # type: ignore
+
+    @staticresolver
+    def required(data, info) -> Optional[List[int]]:
+        return [1, None]  # type: ignore
+
+    @staticresolver
+    def nested(data, info) -> List[List[int]]:
+        return [[1], [2, 3]]
+
+
+def test_scalar_lists_are_marked():
+    query = graphql_type(Query)
+    assert query.fields["ints"].extensions["scalar_list"] is True
+    assert query.fields["dates"].extensions["scalar_list"] is True
+    assert "scalar_list" not in query.fields["nested"].extensions
+
+
+def test_scalar_list_returned_as_is():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    result = execute_sync(schema, "{ ints strings }")
+    assert result.errors is None
+    assert result.data["ints"] is INTS
+    assert result.data["strings"] is STRINGS
+
+
+def test_scalar_list_matches_graphql_core():
+    schema = GraphQLSchema(query=graphql_type(Query))
+    for query in (
+        "{ floats flags longs dates nested }",
+        "{ times }",
+        "{ nullable }",
+        "{ required }",
+        "{ ints nullable required }",
+    ):
+        result = execute_sync(schema, query)
+        expected = graphql_sync(
+            schema, query, middleware=TypedGraphqlMiddlewareManager()
+        )
+        assert result.data == expected.data, query
+        assert result.errors == expected.errors, query
+    assert execute_sync(schema, "{ floats }").data == {"floats": [1.5, 2.0, 3.0]}
+    errors = execute_sync(schema, "{ nullable }").errors
+    assert [error.path for error in errors] == [["nullable", 2], ["nullable", 3]]
@@ -0,0 +1,183 @@
+import asyncio
+from typing import Annotated, List
+
+import pytest
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    CacheHint,
+    SingleFlight,
+    execute_async,
+    graphql_type,
+    staticresolver,
+)
+
+
+@pytest.fixture
+def schema(calls: List[str]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        async def countries(
+            data, info, continent: str = ""
+        ) -> Annotated[List[str], CacheHint(max_age=60)]:
+            calls.append(continent)
+            await asyncio.sleep(0.1)
+            return ["NZ", "AU"]
+
+    class Mutation:
+        @staticresolver
+        async def touch(data, info) -> str:
+            calls.append("touch")
+            await asyncio.sleep(0.1)
+            return "ok"
+
+    return GraphQLSchema(query=graphql_type(Query), mutation=graphql_type(Mutation))
+
+
+def test_identical_queries_are_coalesced(schema, calls, run):
+    single_flight = SingleFlight()
+
+    results = run(
+        *(
+            execute_async(schema, "{countries}", single_flight=single_flight)
+            for _ in range(10)
+        )
+    )
+    assert calls == [""]
+    assert all(result.data == {"countries": ["NZ", "AU"]} for result in results)
+    assert single_flight.executions == 1
+    assert single_flight.coalesced == 9
+
+
+def test_different_variables_are_not_coalesced(schema, calls, run):
+    single_flight = SingleFlight()
+    query = "query ($c: String!) {countries(continent: $c)}"
+
+    run(
+        execute_async(
+            schema, query, variable_values={"c": "OC"}, single_flight=single_flight
+        ),
+        execute_async(
+            schema, query, variable_values={"c": "EU"}, single_flight=single_flight
+        ),
+        execute_async(
+            schema, query, variable_values={"c": "OC"}, single_flight=single_flight
+        ),
+    )
+    assert sorted(calls) == ["EU", "OC"]
+    assert single_flight.coalesced == 1
+
+
+def test_partitions_are_not_coalesced(schema, calls, run):
+    single_flight = SingleFlight(partition_key=lambda context: context["user"])
+
+    run(
+        *(
+            execute_async(
+                schema,
+                "{countries}",
+                context_value={"user": user},
+                single_flight=single_flight,
+            )
+            for user in (1, 2, 1, 2)
+        )
+    )
+    assert len(calls) == 2
+    assert single_flight.executions == 2
+
+
+def test_private_results_are_not_shared_without_partition(calls, run):
+    class Query:
+        @staticresolver
+        async def me(data, info) -> str:
+            calls.append(info.context["user"])
+            await asyncio.sleep(0.1)
+            return info.context["user"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    single_flight = SingleFlight()
+
+    results = run(
+        *(
+            execute_async(
+                schema,
+                "{me}",
+                context_value={"user": user},
+                single_flight=single_flight,
+            )
+            for user in ("alice", "bob")
+        )
+    )
+    assert [result.data for result in results] == [{"me": "alice"}, {"me": "bob"}]
+    assert calls == ["alice", "bob"]
+    assert single_flight.executions == 2
+    assert single_flight.coalesced == 0
+
+
+def test_results_with_unhinted_fields_are_not_shared_without_partition(run):
+    class Query:
+        @staticresolver
+        async def me(data, info) -> str:
+            await asyncio.sleep(0.1)
+            return info.context["user"]
+
+        @staticresolver
+        def countries(data, info) -> Annotated[List[str], CacheHint(max_age=60)]:
+            return ["NZ", "AU"]
+
+    schema = GraphQLSchema(query=graphql_type(Query))
+    single_flight = SingleFlight()
+
+    results = run(
+        *(
+            execute_async(
+                schema,
+                "{me countries}",
+                context_value={"user": user},
+                single_flight=single_flight,
+            )
+            for user in ("alice", "bob")
+        )
+    )
+    assert [result.data["me"] for result in results] == ["alice", "bob"]
+    assert single_flight.coalesced == 0
+
+
+def test_mutations_are_not_coalesced(schema, calls, run):
+    single_flight = SingleFlight()
+
+    run(
+        *(
+            execute_async(schema, "mutation {touch}", single_flight=single_flight)
+            for _ in range(3)
+        )
+    )
+    assert calls == ["touch"] * 3
+
+
+def test_sequential_queries_are_executed(schema, calls, run):
+    single_flight = SingleFlight()
+
+    run(execute_async(schema, "{countries}", single_flight=single_flight))
+    run(execute_async(schema, "{countries}", single_flight=single_flight))
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_others(schema, calls, run):
+    single_flight = SingleFlight()
+
+    async def main():
+        first = asyncio.ensure_future(
+            execute_async(schema, "{countries}", single_flight=single_flight)
+        )
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(
+            execute_async(schema, "{countries}", single_flight=single_flight)
+        )
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    result = run(main())
+    assert result.data == {"countries": ["NZ", "AU"]}
+    assert calls == [""]
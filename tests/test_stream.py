@@ -0,0 +1,151 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, List, Optional
+
+import pytest
+from graphql import ExecutionResult, specified_directives
+from graphql.type import GraphQLSchema
+
+from typed_graphql import (
+    GraphQLStreamDirective,
+    execute_incremental,
+    graphql_type,
+    staticresolver,
+)
+
+
+@dataclass
+class Country:
+    code: str
+
+    def resolve_name(self, info) -> str:
+        if self.code == "XX":
+            raise Exception("unknown country")
+        return self.code.lower()
+
+
+@pytest.fixture
+def produced() -> List[str]:
+    return []
+
+
+@pytest.fixture
+def closed() -> List[bool]:
+    return []
+
+
+@pytest.fixture
+def schema(produced: List[str], closed: List[bool]) -> GraphQLSchema:
+    class Query:
+        @staticresolver
+        async def letters(data, info) -> AsyncIterator[str]:
+            try:
+                for letter in "abcd":
+                    produced.append(letter)
+                    await asyncio.sleep(0)
+                    yield letter
+            finally:
+                closed.append(True)
+
+        @staticresolver
+        def numbers(data, info) -> Iterator[int]:
+            yield from range(3)
+
+        @staticresolver
+        def countries(data, info) -> List[Optional[Country]]:
+            return [Country("NZ"), Country("XX")]
+
+        @staticresolver
+        def hello(data, info) -> str:
+            return "world"
+
+    return GraphQLSchema(
+        query=graphql_type(Query),
+        directives=[*specified_directives, GraphQLStreamDirective],
+    )
+
+
+async def collect(query: str, schema: GraphQLSchema):
+    results = await execute_incremental(schema, query)
+    if isinstance(results, ExecutionResult):
+        return results
+    return [result.formatted async for result in results]
+
+
+def test_async_iterator_is_streamed(schema, run):
+    results = run(collect("{ letters @stream(initialCount: 2) }", schema))
+    assert results[0] == {"data": {"letters": ["a", "b"]}, "hasNext": True}
+    streamed = [
+        payload for result in results[1:] for payload in result.get("incremental", [])
+    ]
+    assert streamed == [
+        {"items": ["c"], "path": ["letters", 2]},
+        {"items": ["d"], "path": ["letters", 3]},
+    ]
+    assert results[-1]["hasNext"] is False
+
+
+def test_iterator_is_streamed_with_label(schema, run):
+    results = run(collect('{ hello numbers @stream(label: "n") }', schema))
+    assert results[0] == {"data": {"hello": "world", "numbers": []}, "hasNext": True}
+    streamed = [
+        payload for result in results[1:] for payload in result.get("incremental", [])
+    ]
+    assert [payload["items"] for payload in streamed] == [[0], [1], [2]]
+    assert {payload["label"] for payload in streamed} == {"n"}
+
+
+def test_initial_result_does_not_wait_for_the_rest(schema, produced, closed, run):
+    async def first_result():
+        results = await execute_incremental(
+            schema, "{ letters @stream(initialCount: 1) }"
+        )
+        first = await results.__anext__()
+        produced_then = len(produced)
+        await results.aclose()
+        return first, produced_then
+
+    first, produced_then = run(first_result())
+    assert first.data == {"letters": ["a"]}
+    assert first.has_next
+    assert produced_then < 4
+    assert closed == [True]
+
+
+def test_item_errors_are_delivered_with_the_item(schema, run):
+    results = run(collect("{ countries @stream { name } }", schema))
+    streamed = [
+        payload for result in results[1:] for payload in result.get("incremental", [])
+    ]
+    assert streamed[0] == {"items": [{"name": "nz"}], "path": ["countries", 0]}
+    assert streamed[1]["items"] == [None]
+    assert streamed[1]["errors"][0]["message"] == "unknown country"
+    assert streamed[1]["errors"][0]["path"] == ["countries", 1, "name"]
+
+
+def test_iterator_within_initial_count_is_a_result(schema, run):
+    result = run(collect("{ numbers @stream(initialCount: 3) }", schema))
+    assert isinstance(result, ExecutionResult)
+    assert result.data == {"numbers": [0, 1, 2]}
+
+    results = run(collect("{ numbers @stream(initialCount: 2) }", schema))
+    assert results[0] == {"data": {"numbers": [0, 1]}, "hasNext": True}
+    assert results[1]["incremental"] == [{"items": [2], "path": ["numbers", 2]}]
+
+
+def test_without_stream_a_result_is_returned(schema, run):
+    result = run(collect("{ letters numbers }", schema))
+    assert result.data == {"letters": list("abcd"), "numbers": [0, 1, 2]}
+
+    result = run(collect("{ letters @stream(if: false) }", schema))
+    assert result.data == {"letters": list("abcd")}
+
+
+def test_negative_initial_count(schema, run):
+    result = run(collect("{ letters @stream(initialCount: -1) }", schema))
+    assert result.errors[0].message == "initialCount must be a positive integer"
+
+
+def test_null_initial_count(schema, run):
+    result = run(collect("{ letters @stream(initialCount: null) }", schema))
+    assert result.errors[0].message == "Expected value of type 'Int!', found null."
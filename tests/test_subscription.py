@@ -0,0 +1,164 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+from graphql.type import GraphQLSchema
+
+from typed_graphql import graphql_type, staticresolver, subscribe_async
+
+
+@dataclass
+class Message:
+    text: str
+    author: str
+
+
+class Query:
+    @staticresolver
+    def hello(data, info) -> str:
+        return "world"
+
+
+async def collect(results, limit=None) -> List:
+    collected = []
+    async for result in results:
+        collected.append(result)
+        if limit is not None and len(collected) == limit:
+            break
+    await results.aclose()
+    return collected
+
+
+def test_subscription_field_types():
+    class Subscription:
+        @staticresolver
+        async def messages(data, info, room: str) -> AsyncIterator[Message]:
+            yield Message("hi", "ann")
+
+    subscription = graphql_type(Subscription, subscription=True)
+    assert str(subscription.fields["messages"].type) == "Message!"
+    assert list(subscription.fields["messages"].args) == ["room"]
+
+
+def test_subscribe(run):
+    class Subscription:
+        @staticresolver
+        async def messages(data, info, room_name: str) -> AsyncIterator[Message]:
+            for text in ["hi", "bye"]:
+                yield Message(f"{room_name}: {text}", "ann")
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+    async def subscribe():
+        results = await subscribe_async(
+            schema, 'subscription { messages(roomName: "a") { text } }'
+        )
+        return await collect(results)
+
+    results = run(subscribe())
+    assert [result.data for result in results] == [
+        {"messages": {"text": "a: hi"}},
+        {"messages": {"text": "a: bye"}},
+    ]
+    assert all(result.errors is None for result in results)
+
+
+def test_subscribe_errors(run):
+    class Subscription:
+        @staticresolver
+        async def count(data, info) -> AsyncIterator[int]:
+            yield 1
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+    result = run(subscribe_async(schema, "subscription { nope }"))
+    assert result.errors[0].message == (
+        "Cannot query field 'nope' on type 'Subscription'."
+    )
+
+
+def test_slow_subscriber_applies_backpressure(run):
+    produced = []
+
+    class Subscription:
+        @staticresolver
+        async def count(data, info) -> AsyncIterator[int]:
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+    async def subscribe():
+        results = await subscribe_async(
+            schema, "subscription { count }", max_queue_size=5
+        )
+        first = await results.__anext__()
+        await asyncio.sleep(0.05)
+        await results.aclose()
+        return first
+
+    assert run(subscribe()).data == {"count": 0}
+    # The queue holds five events, with one more waiting to be put
+    assert len(produced) <= 7
+
+
+def test_source_is_closed_when_subscriber_goes_away(run):
+    closed = []
+
+    class Subscription:
+        @staticresolver
+        async def ticks(data, info) -> AsyncIterator[int]:
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+                    await asyncio.sleep(0)
+            finally:
+                closed.append(True)
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+    async def subscribe():
+        results = await subscribe_async(schema, "subscription { ticks }")
+        return await collect(results, limit=3)
+
+    results = run(subscribe())
+    assert [result.data["ticks"] for result in results] == [0, 1, 2]
+    assert closed == [True]
+
+
+def test_source_errors_are_raised(run):
+    class Subscription:
+        @staticresolver
+        async def count(data, info) -> AsyncIterator[int]:
+            yield 1
+            raise ValueError("upstream closed")
+
+    schema = GraphQLSchema(
+        query=graphql_type(Query),
+        subscription=graphql_type(Subscription, subscription=True),
+    )
+
+    async def subscribe():
+        results = await subscribe_async(schema, "subscription { count }")
+        received = []
+        try:
+            async for result in results:
+                received.append(result.data)
+        except ValueError as error:
+            return received, str(error)
+
+    assert run(subscribe()) == ([{"count": 1}], "upstream closed")
@@ -1,3 +1,16 @@
+from .cache import (
+    CacheBackend,
+    CacheHint,
+    Cached,
+    LRUCache,
+    ResponseCache,
+    SQLiteCache,
+    SingleFlight,
+    add_invalidation_listener,
+    cache_control_header,
+    invalidate,
+    remove_invalidation_listener,
+)
 from .core import (
     GraphQLTypeConversionContext,
     ReturnTypeMissing,
@@ -9,16 +22,90 @@ from .core import (
     resolverclass,
     staticresolver,
 )
-from .execute import execute_async
+from .columnar import GraphQLColumnarDirective, columnar_rows
+from .connection import Connection, Keyset
+from .diff import PatchResult, apply_json_patch, json_patch
+from .execute import (
+    execute_async,
+    execute_incremental,
+    execute_json,
+    execute_sync,
+    export_async,
+    live_query,
+    subscribe_async,
+)
+from .export import ExportResult
+from .incremental import (
+    GraphQLDeferDirective,
+    GraphQLStreamDirective,
+    IncrementalResult,
+    multipart_mixed,
+)
+from .limits import MaxItems
+from .scalars import (
+    DECIMAL_FORMATS,
+    TIMEZONE_POLICIES,
+    BigInt,
+    GraphQLBase64,
+    GraphQLBigInt,
+    GraphQLDecimal,
+    GraphQLDecimalNumber,
+    GraphQLLong,
+    Long,
+    datetime_scalar,
+)
+from .subscription import FanOut, SlowSubscriber
 
 __all__ = [
+    "BigInt",
+    "CacheBackend",
+    "CacheHint",
+    "Cached",
+    "Connection",
+    "DECIMAL_FORMATS",
+    "ExportResult",
+    "FanOut",
+    "GraphQLBase64",
+    "GraphQLBigInt",
+    "GraphQLColumnarDirective",
+    "GraphQLDecimal",
+    "GraphQLDecimalNumber",
+    "GraphQLDeferDirective",
+    "GraphQLLong",
+    "GraphQLStreamDirective",
     "GraphQLTypeConversionContext" "ReturnTypeMissing",
+    "IncrementalResult",
+    "Keyset",
+    "LRUCache",
+    "Long",
+    "MaxItems",
+    "PatchResult",
+    "ResponseCache",
+    "SQLiteCache",
+    "SingleFlight",
+    "SlowSubscriber",
+    "TIMEZONE_POLICIES",
     "TypeUnrepresentableAsGraphql",
     "TypedGraphqlMiddlewareManager",
+    "add_invalidation_listener",
+    "apply_json_patch",
+    "cache_control_header",
+    "columnar_rows",
+    "datetime_scalar",
     "execute_async",
+    "execute_incremental",
+    "execute_json",
+    "execute_sync",
+    "export_async",
     "graphql_input_type",
     "graphql_type",
+    "invalidate",
+    "json_patch",
+    "live_query",
+    "multipart_mixed",
+    "remove_invalidation_listener",
     "resolver",
     "resolverclass",
     "staticresolver",
+    "subscribe_async",
 ]
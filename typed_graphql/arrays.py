@@ -0,0 +1,56 @@
+import array
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import get_args
+from typing import get_origin
+
+from graphql.type import GraphQLBoolean
+from graphql.type import GraphQLFloat
+from graphql.type import GraphQLInt
+from graphql.type import GraphQLScalarType
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None  # type: ignore
+
+
+def _is_ndarray_type(t: Any) -> bool:
+    if numpy is None:
+        return False
+    return t is numpy.ndarray or get_origin(t) is numpy.ndarray
+
+
+def is_array_type(t: Any) -> bool:
+    """Is it array.array, numpy.ndarray or numpy.typing.NDArray[...]?"""
+    return t is array.array or _is_ndarray_type(t)
+
+
+def array_item_type(t: Any) -> GraphQLScalarType:
+    """
+    The scalar of the items of an array type
+
+    Float, unless the dtype of an NDArray[...] is an integer or bool type.
+    """
+    if _is_ndarray_type(t):
+        args = get_args(t)
+        dtype_args = get_args(args[1]) if len(args) == 2 else ()
+        scalar_type: Optional[type] = dtype_args[0] if dtype_args else None
+        if isinstance(scalar_type, type):
+            if issubclass(scalar_type, numpy.bool_):
+                return GraphQLBoolean
+            if issubclass(scalar_type, numpy.integer):
+                return GraphQLInt
+    return GraphQLFloat
+
+
+def is_array(value: Any) -> bool:
+    return isinstance(value, array.array) or (
+        numpy is not None and isinstance(value, numpy.ndarray)
+    )
+
+
+def array_to_list(value: Any) -> List[Any]:
+    """The items of an array as python ints, floats or bools, converted in C"""
+    return value.tolist()
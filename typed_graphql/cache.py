@@ -0,0 +1,816 @@
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Protocol
+from typing import Set
+from typing import Tuple
+from typing import cast
+
+from graphql.execution import ExecutionResult
+from graphql.language import DocumentNode
+from graphql.language import print_ast
+from graphql.pyutils import Undefined
+from graphql.pyutils import camel_to_snake
+from graphql.pyutils import is_awaitable
+from graphql.type import GraphQLObjectType
+from graphql.type import GraphQLOutputType
+from graphql.type import get_named_type
+from graphql.type import is_object_type
+
+from typed_graphql.encode import json_default
+
+LOCK_STRIPES = 64
+"""Number of locks that concurrent misses on different keys are spread over"""
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __repr__(self):
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses},"
+            f" coalesced={self.coalesced})"
+        )
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by Cached fields and ResponseCache
+
+    Keys are strings. get returns Undefined for missing or expired keys.
+    Entries can be tagged (see invalidate) and dropped by tag with delete_tags.
+    """
+
+    def get(self, key: str) -> Any: ...
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry with any of the tags, returning how many were dropped"""
+        ...
+
+    def clear(self) -> None: ...
+
+
+MetricsHook = Callable[[str, str], None]
+"""Called with an event ("hit", "miss", "set" or "evict") and the key"""
+
+
+def pickled_size(value: Any) -> int:
+    """
+    Size of a value including everything it references, as the length of its
+    pickle
+
+    Falls back to the shallow sys.getsizeof for values that can't be pickled.
+    """
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe in-memory store
+
+    Evicts the least recently used entries once more than maxsize entries, or
+    more than maxbytes bytes as measured by sizeof, are held. Sizes are only
+    measured when there is a maxbytes, and are the length of a value's pickle
+    unless another sizeof is given.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        maxbytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = pickled_size,
+        metrics: Optional[MetricsHook] = None,
+    ):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.metrics = metrics
+        self.bytes = 0
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """Returns Undefined if the key is missing or has expired"""
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                value = Undefined
+            else:
+                if expires is not None and expires <= time.monotonic():
+                    self._remove(key)
+                    value = Undefined
+                else:
+                    self._data.move_to_end(key)
+        if self.metrics is not None:
+            self.metrics("miss" if value is Undefined else "hit", key)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        expires = None if ttl is None else time.monotonic() + ttl
+        size = 0 if self.maxbytes is None else self.sizeof(value)
+        evicted = []
+        with self._lock:
+            self._remove(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                # Would evict everything else and still not fit
+                return
+            self._data[key] = (value, expires)
+            self._sizes[key] = size
+            self.bytes += size
+            if tags:
+                self._key_tags[key] = tuple(tags)
+                for tag in self._key_tags[key]:
+                    self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self.bytes > self.maxbytes
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                evicted.append(oldest)
+        if self.metrics is not None:
+            self.metrics("set", key)
+            for evicted_key in evicted:
+                self.metrics("evict", evicted_key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        if self._data.pop(key, None) is None:
+            return
+        self.bytes -= self._sizes.pop(key)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+
+class SQLiteCache:
+    """
+    A bounded store kept in an SQLite database file
+
+    Several processes on one host can share a cache by using the same path.
+    Values are pickled. Once more than maxsize entries are held the oldest
+    entries are evicted.
+    """
+
+    TRIM_INTERVAL = 64
+    """Number of sets between checks of the number of entries"""
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 100_000,
+        timeout: float = 5.0,
+        metrics: Optional[MetricsHook] = None,
+    ):
+        self.path = path
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.metrics = metrics
+        self._local = threading.local()
+        self._sets = 0
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value BLOB, expires REAL, stored REAL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cache_stored ON cache (stored)")
+        connection.execute("CREATE TABLE IF NOT EXISTS cache_tags (tag TEXT, key TEXT)")
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_tags_tag ON cache_tags (tag)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections can't be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            self._local.connection = connection
+        return connection
+
+    def __len__(self) -> int:
+        now = time.time()
+        (count,) = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM cache WHERE expires IS NULL OR expires > ?",
+                (now,),
+            )
+            .fetchone()
+        )
+        return count
+
+    def get(self, key: str) -> Any:
+        """Returns Undefined if the key is missing or has expired"""
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        value = Undefined
+        if row is not None:
+            if row[1] is not None and row[1] <= now:
+                connection.execute(
+                    "DELETE FROM cache WHERE key = ? AND expires <= ?", (key, now)
+                )
+            else:
+                value = pickle.loads(row[0])
+        if self.metrics is not None:
+            self.metrics("miss" if value is Undefined else "hit", key)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        now = time.time()
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, stored)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                    None if ttl is None else now + ttl,
+                    now,
+                ),
+            )
+            connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            connection.executemany(
+                "INSERT INTO cache_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+        if self.metrics is not None:
+            self.metrics("set", key)
+        self._sets += 1
+        if self._sets % self.TRIM_INTERVAL == 0:
+            self.trim()
+
+    def trim(self) -> None:
+        """Remove expired entries, then the oldest entries beyond maxsize"""
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+            evicted = connection.execute(
+                "SELECT key FROM cache ORDER BY stored LIMIT ?",
+                (max(0, count - self.maxsize),),
+            ).fetchall()
+            connection.executemany("DELETE FROM cache WHERE key = ?", evicted)
+            connection.execute(
+                "DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache)"
+            )
+        if self.metrics is not None:
+            for (evicted_key,) in evicted:
+                self.metrics("evict", evicted_key)
+
+    def delete(self, key: str) -> None:
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        connection = self._connection()
+        tags = list(tags)
+        placeholders = ", ".join("?" * len(tags))
+        with _transaction(connection):
+            keys = connection.execute(
+                f"SELECT DISTINCT key FROM cache_tags WHERE tag IN ({placeholders})",
+                tags,
+            ).fetchall()
+            connection.executemany("DELETE FROM cache WHERE key = ?", keys)
+            connection.executemany("DELETE FROM cache_tags WHERE key = ?", keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        connection = self._connection()
+        with _transaction(connection):
+            connection.execute("DELETE FROM cache")
+            connection.execute("DELETE FROM cache_tags")
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection):
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+_tagged_stores: "weakref.WeakSet[CacheBackend]" = weakref.WeakSet()
+"""Stores that Cached fields and ResponseCaches keep tagged entries in"""
+
+
+InvalidationListener = Callable[[str], None]
+"""Called with the tag, "Type" or "Type:id", of each invalidation"""
+
+_invalidation_listeners: List[InvalidationListener] = []
+
+
+def add_invalidation_listener(listener: InvalidationListener) -> None:
+    """Call listener on every invalidation, ie. to rerun live queries"""
+    _invalidation_listeners.append(listener)
+
+
+def remove_invalidation_listener(listener: InvalidationListener) -> None:
+    try:
+        _invalidation_listeners.remove(listener)
+    except ValueError:
+        pass
+
+
+def invalidate(type: str, id: Any = None) -> int:
+    """
+    Drop cached field results and responses that touched the GraphQL type, or
+    only those that touched the entity of that type with the given id
+
+    Entities are identified by the "id" field of their class. Returns the number
+    of entries dropped. Invalidation listeners are told about it afterwards.
+    """
+    tag = type if id is None else f"{type}:{id}"
+    dropped = sum(store.delete_tags([tag]) for store in list(_tagged_stores))
+    for listener in list(_invalidation_listeners):
+        listener(tag)
+    return dropped
+
+
+def entity_tag(object_type: GraphQLObjectType, value: Any) -> Optional[str]:
+    id_field = object_type.extensions.get("id_field")
+    if id_field is None or value is None:
+        return None
+    if isinstance(value, dict):
+        entity_id = value.get(id_field)
+    else:
+        entity_id = getattr(value, id_field, None)
+    if entity_id is None:
+        return None
+    return f"{object_type.name}:{entity_id}"
+
+
+def value_tags(graphql_type: GraphQLOutputType, value: Any) -> List[str]:
+    """
+    Tags of the objects in a resolved value, and of the objects held in their
+    fields
+
+    Only fields kept on the objects are followed, fields computed by resolvers
+    are resolved again on each request.
+    """
+    tags: Dict[str, None] = {}
+    _collect_tags(graphql_type, value, tags, set())
+    return list(tags)
+
+
+def _collect_tags(
+    graphql_type: GraphQLOutputType,
+    value: Any,
+    tags: Dict[str, None],
+    seen: Set[int],
+) -> None:
+    object_type = get_named_type(graphql_type)
+    if not is_object_type(object_type):
+        return
+    object_type = cast(GraphQLObjectType, object_type)
+    tags[object_type.name] = None
+    for item in value if isinstance(value, (list, tuple)) else [value]:
+        if isinstance(item, (list, tuple)):
+            _collect_tags(object_type, item, tags, seen)
+            continue
+        if item is None or id(item) in seen:
+            continue
+        seen.add(id(item))
+        tag = entity_tag(object_type, item)
+        if tag is not None:
+            tags[tag] = None
+        for field_name, field in object_type.fields.items():
+            if not is_object_type(get_named_type(field.type)):
+                continue
+            name = camel_to_snake(field_name)
+            if isinstance(item, dict):
+                child = item.get(name)
+            else:
+                child = getattr(item, name, None)
+            if child is None or callable(child) or isinstance(child, Iterator):
+                continue
+            _collect_tags(field.type, child, tags, seen)
+
+
+DEFAULT_FIELD_CACHE = LRUCache()
+"""Store used by Cached fields that don't specify their own"""
+
+
+class Cached:
+    """
+    Caches a resolver's result across requests
+
+    Use on a resolver's return type: Annotated[List[Country], Cached(ttl=60)]
+
+    ttl: seconds a result stays fresh
+    key: callable taking (data, info, **args) that returns what distinguishes one
+        result from another. Defaults to the field arguments, so pass a key for
+        fields whose result depends on the parent object
+    store: where results are kept, defaults to DEFAULT_FIELD_CACHE
+
+    Concurrent misses for the same key run the resolver once. Hits, misses and
+    coalesced misses are counted in stats. Results are tagged with the types and
+    entities they contain, and that of the parent object, for invalidate.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        key: Optional[Callable[..., Any]] = None,
+        store: Optional[CacheBackend] = None,
+    ):
+        self.ttl = ttl
+        self.key = key
+        self.store = store if store is not None else DEFAULT_FIELD_CACHE
+        _tagged_stores.add(self.store)
+        self.stats = CacheStats()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def __repr__(self):
+        return f"Cached(ttl={self.ttl!r})"
+
+    def make_key(self, data: Any, info: Any, args: Dict[str, Any]) -> str:
+        part = args if self.key is None else self.key(data, info, **args)
+        return (
+            f"{info.parent_type.name}.{info.field_name}:"
+            f"{json.dumps(part, sort_keys=True, default=repr)}"
+        )
+
+    def get_or_resolve(
+        self,
+        key: str,
+        resolve: Callable[[], Any],
+        tags: Callable[[Any], Iterable[str]] = lambda value: (),
+    ) -> Any:
+        value = self.store.get(key)
+        if value is not Undefined:
+            self.stats.hits += 1
+            return value
+
+        with self._locks[hash(key) % LOCK_STRIPES]:
+            pending = self._pending.get(key)
+            if pending is not None and pending.get_loop() is _running_loop():
+                self.stats.coalesced += 1
+                return _wait_for(pending)
+
+            # Another thread may have stored the value while we waited for the lock
+            value = self.store.get(key)
+            if value is not Undefined:
+                self.stats.hits += 1
+                return value
+
+            self.stats.misses += 1
+            result = resolve()
+            if is_awaitable(result) or isinstance(result, AsyncIterable):
+                # A task of its own, so waiters get the result even when the
+                # caller that started it is cancelled
+                task = asyncio.ensure_future(self._resolve_async(key, result, tags))
+                self._pending[key] = task
+                task.add_done_callback(lambda _: self._resolved(key, task))
+                return _wait_for(task)
+
+            value = materialize(result)
+            self.store.set(key, value, self.ttl, tags(value))
+            return value
+
+    async def _resolve_async(
+        self,
+        key: str,
+        result: Any,
+        tags: Callable[[Any], Iterable[str]],
+    ):
+        if is_awaitable(result):
+            result = await result
+        if isinstance(result, AsyncIterable):
+            value = [item async for item in result]
+        else:
+            value = materialize(result)
+        self.store.set(key, value, self.ttl, tags(value))
+        return value
+
+    def _resolved(self, key: str, task: asyncio.Future) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            # Mark as retrieved, there might not be any waiters left
+            task.exception()
+
+
+def materialize(value: Any) -> Any:
+    """Iterators can only be consumed once, so turn them into lists"""
+    if isinstance(value, Iterator):
+        return list(value)
+    return value
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _wait_for(future: asyncio.Future) -> Any:
+    return await asyncio.shield(future)
+
+
+def cache_resolver(resolver: Callable[..., Any], policy: Cached) -> Callable[..., Any]:
+    """Wraps a resolver so its results are cached according to the policy"""
+
+    @wraps(resolver)
+    def cached_resolver(data, info, **args):
+        def tags(value):
+            parent_tag = entity_tag(info.parent_type, data)
+            tags = value_tags(info.return_type, value)
+            return tags if parent_tag is None else [parent_tag, *tags]
+
+        key = policy.make_key(data, info, args)
+        return policy.get_or_resolve(key, lambda: resolver(data, info, **args), tags)
+
+    cached_resolver.__is_wrapped_resolver = True  # type: ignore
+    return cached_resolver
+
+
+class CacheHint:
+    """
+    Declares how long a value may be cached for, and by whom
+
+    Use on a field's type: Annotated[str, CacheHint(max_age=300)]
+    Or decorate a class to apply the hint to every field returning it:
+    @CacheHint(max_age=300, scope="public")
+
+    max_age: seconds, 0 makes any response containing the field uncacheable
+    scope: "public", or "private" when the value is specific to a user
+
+    As in Apollo, an unhinted root field, or unhinted field returning an
+    object, counts as max_age=0; other unhinted fields follow their parent.
+    """
+
+    def __init__(self, max_age: Optional[int] = None, scope: str = "public"):
+        if scope not in ("public", "private"):
+            raise ValueError(f"Unknown cache scope: {scope}")
+        self.max_age = max_age
+        self.scope = scope
+
+    def __repr__(self):
+        return f"CacheHint(max_age={self.max_age!r}, scope={self.scope!r})"
+
+    def __call__(self, cls):
+        cls._cache_hint = self
+        return cls
+
+    def restrict(self, other: "CacheHint") -> "CacheHint":
+        """The policy that satisfies both hints"""
+        if self.max_age is None:
+            max_age = other.max_age
+        elif other.max_age is None:
+            max_age = self.max_age
+        else:
+            max_age = min(self.max_age, other.max_age)
+        scope = "private" if "private" in (self.scope, other.scope) else "public"
+        return CacheHint(max_age, scope)
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        return {"maxAge": self.max_age, "scope": self.scope.upper()}
+
+
+def cache_control_header(result: ExecutionResult) -> Optional[str]:
+    """
+    Cache-Control header value for the policy in a result's extensions
+
+    Returns None when none of the resolved fields had a cache hint.
+    """
+    policy = (result.extensions or {}).get("cacheControl")
+    if policy is None:
+        return None
+    if result.errors or policy["maxAge"] == 0:
+        return "no-store"
+    scope = policy["scope"].lower()
+    if policy["maxAge"] is None:
+        return scope
+    return f"max-age={policy['maxAge']}, {scope}"
+
+
+def request_key(
+    document: DocumentNode, variable_values: Optional[Dict[str, Any]], partition: Any
+) -> str:
+    """
+    Hash of the normalised document, canonical variables and partition
+
+    Requests with the same key produce the same response.
+    """
+    key = json.dumps(
+        [print_ast(document), variable_values or {}, partition],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Caches whole serialised responses of queries
+
+    ttl: seconds a response stays fresh. Responses are kept for no longer than the
+        smallest CacheHint max_age of the fields that were resolved, and private
+        responses are only kept when there is a partition_key. Responses without
+        any CacheHint are not kept, as nothing says who they may be shared with
+    store: where responses are kept, defaults to a new LRUCache
+    partition_key: callable taking the context value and returning which
+        partition (ie. anonymous or a user id) a response may be shared within
+
+    Responses with errors are never stored. Responses are tagged with the types
+    and entities they contain for invalidate.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        store: Optional[CacheBackend] = None,
+        partition_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.ttl = ttl
+        self.store = store if store is not None else LRUCache()
+        _tagged_stores.add(self.store)
+        self.partition_key = partition_key
+        self.stats = CacheStats()
+
+    def make_key(
+        self,
+        document: DocumentNode,
+        variable_values: Optional[Dict[str, Any]],
+        context_value: Any,
+    ) -> str:
+        partition = (
+            None if self.partition_key is None else self.partition_key(context_value)
+        )
+        return f"response:{request_key(document, variable_values, partition)}"
+
+    def get(self, key: str) -> Optional[ExecutionResult]:
+        payload = self.store.get(key)
+        if payload is Undefined:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return ExecutionResult(**json.loads(payload))
+
+    def set(self, key: str, result: ExecutionResult, tags: Iterable[str] = ()) -> None:
+        """Store the result, as its cacheControl extension allows"""
+        policy = (result.extensions or {}).get("cacheControl")
+        if result.errors or policy is None:
+            return
+        if policy["scope"] == "PRIVATE" and self.partition_key is None:
+            return
+        max_age = policy["maxAge"]
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if ttl <= 0:
+            return
+        self.store.set(
+            key, json.dumps(result.formatted, default=json_default), ttl, tags
+        )
+
+
+class SingleFlight:
+    """
+    Executes identical concurrent queries once, sharing the result
+
+    partition_key: callable taking the context value and returning which
+        partition (ie. anonymous or a user id) a result may be shared within
+
+    Without a partition_key only results with a public cacheControl policy and
+    a maxAge other than 0 are shared, the callers waiting on any other result
+    execute the query themselves. executions counts queries that were executed, coalesced those
+    that got the result of an identical query instead.
+    """
+
+    def __init__(self, partition_key: Optional[Callable[[Any], Any]] = None):
+        self.partition_key = partition_key
+        self.executions = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def make_key(
+        self,
+        document: DocumentNode,
+        variable_values: Optional[Dict[str, Any]],
+        context_value: Any,
+    ) -> str:
+        partition = (
+            None if self.partition_key is None else self.partition_key(context_value)
+        )
+        return request_key(document, variable_values, partition)
+
+    async def run(
+        self, key: str, execute: Callable[[], Awaitable[ExecutionResult]]
+    ) -> ExecutionResult:
+        task = self._inflight.get(key)
+        leader = task is None
+        if task is None:
+            self.executions += 1
+            # A task of its own, so the execution outlives a cancelled caller
+            task = asyncio.ensure_future(execute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        result = await asyncio.shield(task)
+        if not leader:
+            if not self.is_shared(result):
+                self.executions += 1
+                return await execute()
+            self.coalesced += 1
+        # Callers get their own result, though the data is shared
+        return ExecutionResult(result.data, result.errors, result.extensions)
+
+    def is_shared(self, result: ExecutionResult) -> bool:
+        """May the result go to the other callers of its partition?"""
+        if self.partition_key is not None:
+            return True
+        policy = (result.extensions or {}).get("cacheControl")
+        return (
+            policy is not None and policy["scope"] == "PUBLIC" and policy["maxAge"] != 0
+        )
@@ -0,0 +1,40 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from graphql import DirectiveLocation
+from graphql import GraphQLArgument
+from graphql import GraphQLBoolean
+from graphql import GraphQLDirective
+from graphql import GraphQLNonNull
+
+GraphQLColumnarDirective = GraphQLDirective(
+    name="columnar",
+    locations=[DirectiveLocation.FIELD],
+    args={
+        "if": GraphQLArgument(
+            GraphQLNonNull(GraphQLBoolean),
+            default_value=True,
+            description="Columnar when true or undefined.",
+        ),
+    },
+    description=(
+        "Returns a list of objects as an object of columns, one list of values"
+        " per selected field."
+    ),
+)
+
+
+def columnar_rows(
+    columns: Optional[Dict[str, List[Any]]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    The rows of a @columnar list, ie. for clients that want objects back
+
+    A null object of a nullable list comes back as a row of nulls.
+    """
+    if columns is None:
+        return None
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
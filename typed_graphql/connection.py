@@ -0,0 +1,369 @@
+import base64
+import binascii
+import enum
+import json
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from functools import wraps
+from itertools import islice
+from operator import getitem
+from typing import Annotated
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import get_args
+from typing import get_origin
+from typing import get_type_hints
+
+from graphql import GraphQLError
+from graphql.pyutils import is_awaitable
+from graphql.type import GraphQLArgument
+from graphql.type import GraphQLBoolean
+from graphql.type import GraphQLField
+from graphql.type import GraphQLInt
+from graphql.type import GraphQLList
+from graphql.type import GraphQLNonNull
+from graphql.type import GraphQLObjectType
+from graphql.type import GraphQLOutputType
+from graphql.type import GraphQLString
+from graphql.type import get_named_type
+from typing_inspect import is_optional_type
+
+T = TypeVar("T")
+
+CURSOR_PREFIX = "connection:"
+KEYSET_CURSOR_PREFIX = "keyset:"
+
+
+class Connection(Generic[T]):
+    """
+    A Relay connection of T
+
+    A resolver annotated to return Connection[T] returns any iterable of T, ie.
+    a generator. The field gets first and after arguments and only the
+    requested slice of the iterable is read. If the resolver takes first or
+    after itself they are passed to it instead, and the iterable it returns
+    is expected to start after the after cursor. after is passed as the
+    offset of the cursor's node, or None for the first page.
+    """
+
+
+def connection_node_type(t: Any) -> Any:
+    """The T of Connection[T] or Optional[Connection[T]], otherwise None"""
+    if get_origin(t) is Annotated:
+        t = get_args(t)[0]
+    if is_optional_type(t):
+        t = next((arg for arg in get_args(t) if arg is not type(None)), None)
+    if get_origin(t) is Connection:
+        return get_args(t)[0]
+    return None
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.b64encode(f"{CURSOR_PREFIX}{offset}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        decoded = base64.b64decode(cursor.encode(), validate=True).decode()
+        if decoded.startswith(CURSOR_PREFIX):
+            offset = int(decoded[len(CURSOR_PREFIX) :])
+            if offset >= 0:
+                return offset
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise GraphQLError(f"Invalid cursor '{cursor}'")
+
+
+class Edge:
+    def __init__(self, node: Any, cursor: str):
+        self.node = node
+        self.cursor = cursor
+
+
+class ConnectionSlice:
+    """
+    The requested slice of a connection's nodes
+
+    Nodes are read from the iterator when the edges or page info are resolved,
+    and only the ones in the slice. Whether there is a next page is only
+    checked if it is queried, by reading one more node.
+
+    cursor: callable taking a node and its offset and returning its cursor
+    """
+
+    def __init__(
+        self,
+        nodes: Iterator[Any],
+        first: Optional[int],
+        offset: int,
+        cursor: Callable[[Any, int], str] = lambda node, offset: encode_cursor(offset),
+        has_previous_page: Optional[bool] = None,
+    ):
+        self.nodes = nodes
+        self.first = first
+        self.offset = offset
+        self.cursor = cursor
+        self._has_previous_page = has_previous_page
+        self._edges: Optional[List[Edge]] = None
+        self._has_next_page: Optional[bool] = None
+
+    @property
+    def edges(self) -> List[Edge]:
+        if self._edges is None:
+            self._edges = [
+                Edge(node, self.cursor(node, self.offset + index))
+                for index, node in enumerate(islice(self.nodes, self.first))
+            ]
+        return self._edges
+
+    @property
+    def page_info(self) -> "ConnectionSlice":
+        return self
+
+    @property
+    def has_previous_page(self) -> bool:
+        if self._has_previous_page is not None:
+            return self._has_previous_page
+        return self.offset > 0
+
+    @property
+    def has_next_page(self) -> bool:
+        if self._has_next_page is None:
+            edges = self.edges
+            if self.first is None or len(edges) < self.first:
+                self._has_next_page = False
+            else:
+                self._has_next_page = next(self.nodes, _END) is not _END
+        return self._has_next_page
+
+    @property
+    def start_cursor(self) -> Optional[str]:
+        return self.edges[0].cursor if self.edges else None
+
+    @property
+    def end_cursor(self) -> Optional[str]:
+        return self.edges[-1].cursor if self.edges else None
+
+
+_END = object()
+
+
+def attribute(name: str) -> Callable[..., Any]:
+    return lambda value, info: getattr(value, name)
+
+
+PageInfo = GraphQLObjectType(
+    "PageInfo",
+    {
+        "hasNextPage": GraphQLField(
+            GraphQLNonNull(GraphQLBoolean), resolve=attribute("has_next_page")
+        ),
+        "hasPreviousPage": GraphQLField(
+            GraphQLNonNull(GraphQLBoolean), resolve=attribute("has_previous_page")
+        ),
+        "startCursor": GraphQLField(GraphQLString, resolve=attribute("start_cursor")),
+        "endCursor": GraphQLField(GraphQLString, resolve=attribute("end_cursor")),
+    },
+)
+
+CONNECTION_ARGS = {
+    "first": GraphQLArgument(GraphQLInt, description="Number of nodes to return"),
+    "after": GraphQLArgument(
+        GraphQLString, description="Cursor of the node to return nodes after"
+    ),
+}
+
+
+def connection_type(
+    node_type: GraphQLOutputType, type_by_name: Dict[str, Any]
+) -> GraphQLObjectType:
+    """The Connection and Edge types of a node type, registered in type_by_name"""
+    name = get_named_type(node_type).name
+    try:
+        return type_by_name[f"{name}Connection"]
+    except KeyError:
+        pass
+
+    edge = GraphQLObjectType(
+        f"{name}Edge",
+        {
+            "node": GraphQLField(node_type, resolve=attribute("node")),
+            "cursor": GraphQLField(
+                GraphQLNonNull(GraphQLString), resolve=attribute("cursor")
+            ),
+        },
+    )
+    connection = GraphQLObjectType(
+        f"{name}Connection",
+        {
+            "edges": GraphQLField(
+                GraphQLNonNull(GraphQLList(GraphQLNonNull(edge))),
+                resolve=attribute("edges"),
+            ),
+            "pageInfo": GraphQLField(
+                GraphQLNonNull(PageInfo), resolve=attribute("page_info")
+            ),
+        },
+    )
+    type_by_name[edge.name] = edge
+    type_by_name[connection.name] = connection
+    return connection
+
+
+def make_connection(
+    nodes: Iterable[Any],
+    first: Optional[int],
+    after: Optional[int],
+    skip: bool = True,
+) -> ConnectionSlice:
+    """
+    Slice of the nodes requested by first and after
+
+    after: offset of the node to return nodes after, decoded from its cursor
+    skip: do the nodes still need skipping up to after? False when the resolver
+        already did it
+    """
+    offset = 0 if after is None else after + 1
+    iterator = iter(nodes)
+    if skip and offset:
+        # Advance lazily so skipped nodes are read but not kept
+        next(islice(iterator, offset - 1, offset), None)
+    return ConnectionSlice(iterator, first, offset)
+
+
+def connection_resolver(
+    resolver: Callable[..., Any], takes_first: bool, takes_after: bool
+) -> Callable[..., Any]:
+    """Wraps a resolver of nodes into one of the requested ConnectionSlice"""
+
+    @wraps(resolver)
+    def resolve_connection(data, info, first=None, after=None, **args):
+        if first is not None and first < 0:
+            raise GraphQLError("first must be a positive integer")
+        offset = None if after is None else decode_cursor(after)
+        if takes_first:
+            args["first"] = first
+        if takes_after:
+            args["after"] = offset
+        nodes = resolver(data, info, **args)
+        if is_awaitable(nodes):
+
+            async def await_nodes():
+                return make_connection(await nodes, first, offset, not takes_after)
+
+            return await_nodes()
+        return make_connection(nodes, first, offset, not takes_after)
+
+    resolve_connection.__is_wrapped_resolver = True  # type: ignore
+    return resolve_connection
+
+
+def key_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def typed_key_value(t: Any, value: Any) -> Any:
+    if is_optional_type(t):
+        if value is None:
+            return None
+        t = next(arg for arg in get_args(t) if arg is not type(None))
+    if not isinstance(t, type):
+        return value
+    if issubclass(t, datetime):
+        return datetime.fromisoformat(value)
+    if issubclass(t, date):
+        return date.fromisoformat(value)
+    if issubclass(t, Decimal):
+        return Decimal(value)
+    if issubclass(t, enum.Enum):
+        return t[value]
+    return value
+
+
+class Keyset:
+    """
+    Keyset (seek) pagination of a Connection on the ordered key fields of its
+    nodes, ie. Annotated[Connection[Post], Keyset("created", "id")]
+
+    The resolver takes after, the tuple of key values of the node to return
+    nodes after or None for the first page, and returns the nodes ordered by
+    the key fields starting after it. Cursors encode the key values instead of
+    an offset, so a deep page costs the same as the first one.
+    """
+
+    def __init__(self, *fields: str):
+        if not fields:
+            raise ValueError("Keyset needs at least one key field")
+        self.fields = fields
+
+    def encode(self, node: Any) -> str:
+        get = getitem if isinstance(node, dict) else getattr
+        values = [key_value(get(node, field)) for field in self.fields]
+        cursor = KEYSET_CURSOR_PREFIX + json.dumps(values, separators=(",", ":"))
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode(self, cursor: str, node_type: Any) -> Tuple[Any, ...]:
+        """The typed key values of the cursor"""
+        try:
+            decoded = base64.urlsafe_b64decode(cursor.encode()).decode()
+            if decoded.startswith(KEYSET_CURSOR_PREFIX):
+                values = json.loads(decoded[len(KEYSET_CURSOR_PREFIX) :])
+                if isinstance(values, list) and len(values) == len(self.fields):
+                    hints = get_type_hints(node_type)
+                    return tuple(
+                        typed_key_value(hints.get(field), value)
+                        for field, value in zip(self.fields, values)
+                    )
+        except (binascii.Error, KeyError, TypeError, ValueError):
+            pass
+        raise GraphQLError(f"Invalid cursor '{cursor}'")
+
+
+def keyset_resolver(
+    resolver: Callable[..., Any], takes_first: bool, keyset: Keyset, node_type: Any
+) -> Callable[..., Any]:
+    """Wraps a resolver of nodes after a key into one of the requested slice"""
+
+    @wraps(resolver)
+    def resolve_connection(data, info, first=None, after=None, **args):
+        if first is not None and first < 0:
+            raise GraphQLError("first must be a positive integer")
+        if takes_first:
+            args["first"] = first
+        args["after"] = None if after is None else keyset.decode(after, node_type)
+        nodes = resolver(data, info, **args)
+
+        def make_slice(nodes: Iterable[Any]) -> ConnectionSlice:
+            return ConnectionSlice(
+                iter(nodes),
+                first,
+                0,
+                cursor=lambda node, offset: keyset.encode(node),
+                has_previous_page=after is not None,
+            )
+
+        if is_awaitable(nodes):
+
+            async def await_nodes():
+                return make_slice(await nodes)
+
+            return await_nodes()
+        return make_slice(nodes)
+
+    resolve_connection.__is_wrapped_resolver = True  # type: ignore
+    return resolve_connection
@@ -44,14 +44,35 @@ from graphql.type import GraphQLObjectType
 from graphql.type import GraphQLScalarType
 from graphql.type import GraphQLString as String
 from graphql.type import GraphQLType
+from graphql.type import get_named_type
 from typing_inspect import is_new_type
 from typing_inspect import is_optional_type
 from typing_inspect import is_typevar
 
+from typed_graphql.arrays import array_item_type
+from typed_graphql.arrays import is_array_type
+from typed_graphql.cache import CacheHint
+from typed_graphql.cache import Cached
+from typed_graphql.cache import cache_resolver
+from typed_graphql.connection import CONNECTION_ARGS
+from typed_graphql.connection import Connection
+from typed_graphql.connection import Keyset
+from typed_graphql.connection import connection_node_type
+from typed_graphql.connection import connection_resolver
+from typed_graphql.connection import connection_type
+from typed_graphql.connection import keyset_resolver
+from typed_graphql.limits import MaxItems
+from typed_graphql.scalars import DECIMAL_FORMATS
+from typed_graphql.scalars import TIMEZONE_POLICIES
+from typed_graphql.scalars import GraphQLBase64
+from typed_graphql.scalars import GraphQLDecimal
+from typed_graphql.scalars import GraphQLDecimalNumber
+from typed_graphql.scalars import datetime_scalar
+from typed_graphql.scalars import is_bulk_scalar_list
+from typed_graphql.scalars import newtype_to_scalar
 from typed_graphql.scalars import parse_date
-from typed_graphql.scalars import parse_datetime
+from typed_graphql.scalars import parse_string_literal
 from typed_graphql.scalars import serialize_date
-from typed_graphql.scalars import serialize_datetime
 from typed_graphql.util import get_arg_for_typevar
 
 if sys.version_info >= (3, 10):
@@ -67,7 +88,28 @@ IMMUTABLE_ARGUMENT_NAMES = set(["includeDeprecated"])
 
 
 class GraphQLTypeConversionContext:
-    def __init__(self):
+    """
+    State shared while converting the types of a schema
+
+    timezone_policy: how the DateTime scalar treats timezones, one of
+        TIMEZONE_POLICIES
+    decimal_format: map Decimal to the Decimal scalar serialized in one of
+        DECIMAL_FORMATS instead of to Float
+    """
+
+    def __init__(
+        self, timezone_policy: str = "utc", decimal_format: Optional[str] = None
+    ):
+        if timezone_policy not in TIMEZONE_POLICIES:
+            raise ValueError(
+                f"timezone_policy must be one of {', '.join(TIMEZONE_POLICIES)}"
+            )
+        if decimal_format is not None and decimal_format not in DECIMAL_FORMATS:
+            raise ValueError(
+                f"decimal_format must be one of {', '.join(DECIMAL_FORMATS)}"
+            )
+        self.timezone_policy = timezone_policy
+        self.decimal_format = decimal_format
         self.type_dict = {}
         self.input_type_dict = {}
         self.type_by_name: Dict[str, GraphQLObjectType] = {}
@@ -143,6 +185,10 @@ class TypedGraphqlMiddlewareManager(MiddlewareManager):
                 for k, v in args.items()
                 if k not in IMMUTABLE_ARGUMENT_NAMES
             }
+            # Wrapped resolvers (ie. Cached or Connection) must go through the
+            # wrapper
+            if getattr(field_resolver, "__is_wrapped_resolver", False):
+                return field_resolver(data, info, **args)
             try:
                 return getattr(data, f"resolve_{camel_to_snake(info.field_name)}")(
                     info, **args
@@ -262,10 +308,13 @@ def parse_dataclass_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str,
         def resolver(data, info):
             return getattr(data, camel_to_snake(info.field_name), None)
 
+        field_type = hints.get(f.name, f.type)
+        graphql_field_type = python_type_to_graphql_type(cls, field_type, ctx)
         field = Field(
-            python_type_to_graphql_type(cls, hints.get(f.name, f.type), ctx),
+            graphql_field_type,
             resolve=resolver,
             description=arg_name_to_doc.get(f.name),
+            extensions=field_extensions(field_type, graphql_field_type),
         )
         fields[field_name] = field
 
@@ -290,10 +339,12 @@ def parse_annotations_derived_fields(
         def resolver(data, info):
             return getattr(data, camel_to_snake(info.field_name), None)
 
+        graphql_field_type = python_type_to_graphql_type(cls, type, ctx)
         field = Field(
-            python_type_to_graphql_type(cls, type, ctx),
+            graphql_field_type,
             resolve=resolver,
             description=arg_name_to_doc.get(field_name),
+            extensions=field_extensions(type, graphql_field_type),
         )
         fields[field_name] = field
 
@@ -353,10 +404,12 @@ def parse_dict_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, Field
         def resolver(data, info):
             return getitem(data, camel_to_snake(info.field_name))
 
+        graphql_field_type = python_type_to_graphql_type(cls, type, ctx)
         field = Field(
-            python_type_to_graphql_type(cls, type, ctx),
+            graphql_field_type,
             resolve=resolver,
             description=arg_name_to_doc.get(name),
+            extensions=field_extensions(type, graphql_field_type),
         )
         fields[field_name] = field
 
@@ -364,12 +417,17 @@ def parse_dict_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, Field
 
 
 def graphql_type(
-    cls, input_field: bool = False, ctx: Optional[GraphQLTypeConversionContext] = None
+    cls,
+    input_field: bool = False,
+    ctx: Optional[GraphQLTypeConversionContext] = None,
+    subscription: bool = False,
 ) -> GraphQLType:
     """
     Converts a class into a GraphQLType via introspection
 
     input_field: is this an GraphQL input type?
+    subscription: is this the subscription root? Its resolvers return an
+        AsyncIterator and each field has the type of the items it yields
     """
 
     if not ctx:
@@ -394,8 +452,9 @@ def graphql_type(
     try:
         _t = GraphQLObjectType(
             cls.__name__,
-            lambda: _build_graphql_fields(cls, ctx),
+            lambda: _build_graphql_fields(cls, ctx, subscription),
             description=parsed_docstring.short_description,
+            extensions=type_extensions(cls),
         )
     except TypeError as e:
         raise TypeUnrepresentableAsGraphql(cls.__name__, e)
@@ -406,7 +465,23 @@ def graphql_type(
     return _t
 
 
-def _build_graphql_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, Field]:
+def resolve_event(event, info, **kwargs):
+    """Resolves a subscription field to the event yielded by its source stream"""
+    return event
+
+
+def subscription_event_type(t):
+    """The type of the items of an AsyncIterator, AsyncIterable or AsyncGenerator"""
+    if str(t).startswith(
+        ("typing.AsyncIterator", "typing.AsyncIterable", "typing.AsyncGenerator")
+    ):
+        return t.__args__[0]
+    return None
+
+
+def _build_graphql_fields(
+    cls, ctx: GraphQLTypeConversionContext, subscription: bool = False
+) -> Dict[str, Field]:
     fields: Dict[str, Field] = {}
 
     def is_staticmethod(o):
@@ -474,9 +549,21 @@ def _build_graphql_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, F
         parsed_docstring = docstring_parser.parse(docstring)
         arg_name_to_doc = {x.arg_name: x.description for x in parsed_docstring.params}
 
+        try:
+            return_type = cls_hints[attr_name].__args__[-1]
+        except (AttributeError, KeyError):
+            return_type = method_hints.get("return", signature.return_annotation)
+
+        # A connection's after is a cursor in GraphQL, and an offset or, for a
+        # keyset connection, a key in Python
+        node_type = connection_node_type(return_type)
+        keyset = get_annotated_metadata(return_type, Keyset)
+
         args = {}
 
         for param_name, param in params[arg_offset:]:
+            if node_type is not None and param_name == "after":
+                continue
             annotation = method_hints.get(param_name, param.annotation)
             try:
                 args[snake_to_camel(param_name, upper=False)] = GraphQLArgument(
@@ -492,10 +579,14 @@ def _build_graphql_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, F
                     f"{attr_name} can not be converted to a GraphQL type",
                 )
 
-        try:
-            return_type = cls_hints[attr_name].__args__[-1]
-        except (AttributeError, KeyError):
-            return_type = method_hints.get("return", signature.return_annotation)
+        if subscription:
+            event_type = subscription_event_type(return_type)
+            if event_type is None:
+                raise TypeUnrepresentableAsGraphql(
+                    f"Subscription resolver {attr_name} of {cls} must return an"
+                    " AsyncIterator"
+                )
+            return_type = event_type
 
         # TODO: Need async version
         def resolver_shim(func, data, info, *args, **kwargs):
@@ -526,10 +617,44 @@ def _build_graphql_fields(cls, ctx: GraphQLTypeConversionContext) -> Dict[str, F
                 )
             raise
 
-        if is_staticmethod(attr):
-            field = Field(graphql_ret_type, args=args, resolve=resolver)
+        is_connection = node_type is not None
+        if is_connection:
+            param_names = {param_name for param_name, _ in params[arg_offset:]}
+            if keyset is not None:
+                if "after" not in param_names:
+                    raise TypeUnrepresentableAsGraphql(
+                        f"Keyset connection {attr_name} of {cls} must take after"
+                    )
+                resolver = keyset_resolver(
+                    resolver, "first" in param_names, keyset, node_type
+                )
+            else:
+                resolver = connection_resolver(
+                    resolver, "first" in param_names, "after" in param_names
+                )
+            args = {**CONNECTION_ARGS, **args}
+
+        cache_policy = get_annotated_metadata(return_type, Cached)
+        if cache_policy is not None and not subscription:
+            resolver = cache_resolver(resolver, cache_policy)
+
+        extensions = field_extensions(return_type, graphql_ret_type)
+
+        if subscription:
+            # The resolver produces the source stream, each event is the value
+            field = Field(
+                graphql_ret_type,
+                args=args,
+                resolve=resolve_event,
+                subscribe=resolver,
+                extensions=extensions,
+            )
+        elif is_staticmethod(attr) or cache_policy is not None or is_connection:
+            field = Field(
+                graphql_ret_type, args=args, resolve=resolver, extensions=extensions
+            )
         else:
-            field = Field(graphql_ret_type, args=args)
+            field = Field(graphql_ret_type, args=args, extensions=extensions)
 
         if attr_name.startswith("resolve_"):
             attr_name = attr_name[len("resolve_") :]
@@ -560,6 +685,48 @@ def is_annotated(cls) -> bool:
     return get_origin(cls) is Annotated
 
 
+def get_annotated_metadata(t, kind: type) -> Any:
+    """Return the first instance of kind found in an Annotated type's metadata"""
+    if not is_annotated(t):
+        return None
+    for metadata in get_args(t)[1:]:
+        if isinstance(metadata, kind):
+            return metadata
+    return None
+
+
+def type_extensions(cls) -> Dict[str, Any]:
+    """Extensions recorded on an object type from its class and decorators"""
+    extensions: Dict[str, Any] = {}
+    cache_hint = getattr(cls, "_cache_hint", None)
+    if cache_hint is not None:
+        extensions["cache_hint"] = cache_hint
+    # Identifies entities for cache invalidation
+    if "id" in resolve_type_hints(cls):
+        extensions["id_field"] = "id"
+    return extensions
+
+
+def field_extensions(t, graphql_t: GraphQLType) -> Dict[str, Any]:
+    """
+    Extensions recorded on a field from its python type
+
+    A CacheHint on the field takes precedence over one on the type it returns.
+    """
+    extensions = {}
+    cache_hint = get_annotated_metadata(t, CacheHint)
+    if cache_hint is None:
+        cache_hint = get_named_type(graphql_t).extensions.get("cache_hint")
+    if cache_hint is not None:
+        extensions["cache_hint"] = cache_hint
+    max_items = get_annotated_metadata(t, MaxItems)
+    if max_items is not None:
+        extensions["max_items"] = max_items
+    if is_bulk_scalar_list(graphql_t):
+        extensions["scalar_list"] = True
+    return extensions
+
+
 def enum_to_graphql_type(
     t,
     ctx: GraphQLTypeConversionContext,
@@ -580,11 +747,7 @@ def datetime_to_graphql_type(t, ctx: GraphQLTypeConversionContext, nonnull=True)
     try:
         _t = ctx.type_dict[id(t)]
     except KeyError:
-        ctx.type_dict[id(t)] = _t = GraphQLScalarType(
-            name="DateTime",
-            serialize=serialize_datetime,
-            parse_value=parse_datetime,
-        )
+        ctx.type_dict[id(t)] = _t = datetime_scalar(ctx.timezone_policy)
     if nonnull:
         return GraphQLNonNull(_t)
     return _t
@@ -598,12 +761,23 @@ def date_to_graphql_type(t, ctx: GraphQLTypeConversionContext, nonnull=True):
             name="Date",
             serialize=serialize_date,
             parse_value=parse_date,
+            parse_literal=parse_string_literal(parse_date, "Date"),
         )
     if nonnull:
         return GraphQLNonNull(_t)
     return _t
 
 
+def array_to_graphql_type(
+    t, item_type: Optional[GraphQLScalarType] = None, nonnull: bool = True
+):
+    """array.array and numpy arrays are lists of their items' scalar"""
+    _t = GraphQLList(GraphQLNonNull(item_type or array_item_type(t)))
+    if nonnull:
+        return GraphQLNonNull(_t)
+    return _t
+
+
 def class_to_graphql_type(
     t, ctx: GraphQLTypeConversionContext, input_field=False, nonnull=True
 ):
@@ -656,7 +830,10 @@ def python_type_to_graphql_type(
     nonnull: bool = True,
     input_field: bool = False,
 ):
-    if type(t) is GenericAlias:
+    if is_array_type(t):
+        return array_to_graphql_type(t, nonnull=nonnull)
+
+    elif type(t) is GenericAlias:
         origin = get_origin(t)
         if origin is list or origin is set:
             assert len(t.__args__) == 1
@@ -691,6 +868,13 @@ def python_type_to_graphql_type(
         return tuple_to_graphql_type(
             cls, t, ctx, nonnull=nonnull, input_field=input_field
         )
+    elif get_origin(t) is Connection:
+        _t = connection_type(
+            python_type_to_graphql_type(cls, get_args(t)[0], ctx), ctx.type_by_name
+        )
+        if nonnull:
+            return GraphQLNonNull(_t)
+        return _t
     if str(t).startswith("graphql.type.definition.GraphQLList"):
         assert len(t.__args__) == 1
         return GraphQLList(
@@ -699,8 +883,20 @@ def python_type_to_graphql_type(
             )
         )
     elif is_annotated(t):
+        # Field level metadata (ie. Cached, CacheHint) is picked up when building
+        # fields and skipped here.
         # if a GraphQLType is in the annotation, we use that as an override
         for annotated_type in get_args(t):
+            # ie. Annotated[Decimal, GraphQLDecimal]
+            if isinstance(annotated_type, GraphQLScalarType):
+                if is_array_type(get_args(t)[0]):
+                    # ie. Annotated[array.array, GraphQLInt]
+                    return array_to_graphql_type(
+                        get_args(t)[0], annotated_type, nonnull=nonnull
+                    )
+                if nonnull:
+                    return GraphQLNonNull(annotated_type)
+                return annotated_type
             try:
                 is_graphqltype = issubclass(annotated_type, GraphQLType)
             except TypeError:
@@ -726,6 +922,11 @@ def python_type_to_graphql_type(
             raise Exception
 
     elif is_new_type(t):
+        if hasattr(t, "_graphql_type") or hasattr(t.__supertype__, "_graphql_type"):
+            _t = newtype_to_scalar(t)
+            if nonnull:
+                return GraphQLNonNull(_t)
+            return _t
         return python_type_to_graphql_type(
             cls,
             t.__supertype__,
@@ -796,9 +997,14 @@ def python_type_to_graphql_type(
                     return GraphQLNonNull(Float)
                 return Float
             elif issubclass(t, Decimal):
+                _t = Float
+                if ctx.decimal_format == "string":
+                    _t = GraphQLDecimal
+                elif ctx.decimal_format == "number":
+                    _t = GraphQLDecimalNumber
                 if nonnull:
-                    return GraphQLNonNull(Float)
-                return Float
+                    return GraphQLNonNull(_t)
+                return _t
             elif issubclass(t, enum.Enum):
                 return enum_to_graphql_type(t, ctx, nonnull=nonnull)
 
@@ -808,6 +1014,11 @@ def python_type_to_graphql_type(
             elif issubclass(t, date):
                 return date_to_graphql_type(t, ctx, nonnull=nonnull)
 
+            elif issubclass(t, (bytes, bytearray, memoryview)):
+                if nonnull:
+                    return GraphQLNonNull(GraphQLBase64)
+                return GraphQLBase64
+
             elif issubclass(t, dict):
                 if nonnull:
                     return GraphQLNonNull(
@@ -0,0 +1,101 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+Patch = List[Dict[str, Any]]
+
+
+class PatchResult:
+    """
+    The changes to a subscriber's previous result, as JSON patch operations
+
+    Sent in place of an ExecutionResult when a subscription is diffed.
+    """
+
+    def __init__(self, patch: Patch, extensions: Optional[Dict[str, Any]] = None):
+        self.patch = patch
+        self.extensions = extensions
+
+    def __repr__(self) -> str:
+        return f"PatchResult(patch={self.patch!r}, extensions={self.extensions!r})"
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {"patch": self.patch}
+        if self.extensions is not None:
+            formatted["extensions"] = self.extensions
+        return formatted
+
+
+def escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> Patch:
+    """
+    JSON patch (RFC 6902) operations turning old into new
+
+    Objects and lists are compared member by member, so an unchanged subtree
+    produces no operations.
+    """
+    if type(old) is type(new) and old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: Patch = [
+            {"op": "remove", "path": f"{path}/{escape(key)}"}
+            for key in old
+            if key not in new
+        ]
+        for key, value in new.items():
+            key_path = f"{path}/{escape(key)}"
+            if key in old:
+                patch.extend(json_patch(old[key], value, key_path))
+            else:
+                patch.append({"op": "add", "path": key_path, "value": value})
+        return patch
+
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        patch = []
+        for index in range(common):
+            patch.extend(json_patch(old[index], new[index], f"{path}/{index}"))
+        for index in range(common, len(new)):
+            patch.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+        # From the end so the indexes of the items still to be removed hold
+        for index in reversed(range(common, len(old))):
+            patch.append({"op": "remove", "path": f"{path}/{index}"})
+        return patch
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_json_patch(document: Any, patch: Patch) -> Any:
+    """Apply the add, remove and replace operations of a JSON patch"""
+    for operation in patch:
+        tokens = [unescape(token) for token in operation["path"].split("/")[1:]]
+        if not tokens:
+            document = operation["value"]
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+        last: Any = tokens[-1]
+        if isinstance(parent, list):
+            last = len(parent) if last == "-" else int(last)
+
+        op = operation["op"]
+        if op == "remove":
+            del parent[last]
+        elif op == "add" and isinstance(parent, list):
+            parent.insert(last, operation["value"])
+        elif op in ("add", "replace"):
+            parent[last] = operation["value"]
+        else:
+            raise ValueError(f"Unsupported JSON patch operation '{op}'")
+    return document
@@ -0,0 +1,85 @@
+import json
+from decimal import Decimal
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from graphql.execution import ExecutionResult
+
+
+class RawJson:
+    """A value already encoded as JSON, written to the response as it is"""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, encoded: bytes):
+        self.encoded = encoded
+
+    def __repr__(self) -> str:
+        return f"RawJson({self.encoded!r})"
+
+
+def json_default(value: Any) -> Any:
+    """
+    Encodes the values json can't, for the default of json.dumps
+
+    The C encoder cannot write a Decimal as a number, so the ones of
+    GraphQLDecimalNumber are written as strings.
+    """
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_encode = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=json_default
+).encode
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, encoded in one pass of the C encoder"""
+    return _encode(value).encode()
+
+
+def encode_json(value: Any, buffer: bytearray) -> None:
+    """
+    Append the JSON of a result's data to buffer
+
+    Objects are walked to write the RawJson of their lists as they are, all
+    else is encoded with dumps.
+    """
+    if isinstance(value, RawJson):
+        buffer += value.encoded
+    elif isinstance(value, dict):
+        buffer += b"{"
+        first = True
+        for key, item in value.items():
+            if not first:
+                buffer += b","
+            first = False
+            buffer += dumps(key)
+            buffer += b":"
+            encode_json(item, buffer)
+        buffer += b"}"
+    else:
+        buffer += dumps(value)
+
+
+def encode_result(
+    result: ExecutionResult, buffer: Optional[bytearray] = None
+) -> bytearray:
+    """The JSON of result.formatted, with the RawJson of its data as it is"""
+    if buffer is None:
+        buffer = bytearray()
+    buffer += b'{"data":'
+    encode_json(result.data, buffer)
+    rest: Dict[str, Any] = {}
+    if result.errors:
+        rest["errors"] = [error.formatted for error in result.errors]
+    if result.extensions is not None:
+        rest["extensions"] = result.extensions
+    for key, value in rest.items():
+        buffer += f',"{key}":'.encode()
+        buffer += dumps(value)
+    buffer += b"}"
+    return buffer
@@ -1,10 +1,85 @@
-from typing import Any, Dict, Optional
+import asyncio
+from copy import copy
+from itertools import chain, islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
-from graphql import graphql
-from graphql.type import GraphQLSchema
-from graphql.pyutils import is_awaitable
+from graphql import ExecutionContext, ExecutionResult, GraphQLError
+from graphql import execute, located_error, parse, validate, validate_schema
+from graphql.execution import create_source_event_stream
+from graphql.execution.execute import CollectedErrors, get_field_def
+from graphql.execution.values import get_directive_values
+from graphql.language import DocumentNode, FieldNode, OperationType
+from graphql.type import (
+    GraphQLLeafType,
+    GraphQLList,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLSchema,
+    get_named_type,
+    get_nullable_type,
+    is_abstract_type,
+    is_leaf_type,
+    is_list_type,
+    is_non_null_type,
+    is_object_type,
+)
+from graphql.pyutils import (
+    AwaitableOrValue,
+    Path,
+    Undefined,
+    inspect,
+    is_awaitable,
+    is_iterable,
+)
+from graphql.utilities import get_operation_ast
 
+from .arrays import array_to_list, is_array
+from .cache import (
+    CacheHint,
+    ResponseCache,
+    SingleFlight,
+    add_invalidation_listener,
+    entity_tag,
+    remove_invalidation_listener,
+)
 from .core import TypedGraphqlMiddlewareManager
+from .diff import PatchResult, json_patch
+from .encode import RawJson, dumps, encode_result
+from .export import ExportResult, RowEncoder, is_binary, write
+from .limits import MaxItems, as_max_items, cap_items
+from .scalars import already_serialized
+from .columnar import GraphQLColumnarDirective
+from .incremental import (
+    CollectedFields,
+    DeferredFragment,
+    GraphQLStreamDirective,
+    IncrementalPublisher,
+    IncrementalResult,
+    collect_fields_with_defer,
+    make_payload,
+)
+from .subscription import (
+    END_OF_STREAM,
+    BufferedSource,
+    FanOut,
+    StreamError,
+    Subscriber,
+)
 
 
 async def await_awaitables(v: Any) -> Any:
@@ -18,20 +93,1165 @@ async def await_awaitables(v: Any) -> Any:
         return v
 
 
+def is_outermost_list(path: Path) -> bool:
+    """Is the list at path outside of every other list?"""
+    while path is not None:
+        if isinstance(path.key, int):
+            return False
+        path = path.prev
+    return True
+
+
+async def encode_list(completed: Any) -> Any:
+    if isinstance(completed, RawJson):
+        return completed
+    return RawJson(dumps(await await_awaitables(completed)))
+
+
+class TypedGraphqlExecutionContext(ExecutionContext):
+    """
+    Execution context used by execute_async and execute_sync
+
+    Combines the cache hints of the fields it resolves into cache_policy, which
+    is added to the result's extensions as "cacheControl". When entity_tags is
+    set, the types and entities of completed objects are added to it. When
+    publisher is set, the items of @stream fields after their initialCount and
+    the fields of @defer fragments are added to it instead of the result.
+
+    Lists are capped by the MaxItems of their field or the schema's "max_items"
+    extension. The paths of truncated lists are added to the result's
+    extensions as "truncated".
+
+    Lists of objects with @columnar are returned as columns, see
+    GraphQLColumnarDirective.
+
+    When encoding is set, lists outside of other lists are encoded to JSON as
+    soon as they complete, and returned as RawJson.
+
+    When exported is set, the top-level list of the query is not completed, but
+    added to it with what completing its items takes.
+
+    entity_tags, publisher, encoding and exported are options of an execution,
+    set on the subclass made by with_options.
+    """
+
+    entity_tags: Optional[Set[str]] = None
+    publisher: Optional[IncrementalPublisher] = None
+    encoding = False
+    exported: Optional[List[Tuple[Any, ...]]] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_policy: Optional[CacheHint] = None
+        self.unhinted = False
+        self.truncated: List[List[Union[str, int]]] = []
+
+    @classmethod
+    def with_options(cls, **options: Any) -> Type["TypedGraphqlExecutionContext"]:
+        """The context class of an execution with the options set"""
+        return cast(
+            Type[TypedGraphqlExecutionContext], type(cls.__name__, (cls,), options)
+        )
+
+    def fork(self) -> "TypedGraphqlExecutionContext":
+        """A copy of the context that collects errors of its own"""
+        context = copy(self)
+        context.collected_errors = CollectedErrors()
+        return context
+
+    def execute_field(self, parent_type, source, field_nodes, path):
+        field_def = get_field_def(self.schema, parent_type, field_nodes[0])
+        if field_def is not None:
+            cache_hint = field_def.extensions.get("cache_hint")
+            if cache_hint is not None:
+                self.cache_policy = (
+                    cache_hint
+                    if self.cache_policy is None
+                    else self.cache_policy.restrict(cache_hint)
+                )
+            elif path.prev is None or not is_leaf_type(get_named_type(field_def.type)):
+                # Like a hint of max_age=0, other fields inherit their parent's
+                self.unhinted = True
+        return super().execute_field(parent_type, source, field_nodes, path)
+
+    def tag_entity(self, return_type: GraphQLObjectType, result: Any) -> None:
+        if self.entity_tags is not None:
+            self.entity_tags.add(return_type.name)
+            tag = entity_tag(return_type, result)
+            if tag is not None:
+                self.entity_tags.add(tag)
+
+    def complete_object_value(self, return_type, field_nodes, info, path, result):
+        self.tag_entity(return_type, result)
+        return super().complete_object_value(
+            return_type, field_nodes, info, path, result
+        )
+
+    def execute_operation(self, operation, root_value):
+        if self.publisher is None or operation.operation != OperationType.QUERY:
+            return super().execute_operation(operation, root_value)
+        root_type = self.schema.get_root_type(operation.operation)
+        if root_type is None:
+            raise GraphQLError(
+                "Schema is not configured to execute query operation.", operation
+            )
+        root_fields = collect_fields_with_defer(
+            self.schema,
+            self.fragments,
+            self.variable_values,
+            root_type,
+            [operation.selection_set],
+        )
+        return self.execute_fields(root_type, root_value, None, root_fields)
+
+    def collect_subfields(self, return_type, field_nodes):
+        if self.publisher is None:
+            return super().collect_subfields(return_type, field_nodes)
+        key = (return_type, *map(id, field_nodes))
+        sub_field_nodes = self._subfields_cache.get(key)
+        if sub_field_nodes is None:
+            sub_field_nodes = collect_fields_with_defer(
+                self.schema,
+                self.fragments,
+                self.variable_values,
+                return_type,
+                [node.selection_set for node in field_nodes if node.selection_set],
+            )
+            self._subfields_cache[key] = sub_field_nodes
+        return sub_field_nodes
+
+    def execute_fields(self, parent_type, source_value, path, fields):
+        if isinstance(fields, CollectedFields):
+            for fragment in fields.deferred:
+                cast(IncrementalPublisher, self.publisher).add(
+                    self.execute_deferred(parent_type, source_value, path, fragment)
+                )
+        return super().execute_fields(parent_type, source_value, path, fields)
+
+    async def execute_deferred(
+        self,
+        parent_type: GraphQLObjectType,
+        source_value: Any,
+        path: Optional[Path],
+        fragment: DeferredFragment,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute the fields of a @defer fragment, delivered as one payload"""
+        # Errors are delivered with the fragment they occurred in
+        context = self.fork()
+        try:
+            data = context.execute_fields(
+                parent_type, source_value, path, fragment.fields
+            )
+            if self.is_awaitable(data):
+                data = await data
+            data = await await_awaitables(data)
+        except GraphQLError as error:
+            context.collected_errors.add(error, path)
+            data = None
+        yield make_payload(
+            path, fragment.label, context.collected_errors.errors, data=data
+        )
+
+    def handle_field_error(self, error, return_type, path):
+        result = super().handle_field_error(error, return_type, path)
+        # Not raised, so the field is null from here on
+        if self.publisher is not None:
+            self.publisher.nulled.append(path.as_list())
+        return result
+
+    @staticmethod
+    def get_field_extensions(info) -> Dict[str, Any]:
+        if info.parent_type.name.startswith("__"):
+            return {}
+        field = info.parent_type.fields.get(info.field_name)
+        return {} if field is None else field.extensions
+
+    def get_max_items(self, info) -> Optional[MaxItems]:
+        if info.parent_type.name.startswith("__"):
+            return None
+        limit = self.get_field_extensions(info).get("max_items")
+        if limit is None:
+            limit = self.schema.extensions.get("max_items")
+        return as_max_items(limit)
+
+    def complete_list_value(self, return_type, field_nodes, info, path, result):
+        completed = self.complete_list_items(
+            return_type, field_nodes, info, path, result
+        )
+        if not self.encoding or not is_outermost_list(path):
+            return completed
+        # Encoded as soon as it completes, so the values of only one list at a
+        # time are kept
+        if self.is_awaitable(completed):
+
+            async def encode_awaited() -> Any:
+                return await encode_list(await completed)
+
+            return encode_awaited()
+        try:
+            return RawJson(dumps(completed))
+        except TypeError:
+            # Holds values that are still awaited
+            return encode_list(completed)
+
+    def complete_list_items(self, return_type, field_nodes, info, path, result):
+        limit = self.get_max_items(info)
+        if limit is not None:
+            result = cap_items(
+                result, limit, lambda: self.truncated.append(path.as_list())
+            )
+
+        if self.exported is not None and path.prev is None:
+            # The items are completed one at a time as they are exported
+            self.exported.append(
+                (self, result, return_type.of_type, field_nodes, info, path)
+            )
+            return []
+
+        if self.is_columnar(return_type, field_nodes):
+            if not is_iterable(result) and isinstance(result, AsyncIterable):
+
+                async def complete_async_columnar() -> Any:
+                    items = [item async for item in result]
+                    columns = self.complete_columnar(
+                        return_type, field_nodes, info, path, items
+                    )
+                    if self.is_awaitable(columns):
+                        return await columns
+                    return columns
+
+                return complete_async_columnar()
+            if is_iterable(result):
+                return self.complete_columnar(
+                    return_type, field_nodes, info, path, list(result)
+                )
+
+        stream = self.get_stream_arguments(field_nodes)
+        if stream is None:
+            if self.get_field_extensions(info).get("scalar_list"):
+                if is_array(result):
+                    result = array_to_list(result)
+                if isinstance(result, (list, tuple)):
+                    return self.complete_scalar_list(
+                        return_type, field_nodes, info, path, result
+                    )
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        initial_count = stream["initialCount"]
+        complete_initial = super().complete_list_value
+
+        def stream_rest(items: Union[Iterator, AsyncIterator]) -> None:
+            cast(IncrementalPublisher, self.publisher).add(
+                self.stream_items(
+                    items,
+                    initial_count,
+                    return_type.of_type,
+                    field_nodes,
+                    info,
+                    path,
+                    stream["label"],
+                )
+            )
+
+        if not is_iterable(result) and isinstance(result, AsyncIterable):
+            items = result.__aiter__()
+
+            async def complete_async_initial() -> Any:
+                initial: List[Any] = []
+                try:
+                    while len(initial) < initial_count:
+                        initial.append(await items.__anext__())
+                except StopAsyncIteration:
+                    # Ran out before initialCount, nothing left to stream
+                    pass
+                else:
+                    stream_rest(items)
+                completed = complete_initial(
+                    return_type, field_nodes, info, path, initial
+                )
+                if self.is_awaitable(completed):
+                    return await completed
+                return completed
+
+            return complete_async_initial()
+
+        if not is_iterable(result):
+            return super().complete_list_value(
+                return_type, field_nodes, info, path, result
+            )
+        items = iter(result)
+        # One item past initialCount tells whether there is anything to stream
+        initial = list(islice(items, initial_count + 1))
+        if len(initial) > initial_count:
+            stream_rest(chain([initial.pop()], items))
+        return complete_initial(return_type, field_nodes, info, path, initial)
+
+    def complete_scalar_list(
+        self,
+        return_type: GraphQLList,
+        field_nodes: List[FieldNode],
+        info,
+        path: Path,
+        result: Union[list, tuple],
+    ) -> AwaitableOrValue[List[Any]]:
+        """
+        Complete a list of built-in scalars or enum values in one loop, or
+        return it as it is when its items are already serialized
+        """
+        item_type = return_type.of_type
+        serialize = cast(GraphQLLeafType, get_nullable_type(item_type)).serialize
+        if already_serialized(result, serialize):
+            return result if isinstance(result, list) else list(result)
+
+        nullable = not is_non_null_type(item_type)
+        completed: List[Any] = []
+        append = completed.append
+        errors: List[Tuple[GraphQLError, Path]] = []
+        for index, item in enumerate(result):
+            if item is None and nullable:
+                append(None)
+                continue
+            try:
+                if item is None:
+                    raise TypeError(
+                        "Cannot return null for non-nullable field"
+                        f" {info.parent_type.name}.{info.field_name}."
+                    )
+                serialized = serialize(item)
+                if serialized is None or serialized is Undefined:
+                    raise TypeError(
+                        f"Expected `{inspect(get_nullable_type(item_type))}"
+                        f".serialize({inspect(item)})` to return non-nullable"
+                        f" value, returned: {inspect(serialized)}"
+                    )
+            except Exception as raw_error:
+                if self.is_awaitable(item):
+                    # Items resolved asynchronously go the usual way
+                    return super().complete_list_value(
+                        return_type, field_nodes, info, path, result
+                    )
+                item_path = path.add_key(index, None)
+                error = located_error(raw_error, field_nodes, item_path.as_list())
+                if not nullable:
+                    raise error
+                errors.append((error, item_path))
+                serialized = None
+            append(serialized)
+
+        for error, item_path in errors:
+            self.collected_errors.add(error, item_path)
+        return completed
+
+    def is_columnar(self, return_type: GraphQLList, field_nodes: List[FieldNode]):
+        """Is the field a list of objects with @columnar?"""
+        object_type = get_nullable_type(return_type.of_type)
+        if not isinstance(object_type, GraphQLObjectType) or object_type.is_type_of:
+            return False
+        columnar = get_directive_values(
+            GraphQLColumnarDirective, field_nodes[0], self.variable_values
+        )
+        return bool(columnar and columnar["if"])
+
+    def complete_columnar(
+        self,
+        return_type: GraphQLList,
+        field_nodes: List[FieldNode],
+        info,
+        path: Path,
+        items: List[Any],
+    ) -> AwaitableOrValue[Dict[str, List[Any]]]:
+        """
+        Complete a list of objects as columns, one list of values per field,
+        without building an object per item
+
+        A null item, or one nulled by an error, is null in every column.
+        @defer is ignored inside columns.
+        """
+        item_type = return_type.of_type
+        object_type = cast(GraphQLObjectType, get_nullable_type(item_type))
+        fields: Dict[str, List[FieldNode]] = self.collect_subfields(
+            object_type, field_nodes
+        )
+        if isinstance(fields, CollectedFields) and fields.deferred:
+            fields = dict(fields)
+            for fragment in fields.deferred:
+                for name, nodes in fragment.fields.items():
+                    fields[name] = [*fields.get(name, ()), *nodes]
+
+        null_rows: Set[int] = set()
+
+        def null_row(index: int, error: GraphQLError) -> None:
+            # Raises when the items are non-null, nulling the whole list
+            self.handle_field_error(error, item_type, path.add_key(index, None))
+            null_rows.add(index)
+
+        for index, item in enumerate(items):
+            if item is None:
+                if is_non_null_type(item_type):
+                    error = TypeError(
+                        "Cannot return null for non-nullable field"
+                        f" {info.parent_type.name}.{info.field_name}."
+                    )
+                    item_path = path.add_key(index, None).as_list()
+                    null_row(index, located_error(error, field_nodes, item_path))
+                null_rows.add(index)
+            else:
+                self.tag_entity(object_type, item)
+
+        columns: Dict[str, List[Any]] = {}
+        pending: List[Tuple[List[Any], int, Awaitable]] = []
+        for name, nodes in fields.items():
+            column: List[Any] = []
+            for index, item in enumerate(items):
+                value = None
+                if index not in null_rows:
+                    field_path = path.add_key(index, None).add_key(
+                        name, object_type.name
+                    )
+                    try:
+                        value = self.execute_field(object_type, item, nodes, field_path)
+                    except GraphQLError as error:
+                        null_row(index, error)
+                        value = None
+                    if self.is_awaitable(value):
+                        pending.append((column, index, value))
+                column.append(value)
+            columns[name] = column
+
+        def null_rows_out() -> Dict[str, List[Any]]:
+            for column in columns.values():
+                for index in null_rows:
+                    column[index] = None
+            return columns
+
+        if not pending:
+            return null_rows_out()
+
+        async def await_columns() -> Dict[str, List[Any]]:
+            values = await asyncio.gather(
+                *(value for _, _, value in pending), return_exceptions=True
+            )
+            for (column, index, _), value in zip(pending, values):
+                if isinstance(value, GraphQLError):
+                    null_row(index, value)
+                    value = None
+                elif isinstance(value, BaseException):
+                    raise value
+                column[index] = value
+            return null_rows_out()
+
+        return await_columns()
+
+    def get_stream_arguments(
+        self, field_nodes: List[FieldNode]
+    ) -> Optional[Dict[str, Any]]:
+        """The arguments of the field's @stream, if its items are to be streamed"""
+        if self.publisher is None:
+            return None
+        stream = get_directive_values(
+            GraphQLStreamDirective, field_nodes[0], self.variable_values
+        )
+        if not stream or not stream["if"]:
+            return None
+        if stream["initialCount"] < 0:
+            raise GraphQLError(
+                "initialCount must be a positive integer", field_nodes[0]
+            )
+        stream.setdefault("label", None)
+        return stream
+
+    async def stream_items(
+        self,
+        items: Union[Iterator, AsyncIterator],
+        index: int,
+        item_type: GraphQLOutputType,
+        field_nodes: List[FieldNode],
+        info,
+        path: Path,
+        label: Optional[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Complete the items of a @stream field one payload at a time"""
+
+        try:
+            while True:
+                item_path = path.add_key(index, None)
+                try:
+                    if isinstance(items, AsyncIterator):
+                        item = await items.__anext__()
+                    else:
+                        item = next(items)
+                except (StopIteration, StopAsyncIteration):
+                    return
+                except Exception as raw_error:
+                    error = located_error(raw_error, field_nodes, path.as_list())
+                    yield make_payload(item_path, label, [error], items=None)
+                    return
+
+                # Errors are delivered with the item they occurred in
+                context = self.fork()
+                try:
+                    completed = context.complete_value(
+                        item_type, field_nodes, info, item_path, item
+                    )
+                    if self.is_awaitable(completed):
+                        completed = await completed
+                    completed = await await_awaitables(completed)
+                except Exception as raw_error:
+                    error = located_error(raw_error, field_nodes, item_path.as_list())
+                    if is_non_null_type(item_type):
+                        errors = [*context.collected_errors.errors, error]
+                        yield make_payload(item_path, label, errors, items=None)
+                        return
+                    context.collected_errors.add(error, item_path)
+                    completed = None
+                yield make_payload(
+                    item_path,
+                    label,
+                    context.collected_errors.errors,
+                    items=[completed],
+                )
+                index += 1
+        finally:
+            close = getattr(items, "aclose", None) or getattr(items, "close", None)
+            if close is not None:
+                closed = close()
+                if self.is_awaitable(closed):
+                    await closed
+
+    def export_columns(
+        self,
+        return_type: GraphQLOutputType,
+        field_nodes: List[FieldNode],
+        prefix: str = "",
+    ) -> List[str]:
+        """The CSV columns of a value of the type, as exported rows flatten it"""
+        named_type = get_named_type(return_type)
+        if is_abstract_type(named_type):
+            runtime_types = self.schema.get_possible_types(named_type)
+        elif is_object_type(named_type):
+            runtime_types = [named_type]
+        else:
+            return [prefix or "value"]
+        columns: Dict[str, None] = {}
+        for runtime_type in runtime_types:
+            subfields = self.collect_subfields(runtime_type, field_nodes)
+            for response_key, subfield_nodes in subfields.items():
+                field_def = get_field_def(self.schema, runtime_type, subfield_nodes[0])
+                name = f"{prefix}.{response_key}" if prefix else response_key
+                if is_list_type(get_nullable_type(field_def.type)):
+                    # Lists are written as JSON
+                    columns[name] = None
+                    continue
+                for column in self.export_columns(field_def.type, subfield_nodes, name):
+                    columns[column] = None
+        return list(columns)
+
+    def build_response(self, data, errors) -> ExecutionResult:
+        result = super().build_response(data, errors)
+        extensions: Dict[str, Any] = {}
+        if self.cache_policy is not None:
+            policy = self.cache_policy
+            if self.unhinted:
+                policy = policy.restrict(CacheHint(max_age=0))
+            extensions["cacheControl"] = policy.formatted
+        if self.truncated:
+            extensions["truncated"] = self.truncated
+        if extensions:
+            result.extensions = extensions
+        return result
+
+
+EncodingExecutionContext = TypedGraphqlExecutionContext.with_options(encoding=True)
+"""Context of execute_json, its options are the same for every execution"""
+
+
+def parse_query(
+    schema: GraphQLSchema, query: str
+) -> Union[DocumentNode, ExecutionResult]:
+    """Parse the query, or return an ExecutionResult with the errors"""
+    schema_errors = validate_schema(schema)
+    if schema_errors:
+        return ExecutionResult(data=None, errors=schema_errors)
+    try:
+        return parse(query)
+    except GraphQLError as error:
+        return ExecutionResult(data=None, errors=[error])
+
+
+def is_query(document: DocumentNode) -> bool:
+    operation = get_operation_ast(document)
+    return operation is not None and operation.operation == OperationType.QUERY
+
+
+def execute_document(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    execution_context_class: Type[
+        TypedGraphqlExecutionContext
+    ] = TypedGraphqlExecutionContext,
+) -> AwaitableOrValue[ExecutionResult]:
+    """Validate and execute the document"""
+    validation_errors = validate(schema, document)
+    if validation_errors:
+        return ExecutionResult(data=None, errors=validation_errors)
+    return _execute(
+        schema,
+        document,
+        root,
+        context_value,
+        variable_values,
+        execution_context_class,
+    )
+
+
+def _execute(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root: Any,
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+    execution_context_class: Type[
+        TypedGraphqlExecutionContext
+    ] = TypedGraphqlExecutionContext,
+) -> AwaitableOrValue[ExecutionResult]:
+    return execute(
+        schema,
+        document,
+        root,
+        context_value,
+        variable_values,
+        middleware=TypedGraphqlMiddlewareManager(),
+        execution_context_class=execution_context_class,
+    )
+
+
+def _build_context(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root: Any,
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+) -> Union[ExecutionResult, TypedGraphqlExecutionContext]:
+    context = TypedGraphqlExecutionContext.build(
+        schema,
+        document,
+        root,
+        context_value,
+        variable_values,
+        middleware=TypedGraphqlMiddlewareManager(),
+    )
+    if isinstance(context, list):
+        return ExecutionResult(data=None, errors=context)
+    return context
+
+
+def get_cached_response(
+    response_cache: Optional[ResponseCache],
+    document: DocumentNode,
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+) -> Tuple[Optional[ExecutionResult], Optional[str]]:
+    """Returns the cached response if there is one, and the key to cache it under"""
+    if response_cache is None or not is_query(document):
+        return None, None
+    cache_key = response_cache.make_key(document, variable_values, context_value)
+    # Only successful responses are cached so the query is known to be valid
+    return response_cache.get(cache_key), cache_key
+
+
+async def _execute_async(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root: Any,
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+    response_cache: Optional[ResponseCache],
+    cache_key: Optional[str],
+) -> ExecutionResult:
+    if response_cache is None or cache_key is None:
+        result = execute_document(
+            schema, document, root, context_value, variable_values
+        )
+    else:
+        entity_tags: Set[str] = set()
+        result = execute_document(
+            schema,
+            document,
+            root,
+            context_value,
+            variable_values,
+            TypedGraphqlExecutionContext.with_options(entity_tags=entity_tags),
+        )
+    if is_awaitable(result):
+        result = await result
+    result = cast(ExecutionResult, result)
+    result.data = await await_awaitables(result.data)
+
+    if response_cache is not None and cache_key is not None:
+        response_cache.set(cache_key, result, entity_tags)
+    return result
+
+
 async def execute_async(
     schema: GraphQLSchema,
     query: str,
     root: Any = None,
     context_value: Optional[Dict[str, Any]] = None,
     variable_values: Optional[Dict[str, Any]] = None,
+    response_cache: Optional[ResponseCache] = None,
+    single_flight: Optional[SingleFlight] = None,
+):
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return document
+
+    cached, cache_key = get_cached_response(
+        response_cache, document, context_value, variable_values
+    )
+    if cached is not None:
+        return cached
+
+    def execute() -> Awaitable[ExecutionResult]:
+        return _execute_async(
+            schema,
+            document,
+            root,
+            context_value,
+            variable_values,
+            response_cache,
+            cache_key,
+        )
+
+    if single_flight is not None and is_query(document):
+        key = single_flight.make_key(document, variable_values, context_value)
+        return await single_flight.run(key, execute)
+    return await execute()
+
+
+def execute_sync(
+    schema: GraphQLSchema,
+    query: str,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    response_cache: Optional[ResponseCache] = None,
 ):
-    result = await graphql(
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return document
+
+    cached, cache_key = get_cached_response(
+        response_cache, document, context_value, variable_values
+    )
+    if cached is not None:
+        return cached
+
+    if response_cache is None or cache_key is None:
+        result = execute_document(
+            schema, document, root, context_value, variable_values
+        )
+    else:
+        entity_tags: Set[str] = set()
+        result = execute_document(
+            schema,
+            document,
+            root,
+            context_value,
+            variable_values,
+            TypedGraphqlExecutionContext.with_options(entity_tags=entity_tags),
+        )
+    if is_awaitable(result):
+        cast(Coroutine, result).close()
+        raise RuntimeError("GraphQL execution failed to complete synchronously.")
+    result = cast(ExecutionResult, result)
+
+    if response_cache is not None and cache_key is not None:
+        response_cache.set(cache_key, result, entity_tags)
+    return result
+
+
+async def _live_results(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    root: Any,
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+    debounce: float,
+    max_delay: float,
+) -> AsyncIterator[ExecutionResult]:
+    loop = asyncio.get_running_loop()
+    invalidated: Set[str] = set()
+    changed = asyncio.Event()
+
+    def record(tag: str) -> None:
+        invalidated.add(tag)
+        changed.set()
+
+    def listener(tag: str) -> None:
+        # Invalidations may come from other threads
+        try:
+            loop.call_soon_threadsafe(record, tag)
+        except RuntimeError:
+            remove_invalidation_listener(listener)
+
+    add_invalidation_listener(listener)
+    try:
+        while True:
+            invalidated.clear()
+            touched: Set[str] = set()
+            result = _execute(
+                schema,
+                document,
+                root,
+                context_value,
+                variable_values,
+                TypedGraphqlExecutionContext.with_options(entity_tags=touched),
+            )
+            if is_awaitable(result):
+                result = await result
+            result = cast(ExecutionResult, result)
+            result.data = await await_awaitables(result.data)
+            yield result
+
+            while not touched & invalidated:
+                invalidated.clear()
+                changed.clear()
+                await changed.wait()
+
+            # Coalesce a burst of invalidations into one execution, run once
+            # they stop for debounce seconds or after max_delay
+            deadline = loop.time() + max_delay
+            while True:
+                changed.clear()
+                timeout = min(debounce, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+    finally:
+        remove_invalidation_listener(listener)
+
+
+async def live_query(
+    schema: GraphQLSchema,
+    query: str,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    debounce: float = 0.05,
+    max_delay: float = 1.0,
+) -> Union[AsyncIterator[ExecutionResult], ExecutionResult]:
+    """
+    Execute a query, and execute it again whenever what it touched is invalidated
+
+    Returns an async iterator with the result of each execution, or an
+    ExecutionResult with the errors when the query is invalid. The types and
+    entities of the objects in a result are recorded, and an invalidate() of
+    any of them executes the query again. Invalidations are coalesced until
+    none arrive for debounce seconds, waiting at most max_delay seconds.
+    """
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return document
+
+    validation_errors = validate(schema, document)
+    if validation_errors:
+        return ExecutionResult(data=None, errors=validation_errors)
+    if not is_query(document):
+        return ExecutionResult(
+            data=None, errors=[GraphQLError("Only queries can be live queries.")]
+        )
+
+    return _live_results(
         schema,
-        query,
+        document,
         root,
-        context_value=context_value,
-        variable_values=variable_values,
-        middleware=TypedGraphqlMiddlewareManager(),
+        context_value,
+        variable_values,
+        debounce,
+        max_delay,
+    )
+
+
+def get_export_field(
+    schema: GraphQLSchema, document: DocumentNode
+) -> Optional[GraphQLError]:
+    """An error unless the query selects a single list field"""
+    operation = get_operation_ast(document)
+    root_type = schema.query_type
+    if operation is None or operation.operation != OperationType.QUERY:
+        return GraphQLError("Only queries can be exported.")
+    fields = [
+        selection
+        for selection in operation.selection_set.selections
+        if isinstance(selection, FieldNode)
+    ]
+    if len(fields) == len(operation.selection_set.selections) == 1:
+        field = root_type.fields.get(fields[0].name.value) if root_type else None
+        if field is not None and is_list_type(get_nullable_type(field.type)):
+            return None
+    return GraphQLError("Exports need a query selecting a single list field.")
+
+
+async def export_async(
+    schema: GraphQLSchema,
+    query: str,
+    out: Any,
+    format: str = "ndjson",
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+) -> ExportResult:
+    """
+    Export the items of a query's single top-level list field as NDJSON or CSV
+
+    Items are read lazily from the field's iterator, and each is completed and
+    written to out before the next is read, so memory use does not grow with
+    the number of items. out is a file-like object, an async writer with a
+    write coroutine or an asyncio StreamWriter. Binary files and StreamWriters
+    are written UTF-8.
+    """
+    encoder = RowEncoder(format)
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return ExportResult(errors=document.errors)
+
+    validation_errors = validate(schema, document)
+    if validation_errors:
+        return ExportResult(errors=validation_errors)
+    error = get_export_field(schema, document)
+    if error is not None:
+        return ExportResult(errors=[error])
+
+    exported: List[Tuple[Any, ...]] = []
+    result = _execute(
+        schema,
+        document,
+        root,
+        context_value,
+        variable_values,
+        TypedGraphqlExecutionContext.with_options(exported=exported),
     )
+    if is_awaitable(result):
+        result = await result
+    errors = list(cast(ExecutionResult, result).errors or ())
+    if not exported:
+        return ExportResult(errors=errors or None)
+
+    context, items, item_type, field_nodes, info, path = exported[0]
+    if encoder.format == "csv":
+        encoder.columns = context.export_columns(item_type, field_nodes)
+    if not is_iterable(items) and isinstance(items, AsyncIterable):
+        items = items.__aiter__()
+    else:
+        items = iter(items)
+
+    binary = is_binary(out)
+    rows = 0
+    payloads = context.stream_items(items, 0, item_type, field_nodes, info, path, None)
+    try:
+        async for payload in payloads:
+            errors.extend(payload["errors"])
+            if payload["items"] is None:
+                break
+            await write(out, encoder.encode(payload["items"][0]), binary)
+            rows += 1
+    finally:
+        await payloads.aclose()
+    return ExportResult(rows, errors or None)
+
+
+async def execute_json(
+    schema: GraphQLSchema,
+    query: str,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    out: Any = None,
+    chunk_size: int = 65536,
+) -> Optional[bytes]:
+    """
+    Execute a query into the UTF-8 JSON of its response, ie. for an HTTP body
+
+    Lists are encoded to JSON bytes as soon as they complete, in one pass of
+    the C JSON encoder, so the result tree of a large response is never built
+    whole or walked a second time.
+
+    out: a bytearray to append the response to, or a file-like object, async
+        writer or asyncio StreamWriter to write it to in chunks of chunk_size.
+        None is returned when out is given.
+    """
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        result = document
+    else:
+        executed = execute_document(
+            schema,
+            document,
+            root,
+            context_value,
+            variable_values,
+            execution_context_class=EncodingExecutionContext,
+        )
+        if is_awaitable(executed):
+            executed = await executed
+        result = cast(ExecutionResult, executed)
+        result.data = await await_awaitables(result.data)
+
+    if out is None:
+        return bytes(encode_result(result))
+    if isinstance(out, bytearray):
+        encode_result(result, out)
+        return None
+    view = memoryview(encode_result(result))
+    for start in range(0, len(view), chunk_size):
+        await write(out, view[start : start + chunk_size], binary=True)
+    return None
+
+
+async def execute_incremental(
+    schema: GraphQLSchema,
+    query: str,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+) -> Union[ExecutionResult, AsyncIterator[IncrementalResult]]:
+    """
+    Execute a query, delivering the items of @stream fields incrementally
+
+    Returns an async iterator of IncrementalResult, the first of which has the
+    initial result, or an ExecutionResult if nothing is delivered incrementally.
+    The schema needs the GraphQLStreamDirective in its directives.
+    """
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return document
+
+    publisher = IncrementalPublisher()
+    result = execute_document(
+        schema,
+        document,
+        root,
+        context_value,
+        variable_values,
+        TypedGraphqlExecutionContext.with_options(publisher=publisher),
+    )
+    if is_awaitable(result):
+        result = await result
+    result = cast(ExecutionResult, result)
     result.data = await await_awaitables(result.data)
-    return result
+
+    if result.data is None:
+        # Nulled by an error, so nothing is left to deliver payloads to
+        await publisher.close()
+        return result
+    if not publisher.pending:
+        return result
+    return publisher.results(result)
+
+
+async def _map_source_to_response(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    events: Union[BufferedSource, Subscriber],
+    context_value: Optional[Dict[str, Any]],
+    variable_values: Optional[Dict[str, Any]],
+    diff: bool = False,
+) -> AsyncIterator[Union[ExecutionResult, PatchResult]]:
+    last: Optional[Dict[str, Any]] = None
+    try:
+        while True:
+            event = await events.get()
+            if event is END_OF_STREAM:
+                return
+            if isinstance(event, StreamError):
+                raise event.error
+
+            result = _execute(schema, document, event, context_value, variable_values)
+            if is_awaitable(result):
+                result = await result
+            result = cast(ExecutionResult, result)
+            result.data = await await_awaitables(result.data)
+
+            if diff:
+                if last is not None and not result.errors:
+                    patch = json_patch(last, result.data)
+                    last = result.data
+                    if patch:
+                        yield PatchResult(patch, result.extensions)
+                    continue
+                # Results with errors are sent whole and patched against no more
+                last = None if result.errors else result.data
+            yield result
+    finally:
+        # The subscriber is done, whether the stream ended or it went away
+        await events.close()
+
+
+async def subscribe_async(
+    schema: GraphQLSchema,
+    query: str,
+    root: Any = None,
+    context_value: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    max_queue_size: int = 100,
+    fan_out: Optional[FanOut] = None,
+    diff: bool = False,
+) -> Union[AsyncIterator[Union[ExecutionResult, PatchResult]], ExecutionResult]:
+    """
+    Subscribe to a subscription operation
+
+    Returns an async iterator with the result for each event of the source
+    stream, or an ExecutionResult with the errors when the subscription can not
+    be started. Up to max_queue_size events are buffered for a subscriber, after
+    which the source stream is not read until the subscriber catches up.
+    Closing the iterator closes the source stream.
+
+    With fan_out, subscriptions to the same root field and arguments, in the same
+    partition of the FanOut, share one source stream, buffered as configured on
+    the FanOut.
+
+    With diff, only the first result is sent whole. After it a PatchResult with
+    the JSON patch against the subscriber's previous result is sent, or nothing
+    if the result did not change.
+    """
+    document = parse_query(schema, query)
+    if isinstance(document, ExecutionResult):
+        return document
+
+    validation_errors = validate(schema, document)
+    if validation_errors:
+        return ExecutionResult(data=None, errors=validation_errors)
+
+    def start() -> Awaitable[Union[AsyncIterator[Any], ExecutionResult]]:
+        return create_source_event_stream(
+            schema, document, root, context_value, variable_values
+        )
+
+    events: Union[BufferedSource, Subscriber, ExecutionResult]
+    key = None
+    if fan_out is not None:
+        context = _build_context(schema, document, root, context_value, variable_values)
+        if isinstance(context, ExecutionResult):
+            return context
+        key = fan_out.make_key(context)
+
+    if fan_out is not None and key is not None:
+        events = await fan_out.subscribe(key, start)
+    else:
+        source = await start()
+        if isinstance(source, ExecutionResult):
+            return source
+        events = BufferedSource(source, max_queue_size)
+    if isinstance(events, ExecutionResult):
+        return events
+
+    return _map_source_to_response(
+        schema, document, events, context_value, variable_values, diff
+    )
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+from graphql import GraphQLError
+from graphql.pyutils import is_awaitable
+
+from typed_graphql.encode import json_default
+
+FORMATS = ("ndjson", "csv")
+
+
+class ExportResult:
+    """
+    The outcome of an export
+
+    rows: number of rows written
+    errors: errors of the query, or of the items that were exported as null
+    """
+
+    def __init__(self, rows: int = 0, errors: Optional[List[GraphQLError]] = None):
+        self.rows = rows
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"ExportResult(rows={self.rows!r}, errors={self.errors!r})"
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    """Nested objects as dotted column names, lists as JSON"""
+    if not isinstance(value, dict):
+        return {prefix or "value": value}
+    columns: Dict[str, Any] = {}
+    for key, item in value.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(item, dict):
+            columns.update(flatten(item, name))
+        elif isinstance(item, list):
+            columns[name] = json.dumps(
+                item, separators=(",", ":"), default=json_default
+            )
+        else:
+            columns[name] = item
+    return columns
+
+
+class RowEncoder:
+    """
+    Encodes exported items one row at a time
+
+    CSV columns are those set in columns, or else those of the first row. The
+    first row is preceded by the header.
+    """
+
+    def __init__(self, format: str):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        self.format = format
+        self.columns: Optional[List[str]] = None
+        self._header_written = False
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+
+    def encode(self, item: Any) -> str:
+        if self.format == "ndjson":
+            return json.dumps(item, separators=(",", ":"), default=json_default) + "\n"
+
+        row = flatten(item)
+        if not self._header_written:
+            if self.columns is None:
+                self.columns = list(row)
+            self._writer.writerow(self.columns)
+            self._header_written = True
+        self._writer.writerow(row.get(column) for column in self.columns)
+        encoded = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return encoded
+
+
+def is_binary(out: Any) -> bool:
+    return hasattr(out, "drain") or isinstance(out, (io.BufferedIOBase, io.RawIOBase))
+
+
+async def write(out: Any, chunk: Union[str, bytes, memoryview], binary: bool) -> None:
+    """Write to a file-like object, an async writer or an asyncio StreamWriter"""
+    if binary and isinstance(chunk, str):
+        chunk = chunk.encode()
+    written = out.write(chunk)
+    if is_awaitable(written):
+        await written
+    drain = getattr(out, "drain", None)
+    if drain is not None:
+        await drain()
@@ -0,0 +1,338 @@
+import asyncio
+import json
+from typing import Any
+from typing import AsyncIterator
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Union
+
+from graphql import DirectiveLocation
+from graphql import GraphQLArgument
+from graphql import GraphQLBoolean
+from graphql import GraphQLDirective
+from graphql import GraphQLError
+from graphql import GraphQLInt
+from graphql import GraphQLNonNull
+from graphql import GraphQLString
+from graphql.execution import ExecutionResult
+from graphql.execution.collect_fields import does_fragment_condition_match
+from graphql.execution.collect_fields import get_field_entry_key
+from graphql.execution.collect_fields import should_include_node
+from graphql.execution.values import get_directive_values
+from graphql.language import FieldNode
+from graphql.language import FragmentDefinitionNode
+from graphql.language import FragmentSpreadNode
+from graphql.language import InlineFragmentNode
+from graphql.language import SelectionSetNode
+from graphql.pyutils import Path
+from graphql.type import GraphQLObjectType
+from graphql.type import GraphQLSchema
+
+from typed_graphql.encode import json_default
+
+GraphQLStreamDirective = GraphQLDirective(
+    name="stream",
+    locations=[DirectiveLocation.FIELD],
+    args={
+        "if": GraphQLArgument(
+            GraphQLNonNull(GraphQLBoolean),
+            default_value=True,
+            description="Stream when true or undefined.",
+        ),
+        "label": GraphQLArgument(
+            GraphQLString, description="Identifies the streamed payloads."
+        ),
+        "initialCount": GraphQLArgument(
+            GraphQLNonNull(GraphQLInt),
+            default_value=0,
+            description="Number of items to return in the initial result.",
+        ),
+    },
+    description="Delivers the items of a list field after the initial result.",
+)
+
+GraphQLDeferDirective = GraphQLDirective(
+    name="defer",
+    locations=[DirectiveLocation.FRAGMENT_SPREAD, DirectiveLocation.INLINE_FRAGMENT],
+    args={
+        "if": GraphQLArgument(
+            GraphQLNonNull(GraphQLBoolean),
+            default_value=True,
+            description="Deferred when true or undefined.",
+        ),
+        "label": GraphQLArgument(
+            GraphQLString, description="Identifies the deferred payload."
+        ),
+    },
+    description="Delivers the fields of a fragment after the initial result.",
+)
+
+MULTIPART_CONTENT_TYPE = 'multipart/mixed; boundary="-"; deferSpec=20220824'
+"""Content type of the response body produced by multipart_mixed"""
+
+
+class IncrementalResult:
+    """
+    A result of an incrementally delivered response
+
+    The first has the data of the initial result. The ones after it have the
+    payloads delivered since in incremental, each with the path it belongs at.
+    has_next tells if more results will follow.
+    """
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        errors: Optional[List[GraphQLError]] = None,
+        incremental: Optional[List[Dict[str, Any]]] = None,
+        has_next: bool = False,
+        extensions: Optional[Dict[str, Any]] = None,
+    ):
+        self.data = data
+        self.errors = errors
+        self.incremental = incremental
+        self.has_next = has_next
+        self.extensions = extensions
+
+    def __repr__(self) -> str:
+        return (
+            f"IncrementalResult(data={self.data!r}, errors={self.errors!r},"
+            f" incremental={self.incremental!r}, has_next={self.has_next!r})"
+        )
+
+    @property
+    def formatted(self) -> Dict[str, Any]:
+        formatted: Dict[str, Any] = {}
+        if self.incremental is None:
+            formatted["data"] = self.data
+        elif self.incremental:
+            formatted["incremental"] = [
+                format_payload(payload) for payload in self.incremental
+            ]
+        if self.errors:
+            formatted["errors"] = [error.formatted for error in self.errors]
+        if self.extensions is not None:
+            formatted["extensions"] = self.extensions
+        formatted["hasNext"] = self.has_next
+        return formatted
+
+
+def make_payload(
+    path: Optional[Path],
+    label: Optional[str],
+    errors: List[GraphQLError],
+    **value: Any,
+) -> Dict[str, Any]:
+    """A payload with the items or data delivered at path"""
+    payload = {**value, "path": path.as_list() if path else []}
+    if label is not None:
+        payload["label"] = label
+    payload["errors"] = errors
+    return payload
+
+
+def format_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    if not payload.get("errors"):
+        return {k: v for k, v in payload.items() if k != "errors"}
+    return {
+        **payload,
+        "errors": [error.formatted for error in payload["errors"]],
+    }
+
+
+_DONE = object()
+
+
+class IncrementalPublisher:
+    """
+    Delivers the payloads produced after the initial result
+
+    Each source added is read in a task of its own, so a slow source does not
+    hold up the others. Payloads that are ready together are delivered in one
+    IncrementalResult. Payloads at or below a path that was nulled by an error
+    are dropped, there is nothing left to deliver them to.
+    """
+
+    def __init__(self):
+        self.pending = 0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.tasks: Set[asyncio.Future] = set()
+        self.nulled: List[List[Union[str, int]]] = []
+
+    def is_nulled(self, payload: Dict[str, Any]) -> bool:
+        path = payload["path"]
+        return any(path[: len(nulled)] == nulled for nulled in self.nulled)
+
+    def add(self, payloads: AsyncIterator[Dict[str, Any]]) -> None:
+        self.pending += 1
+        task = asyncio.ensure_future(self._publish(payloads))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _publish(self, payloads: AsyncIterator[Dict[str, Any]]) -> None:
+        try:
+            async for payload in payloads:
+                self.queue.put_nowait(payload)
+        finally:
+            self.queue.put_nowait(_DONE)
+
+    async def results(
+        self, initial: ExecutionResult
+    ) -> AsyncIterator[IncrementalResult]:
+        try:
+            yield IncrementalResult(
+                initial.data,
+                initial.errors,
+                has_next=self.pending > 0,
+                extensions=initial.extensions,
+            )
+            while self.pending:
+                incremental = []
+                payload = await self.queue.get()
+                while True:
+                    if payload is _DONE:
+                        self.pending -= 1
+                    elif not self.is_nulled(payload):
+                        incremental.append(payload)
+                    if self.queue.empty():
+                        break
+                    payload = self.queue.get_nowait()
+                if incremental or not self.pending:
+                    yield IncrementalResult(
+                        incremental=incremental, has_next=self.pending > 0
+                    )
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop producing payloads, closing the sources"""
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def multipart_mixed(
+    results: AsyncIterator[IncrementalResult],
+) -> AsyncIterator[bytes]:
+    """
+    Encode incremental results as the parts of a multipart/mixed response body
+
+    Send it with MULTIPART_CONTENT_TYPE as the Content-Type.
+    """
+    async for result in results:
+        body = json.dumps(result.formatted, separators=(",", ":"), default=json_default)
+        yield (
+            "\r\n---\r\nContent-Type: application/json; charset=utf-8\r\n\r\n" + body
+        ).encode()
+    yield b"\r\n-----\r\n"
+
+
+class DeferredFragment:
+    """The fields of a fragment that are delivered after the initial result"""
+
+    def __init__(self, label: Optional[str]):
+        self.label = label
+        self.fields: Dict[str, List[FieldNode]] = {}
+
+
+class CollectedFields(Dict[str, List[FieldNode]]):
+    """Fields collected for execution, with the fragments that are deferred"""
+
+    def __init__(self):
+        super().__init__()
+        self.deferred: List[DeferredFragment] = []
+
+
+def get_defer_arguments(
+    variable_values: Dict[str, Any],
+    node: Union[FragmentSpreadNode, InlineFragmentNode],
+) -> Optional[Dict[str, Any]]:
+    """The arguments of the fragment's @defer, if it is to be deferred"""
+    defer = get_directive_values(GraphQLDeferDirective, node, variable_values)
+    if not defer or not defer["if"]:
+        return None
+    return defer
+
+
+def collect_fields_with_defer(
+    schema: GraphQLSchema,
+    fragments: Dict[str, FragmentDefinitionNode],
+    variable_values: Dict[str, Any],
+    runtime_type: GraphQLObjectType,
+    selection_sets: List[SelectionSetNode],
+) -> CollectedFields:
+    """
+    Collect the fields of the selection sets like graphql-core, setting aside
+    the fields of deferred fragments
+    """
+    fields = CollectedFields()
+    visited_fragment_names: Set[str] = set()
+    for selection_set in selection_sets:
+        _collect_fields(
+            schema,
+            fragments,
+            variable_values,
+            runtime_type,
+            selection_set,
+            fields,
+            fields.deferred,
+            visited_fragment_names,
+        )
+    return fields
+
+
+def _collect_fields(
+    schema: GraphQLSchema,
+    fragments: Dict[str, FragmentDefinitionNode],
+    variable_values: Dict[str, Any],
+    runtime_type: GraphQLObjectType,
+    selection_set: SelectionSetNode,
+    fields: Dict[str, List[FieldNode]],
+    deferred: List[DeferredFragment],
+    visited_fragment_names: Set[str],
+) -> None:
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if not should_include_node(variable_values, selection):
+                continue
+            name = get_field_entry_key(selection)
+            fields.setdefault(name, []).append(selection)
+            continue
+
+        if isinstance(selection, InlineFragmentNode):
+            fragment: Any = selection
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment_name = selection.name.value
+            if fragment_name in visited_fragment_names:
+                continue
+            fragment = fragments.get(fragment_name)
+            if fragment is None:
+                continue
+        else:
+            continue
+        if not should_include_node(
+            variable_values, selection
+        ) or not does_fragment_condition_match(schema, fragment, runtime_type):
+            continue
+        if isinstance(selection, FragmentSpreadNode):
+            visited_fragment_names.add(fragment_name)
+
+        target = fields
+        defer = get_defer_arguments(variable_values, selection)
+        if defer is not None:
+            deferred_fragment = DeferredFragment(defer.get("label"))
+            deferred.append(deferred_fragment)
+            target = deferred_fragment.fields
+        _collect_fields(
+            schema,
+            fragments,
+            variable_values,
+            runtime_type,
+            fragment.selection_set,
+            target,
+            deferred,
+            visited_fragment_names,
+        )
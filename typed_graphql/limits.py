@@ -0,0 +1,99 @@
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+from graphql import GraphQLError
+
+from .arrays import is_array
+
+
+class MaxItems:
+    """
+    Caps the number of items of a list field
+
+    Use on a field's type: Annotated[List[Country], MaxItems(1000)], or for
+    every list field as the schema's "max_items" extension:
+    GraphQLSchema(query=..., extensions={"max_items": MaxItems(1000)}).
+
+    truncate: return the first items instead of an error, listing the path of
+        the list in the result's "truncated" extension
+
+    Iterators and async iterators are not read past the item after the cap.
+    """
+
+    def __init__(self, items: int, truncate: bool = False):
+        if items < 0:
+            raise ValueError("items must be a positive integer")
+        self.items = items
+        self.truncate = truncate
+
+    def __repr__(self) -> str:
+        return f"MaxItems({self.items}, truncate={self.truncate})"
+
+    def error(self) -> GraphQLError:
+        return GraphQLError(f"List exceeds the maximum of {self.items} items.")
+
+
+def as_max_items(limit: Union[None, int, MaxItems]) -> Optional[MaxItems]:
+    if limit is None or isinstance(limit, MaxItems):
+        return limit
+    return MaxItems(limit)
+
+
+def _capped(items: Iterator, limit: MaxItems, truncated: Callable[[], None]):
+    try:
+        for index, item in enumerate(items):
+            if index == limit.items:
+                if not limit.truncate:
+                    raise limit.error()
+                truncated()
+                return
+            yield item
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+
+
+async def _async_capped(
+    items: AsyncIterator, limit: MaxItems, truncated: Callable[[], None]
+):
+    try:
+        index = 0
+        async for item in items:
+            if index == limit.items:
+                if not limit.truncate:
+                    raise limit.error()
+                truncated()
+                return
+            yield item
+            index += 1
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+def cap_items(result: Any, limit: MaxItems, truncated: Callable[[], None]) -> Any:
+    """
+    The items of a list field's result up to the limit
+
+    Calls truncated when items are left out of the result.
+    """
+    if isinstance(result, (list, tuple)) or is_array(result):
+        if len(result) <= limit.items:
+            return result
+        if not limit.truncate:
+            raise limit.error()
+        truncated()
+        return result[: limit.items]
+    if isinstance(result, Iterable) and not isinstance(result, (str, bytes, dict)):
+        return _capped(iter(result), limit, truncated)
+    if isinstance(result, AsyncIterable):
+        return _async_capped(result.__aiter__(), limit, truncated)
+    return result
@@ -1,10 +1,30 @@
+import re
+from base64 import b64decode
+from binascii import b2a_base64
+from math import isfinite
 from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import NewType
+from typing import Optional
+from typing import Sequence
 from datetime import date
 from datetime import datetime
 from datetime import timezone
+from decimal import Decimal
+from decimal import InvalidOperation
 
 from graphql.error import GraphQLError
+from graphql.language import FloatValueNode
+from graphql.language import IntValueNode
+from graphql.language import StringValueNode
+from graphql.language import ValueNode
+from graphql.language import print_ast
+from graphql.type import GraphQLEnumType
+from graphql.type import GraphQLList
 from graphql.type import GraphQLScalarType
+from graphql.type import GraphQLType
+from graphql.type import get_nullable_type
 from graphql.type import scalars
 
 
@@ -12,7 +32,10 @@ def newtype_to_scalar(t) -> GraphQLScalarType:
     if hasattr(t, "_graphql_type"):
         return t._graphql_type
 
-    if t.__supertype__ is int:
+    if hasattr(t.__supertype__, "_graphql_type"):
+        # ie. NewType("UserId", Long) is a Long
+        scalar = t.__supertype__._graphql_type
+    elif t.__supertype__ is int:
         scalar = GraphQLScalarType(
             name=t.__name__,
             # description=
@@ -48,16 +71,153 @@ def newtype_to_scalar(t) -> GraphQLScalarType:
     return scalar
 
 
+TIMEZONE_POLICIES = ("utc", "convert", "assume_utc", "preserve")
+"""
+How the DateTime scalar treats timezones
+
+utc: datetimes must be in UTC, and are serialized with a Z suffix
+convert: aware datetimes are converted to UTC, naive ones are errors
+assume_utc: naive datetimes are taken to be in UTC, aware ones are converted
+preserve: aware datetimes are serialized with their own offset, naive ones are
+    errors
+"""
+
+
+def _utc_isoformat(value: datetime) -> str:
+    # isoformat() ends in +00:00, swapped for the Z of the utc format
+    return value.isoformat(timespec="microseconds")[:-6] + "Z"
+
+
+def _check_datetime(value: Any) -> datetime:
+    if not isinstance(value, datetime):
+        raise GraphQLError("Value is not a datetime instance")
+    return value
+
+
 def serialize_datetime(value: Any) -> str:
+    # Inlined as it is called for every DateTime of a result
     if not isinstance(value, datetime):
         raise GraphQLError("Value is not a datetime instance")
-    if value.tzinfo != timezone.utc:
+    if value.tzinfo is not timezone.utc and value.tzinfo != timezone.utc:
         raise GraphQLError("Datetime must UTC")
-    return str(value.strftime("%Y-%m-%dT%H:%M:%S.%fZ"))
+    return value.isoformat(timespec="microseconds")[:-6] + "Z"
+
+
+def serialize_datetime_converted(value: Any) -> str:
+    value = _check_datetime(value)
+    if value.tzinfo is None:
+        raise GraphQLError("Datetime must be timezone aware")
+    if value.tzinfo is not timezone.utc:
+        value = value.astimezone(timezone.utc)
+    return _utc_isoformat(value)
+
+
+def serialize_datetime_assume_utc(value: Any) -> str:
+    value = _check_datetime(value)
+    if value.tzinfo is None:
+        return value.isoformat(timespec="microseconds") + "Z"
+    if value.tzinfo is not timezone.utc:
+        value = value.astimezone(timezone.utc)
+    return _utc_isoformat(value)
+
+
+def serialize_datetime_preserved(value: Any) -> str:
+    value = _check_datetime(value)
+    if value.tzinfo is None:
+        raise GraphQLError("Datetime must be timezone aware")
+    return value.isoformat(timespec="microseconds")
+
+
+def parse_iso_datetime(value: Any) -> datetime:
+    """
+    Parse an ISO 8601 datetime
+
+    Tolerates a Z suffix, a space in place of the T, and fractions of a
+    second of any length.
+    """
+    if not isinstance(value, str):
+        raise GraphQLError(f"DateTime cannot represent non-string value: {value!r}")
+    text = value.strip()
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    # Python before 3.11 only parses fractions of 3 or 6 digits
+    match = _FRACTION.search(text)
+    if match is not None:
+        fraction = match.group(1)[:6].ljust(6, "0")
+        text = text[: match.start(1)] + fraction + text[match.end(1) :]
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            pass
+    raise GraphQLError(f"Invalid DateTime '{value}'")
+
+
+_FRACTION = re.compile(r"[T ]\d\d:\d\d:\d\d[.,](\d+)")
 
 
 def parse_datetime(value: Any) -> datetime:
-    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    parsed = parse_iso_datetime(value)
+    if parsed.tzinfo is None:
+        raise GraphQLError("Datetime must be timezone aware")
+    return parsed
+
+
+def parse_datetime_utc(value: Any) -> datetime:
+    parsed = parse_iso_datetime(value)
+    if parsed.tzinfo is None:
+        raise GraphQLError("Datetime must be timezone aware")
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_datetime_assume_utc(value: Any) -> datetime:
+    parsed = parse_iso_datetime(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_string_literal(
+    parse_value: Callable[[Any], Any], name: str
+) -> Callable[..., Any]:
+    """parse_literal of a scalar represented as a string"""
+
+    def parse_literal(value_node: ValueNode, _variables: Any = None) -> Any:
+        if not isinstance(value_node, StringValueNode):
+            raise GraphQLError(
+                f"{name} cannot represent non-string value: {print_ast(value_node)}",
+                value_node,
+            )
+        return parse_value(value_node.value)
+
+    return parse_literal
+
+
+_DATETIME_POLICIES = {
+    "utc": (serialize_datetime, parse_datetime_utc),
+    "convert": (serialize_datetime_converted, parse_datetime_utc),
+    "assume_utc": (serialize_datetime_assume_utc, parse_datetime_assume_utc),
+    "preserve": (serialize_datetime_preserved, parse_datetime),
+}
+
+
+def datetime_scalar(timezone_policy: str = "utc") -> GraphQLScalarType:
+    """The DateTime scalar, treating timezones according to timezone_policy"""
+    try:
+        serialize, parse_value = _DATETIME_POLICIES[timezone_policy]
+    except KeyError:
+        raise ValueError(
+            f"timezone_policy must be one of {', '.join(TIMEZONE_POLICIES)}"
+        ) from None
+    return GraphQLScalarType(
+        name="DateTime",
+        serialize=serialize,
+        parse_value=parse_value,
+        parse_literal=parse_string_literal(parse_value, "DateTime"),
+    )
 
 
 def serialize_date(value: Any) -> str:
@@ -68,3 +228,243 @@ def serialize_date(value: Any) -> str:
 
 def parse_date(value: Any) -> date:
     return date.fromisoformat(value)
+
+
+DECIMAL_FORMATS = ("string", "number")
+"""
+How the Decimal scalar is serialized
+
+string: as a string, ie. "10.50", representable exactly by any JSON encoder
+number: as the Decimal itself, for JSON encoders that write Decimals as numbers
+    without a float round trip (ie. simplejson with use_decimal=True). The
+    response cache, exports and execute_json write them as strings
+"""
+
+
+def _to_decimal(value: Any) -> Decimal:
+    if type(value) is Decimal:
+        decimal = value
+    elif isinstance(value, (Decimal, int)) and not isinstance(value, bool):
+        decimal = Decimal(value)
+    elif isinstance(value, float):
+        # The shortest repr, not the float's exact binary expansion
+        decimal = Decimal(repr(value))
+    elif isinstance(value, str):
+        try:
+            decimal = Decimal(value.strip())
+        except InvalidOperation:
+            decimal = None  # type: ignore
+    else:
+        decimal = None  # type: ignore
+    if decimal is None or not decimal.is_finite():
+        raise GraphQLError(f"Decimal cannot represent value: {value!r}")
+    return decimal
+
+
+def serialize_decimal(value: Any) -> str:
+    # Fixed-point, str() would write exponents such as 0E-8 or 1E+20
+    if type(value) is Decimal and value.is_finite():
+        return format(value, "f")
+    return format(_to_decimal(value), "f")
+
+
+def serialize_decimal_number(value: Any) -> Decimal:
+    if type(value) is Decimal and value.is_finite():
+        return value
+    return _to_decimal(value)
+
+
+def parse_decimal(value: Any) -> Decimal:
+    return _to_decimal(value)
+
+
+def parse_decimal_literal(value_node: ValueNode, _variables: Any = None) -> Decimal:
+    # The literal's digits are used as written, so nothing is lost to a float
+    if isinstance(value_node, (StringValueNode, IntValueNode, FloatValueNode)):
+        return _to_decimal(value_node.value)
+    raise GraphQLError(
+        f"Decimal cannot represent value: {print_ast(value_node)}", value_node
+    )
+
+
+def decimal_scalar(format: str = "string") -> GraphQLScalarType:
+    """The Decimal scalar, serialized according to format"""
+    if format not in DECIMAL_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(DECIMAL_FORMATS)}")
+    return GraphQLScalarType(
+        name="Decimal",
+        description="A decimal number, serialized without loss of precision",
+        serialize=serialize_decimal if format == "string" else serialize_decimal_number,
+        parse_value=parse_decimal,
+        parse_literal=parse_decimal_literal,
+    )
+
+
+GraphQLDecimal = decimal_scalar()
+"""
+Decimal scalar serialized as a string
+
+Select it for a field with Annotated[Decimal, GraphQLDecimal], or for every
+Decimal with GraphQLTypeConversionContext(decimal_format="string").
+"""
+
+GraphQLDecimalNumber = decimal_scalar("number")
+"""Decimal scalar serialized as the Decimal itself, for decimal-aware encoders"""
+
+
+LONG_MIN = -(2**63)
+LONG_MAX = 2**63 - 1
+
+
+def _to_int(value: Any, name: str) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        # Clients without 64-bit integers send large ones as strings
+        text = value.strip()
+        if text.lstrip("-").isdigit():
+            try:
+                return int(text)
+            except ValueError:
+                # isdigit passes "--5" and digits like "²" that int rejects
+                pass
+    raise GraphQLError(f"{name} cannot represent non-integer value: {value!r}")
+
+
+def serialize_long(value: Any) -> int:
+    if type(value) is not int:
+        value = _to_int(value, "Long")
+    if LONG_MIN <= value <= LONG_MAX:
+        return value
+    raise GraphQLError(f"Long cannot represent non 64-bit integer value: {value!r}")
+
+
+def parse_long_literal(value_node: ValueNode, _variables: Any = None) -> int:
+    if isinstance(value_node, (IntValueNode, StringValueNode)):
+        return serialize_long(value_node.value)
+    raise GraphQLError(
+        f"Long cannot represent non-integer value: {print_ast(value_node)}",
+        value_node,
+    )
+
+
+def serialize_big_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    return _to_int(value, "BigInt")
+
+
+def parse_big_int_literal(value_node: ValueNode, _variables: Any = None) -> int:
+    if isinstance(value_node, (IntValueNode, StringValueNode)):
+        return _to_int(value_node.value, "BigInt")
+    raise GraphQLError(
+        f"BigInt cannot represent non-integer value: {print_ast(value_node)}",
+        value_node,
+    )
+
+
+GraphQLLong = GraphQLScalarType(
+    name="Long",
+    description="A 64-bit signed integer",
+    serialize=serialize_long,
+    parse_value=serialize_long,
+    parse_literal=parse_long_literal,
+)
+
+GraphQLBigInt = GraphQLScalarType(
+    name="BigInt",
+    description="An integer of any size",
+    serialize=serialize_big_int,
+    parse_value=serialize_big_int,
+    parse_literal=parse_big_int_literal,
+)
+
+Long = NewType("Long", int)
+"""A 64-bit int, ie. def user_ids(data, info) -> List[Long]"""
+Long._graphql_type = GraphQLLong  # type: ignore
+
+BigInt = NewType("BigInt", int)
+"""An int of any size"""
+BigInt._graphql_type = GraphQLBigInt  # type: ignore
+
+
+def serialize_base64(value: Any) -> str:
+    # Encoded straight from the buffer of bytes, bytearray and memoryview
+    if isinstance(value, memoryview) and not value.c_contiguous:
+        value = value.tobytes()
+    try:
+        return b2a_base64(value, newline=False).decode("ascii")
+    except TypeError:
+        raise GraphQLError(
+            f"Base64 cannot represent non-bytes value: {value!r}"
+        ) from None
+
+
+def parse_base64(value: Any) -> bytes:
+    if not isinstance(value, str):
+        raise GraphQLError(f"Base64 cannot represent non-string value: {value!r}")
+    try:
+        return b64decode(value, validate=True)
+    except ValueError:
+        raise GraphQLError(f"Invalid Base64 value '{value}'") from None
+
+
+GraphQLBase64 = GraphQLScalarType(
+    name="Base64",
+    description="Bytes, encoded as base64",
+    serialize=serialize_base64,
+    parse_value=parse_base64,
+    parse_literal=parse_string_literal(parse_base64, "Base64"),
+)
+
+
+INT_MIN = -(2**31)
+INT_MAX = 2**31 - 1
+
+
+def _all_int(items: Sequence[Any], low: int, high: int) -> bool:
+    return set(map(type, items)) <= {int} and (
+        not items or (low <= min(items) and max(items) <= high)
+    )
+
+
+BULK_SERIALIZERS: Dict[Callable[[Any], Any], Optional[Callable[[Any], bool]]] = {
+    scalars.serialize_string: lambda items: set(map(type, items)) <= {str},
+    scalars.serialize_int: lambda items: _all_int(items, INT_MIN, INT_MAX),
+    scalars.serialize_float: lambda items: set(map(type, items)) <= {float}
+    and all(map(isfinite, items)),
+    scalars.serialize_boolean: lambda items: set(map(type, items)) <= {bool},
+    serialize_long: lambda items: _all_int(items, LONG_MIN, LONG_MAX),
+    serialize_big_int: lambda items: set(map(type, items)) <= {int},
+    serialize_datetime: None,
+    serialize_datetime_converted: None,
+    serialize_datetime_assume_utc: None,
+    serialize_datetime_preserved: None,
+    serialize_date: None,
+    serialize_base64: None,
+}
+"""
+Serializers of the scalars whose lists are completed in one loop, with a check
+of whether a list's items are already serialized
+"""
+
+
+def is_bulk_scalar_list(graphql_t: GraphQLType) -> bool:
+    """Is it a list of scalars that can be completed in one loop?"""
+    list_t = get_nullable_type(graphql_t)
+    if not isinstance(list_t, GraphQLList):
+        return False
+    item_t = get_nullable_type(list_t.of_type)
+    if isinstance(item_t, GraphQLEnumType):
+        return True
+    return isinstance(item_t, GraphQLScalarType) and item_t.serialize in (
+        BULK_SERIALIZERS
+    )
+
+
+def already_serialized(items: Sequence[Any], serialize: Callable[[Any], Any]) -> bool:
+    """Are the items what serialize would return for them?"""
+    check = BULK_SERIALIZERS.get(serialize)
+    return check is not None and check(items)
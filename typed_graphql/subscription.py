@@ -0,0 +1,282 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Union
+
+from graphql.execution import ExecutionContext
+from graphql.execution import ExecutionResult
+from graphql.execution.collect_fields import collect_fields
+from graphql.execution.execute import get_field_def
+from graphql.execution.values import get_argument_values
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+
+class SlowSubscriber(Exception):
+    """A subscriber fell too far behind its shared source stream"""
+
+
+class StreamError:
+    """Carries an exception raised by the source stream to the subscriber"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+END_OF_STREAM = object()
+
+
+async def close_source(source: AsyncIterator[Any]) -> None:
+    aclose = getattr(source, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+class BufferedSource:
+    """
+    Reads ahead up to max_size events of a source stream for one subscriber
+
+    Reading stops while the buffer is full, so a slow subscriber slows the
+    source stream.
+    """
+
+    def __init__(self, source: AsyncIterator[Any], max_size: int):
+        self.source = source
+        self.queue: asyncio.Queue = asyncio.Queue(max_size)
+        self._pump: Optional[asyncio.Future] = None
+
+    async def _read(self) -> None:
+        try:
+            async for event in self.source:
+                await self.queue.put(event)
+        except Exception as error:
+            await self.queue.put(StreamError(error))
+        else:
+            await self.queue.put(END_OF_STREAM)
+
+    async def get(self) -> Any:
+        if self._pump is None:
+            self._pump = asyncio.ensure_future(self._read())
+        return await self.queue.get()
+
+    async def close(self) -> None:
+        if self._pump is not None:
+            self._pump.cancel()
+            try:
+                await self._pump
+            except asyncio.CancelledError:
+                pass
+        await close_source(self.source)
+
+
+class Subscriber:
+    """A subscriber's buffer of events from a shared source stream"""
+
+    def __init__(self, fan_out: "FanOut", upstream: "Upstream"):
+        self.fan_out = fan_out
+        self.upstream = upstream
+        self.events: Deque[Any] = deque()
+        self.end: Any = None
+        self._ready = asyncio.Event()
+
+    def put(self, event: Any) -> None:
+        self.events.append(event)
+        self._ready.set()
+
+    def finish(self, end: Any) -> None:
+        self.end = end
+        self._ready.set()
+
+    async def get(self) -> Any:
+        while not self.events:
+            if self.end is not None:
+                return self.end
+            self._ready.clear()
+            await self._ready.wait()
+        return self.events.popleft()
+
+    async def close(self) -> None:
+        await self.fan_out.unsubscribe(self)
+
+
+class Upstream:
+    """A source stream shared by the subscribers of one key"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.subscribers: Set[Subscriber] = set()
+        self.source: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Future] = None
+
+
+class FanOut:
+    """
+    Shares one source stream between subscriptions to the same root field with
+    the same arguments
+
+    buffer_size: events buffered for each subscriber
+    overflow: what to do with an event for a subscriber whose buffer is full.
+        "drop_oldest" or "drop_newest" drop an event, "disconnect" ends the
+        subscription with a SlowSubscriber error
+    partition_key: callable taking the context value and returning which
+        partition (ie. anonymous or a user id) a source stream may be shared
+        within. Without one, only subscriptions with the same context value
+        share a source stream
+
+    The source stream is started with the root and context value of the first
+    subscriber, and closed when its last subscriber goes away. Upstream load
+    stays constant however many subscribers share it.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 100,
+        overflow: str = "drop_oldest",
+        partition_key: Optional[Callable[[Any], Any]] = None,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.buffer_size = buffer_size
+        self.overflow = overflow
+        self.partition_key = partition_key
+        self.started = 0
+        self.shared = 0
+        self.dropped = 0
+        self.disconnected = 0
+        self._upstreams: Dict[str, Upstream] = {}
+
+    def make_key(self, context: ExecutionContext) -> Optional[str]:
+        """Key of the root field and arguments, or None if they can't be resolved"""
+        schema = context.schema
+        root_type = schema.subscription_type
+        if root_type is None:
+            return None
+        root_fields = collect_fields(
+            schema,
+            context.fragments,
+            context.variable_values,
+            root_type,
+            context.operation.selection_set,
+        )
+        field_nodes = next(iter(root_fields.values()))
+        field_def = get_field_def(schema, root_type, field_nodes[0])
+        if field_def is None:
+            return None
+        try:
+            args = get_argument_values(
+                field_def, field_nodes[0], context.variable_values
+            )
+        except Exception:
+            return None
+        if self.partition_key is None:
+            # The subscribers of a source stream hold on to their context value,
+            # so its id isn't reused while the stream is shared
+            partition: Any = id(context.context_value)
+        else:
+            partition = self.partition_key(context.context_value)
+        return json.dumps(
+            [field_nodes[0].name.value, args, partition],
+            sort_keys=True,
+            default=repr,
+        )
+
+    async def subscribe(
+        self,
+        key: str,
+        start: Callable[[], Awaitable[Union[AsyncIterator[Any], ExecutionResult]]],
+    ) -> Union[Subscriber, ExecutionResult]:
+        """
+        Subscribe to the source stream for key, starting it if needed
+
+        Returns an ExecutionResult with the errors if the source stream could not
+        be started.
+        """
+        upstream = self._upstreams.get(key)
+        # Subscribers are added before the source starts so none miss its events
+        if upstream is None:
+            upstream = Upstream(key)
+            self._upstreams[key] = upstream
+            subscriber = Subscriber(self, upstream)
+            upstream.subscribers.add(subscriber)
+            self.started += 1
+            try:
+                source = await start()
+            except BaseException as error:
+                self._upstreams.pop(key, None)
+                upstream.source.set_exception(error)
+                raise
+            upstream.source.set_result(source)
+            if isinstance(source, ExecutionResult):
+                self._upstreams.pop(key, None)
+                return source
+            upstream.task = asyncio.ensure_future(self._broadcast(upstream, source))
+            return subscriber
+
+        subscriber = Subscriber(self, upstream)
+        upstream.subscribers.add(subscriber)
+        self.shared += 1
+        try:
+            source = await asyncio.shield(upstream.source)
+        except BaseException:
+            upstream.subscribers.discard(subscriber)
+            raise
+        if isinstance(source, ExecutionResult):
+            upstream.subscribers.discard(subscriber)
+            return source
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber) -> None:
+        upstream = subscriber.upstream
+        upstream.subscribers.discard(subscriber)
+        if upstream.subscribers:
+            return
+        if self._upstreams.get(upstream.key) is upstream:
+            del self._upstreams[upstream.key]
+        if upstream.task is not None and not upstream.task.done():
+            upstream.task.cancel()
+            try:
+                await upstream.task
+            except asyncio.CancelledError:
+                pass
+            await close_source(upstream.source.result())
+
+    def _deliver(self, upstream: Upstream, subscriber: Subscriber, event: Any):
+        if len(subscriber.events) < self.buffer_size:
+            subscriber.put(event)
+        elif self.overflow == "drop_oldest":
+            subscriber.events.popleft()
+            subscriber.put(event)
+            self.dropped += 1
+        elif self.overflow == "drop_newest":
+            self.dropped += 1
+        else:
+            subscriber.events.clear()
+            subscriber.finish(
+                StreamError(
+                    SlowSubscriber(f"More than {self.buffer_size} events behind")
+                )
+            )
+            upstream.subscribers.discard(subscriber)
+            self.disconnected += 1
+
+    async def _broadcast(self, upstream: Upstream, source: AsyncIterator[Any]):
+        try:
+            async for event in source:
+                for subscriber in list(upstream.subscribers):
+                    self._deliver(upstream, subscriber, event)
+        except Exception as error:
+            end: Any = StreamError(error)
+        else:
+            end = END_OF_STREAM
+        if self._upstreams.get(upstream.key) is upstream:
+            del self._upstreams[upstream.key]
+        for subscriber in upstream.subscribers:
+            subscriber.finish(end)